@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark of per-chunk resampling to 16kHz mono float32
+
+Live transcription converts many short capture-rate chunks, where designing
+the anti-aliasing filter costs more than applying it. This compares, per
+call:
+
+    per_call_filter   scipy resample_poly designing its filter every call
+    cached_filter     audio_utils.normalize_audio (filter memoized per rate pair)
+    torchaudio_new    a new torchaudio Resample per call (if torchaudio is installed)
+    torchaudio_reused one torchaudio Resample reused across calls
+
+Usage:
+    python benchmark_resampling.py [--rates 48000,44100,22050,8000]
+        [--chunks 0.1,0.25,0.5,1.0] [--calls 200] [--output FILE]
+"""
+
+import os
+os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
+
+import sys
+import json
+import time
+import argparse
+from math import gcd
+
+import numpy as np
+
+SERVICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'services')
+sys.path.insert(0, SERVICES_DIR)
+
+from audio_utils import SAMPLE_RATE, normalize_audio
+
+
+def per_call_filter(chunk, sample_rate):
+    """The uncached path: same conversion, filter designed inside resample_poly"""
+    from scipy.signal import resample_poly
+
+    audio = chunk.astype(np.float32) / 32768.0
+    audio = audio.mean(axis=1)
+    divisor = gcd(sample_rate, SAMPLE_RATE)
+    return resample_poly(audio, SAMPLE_RATE // divisor, sample_rate // divisor).astype(np.float32)
+
+
+def time_per_call(fn, chunks, calls):
+    """Mean microseconds per call after one warm-up call"""
+    fn(chunks[0])
+    start = time.perf_counter()
+    for index in range(calls):
+        fn(chunks[index % len(chunks)])
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+def parse_list(value, cast):
+    return [cast(item.strip()) for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-chunk resampling micro-benchmark")
+    parser.add_argument("--rates", default="48000,44100,22050,8000", help="Capture rates in Hz")
+    parser.add_argument("--chunks", default="0.1,0.25,0.5,1.0", help="Chunk lengths in seconds")
+    parser.add_argument("--calls", type=int, default=200, help="Calls timed per case")
+    parser.add_argument("--output", default=None, help="Optional JSON report path")
+    args = parser.parse_args()
+
+    try:
+        import torch
+        import torchaudio
+    except ImportError:
+        torch = torchaudio = None
+
+    print("="*60)
+    print("🏁 Resampling micro-benchmark (stereo s16 chunks -> 16kHz mono float32)")
+    print("="*60)
+
+    rng = np.random.default_rng(0)
+    results = []
+    for sample_rate in parse_list(args.rates, int):
+        for seconds in parse_list(args.chunks, float):
+            frames = int(seconds * sample_rate)
+            # A few distinct chunks so the same buffer is not reused every call
+            chunks = [(rng.standard_normal((frames, 2)) * 3000).astype(np.int16) for _ in range(8)]
+
+            case = {
+                "sample_rate": sample_rate,
+                "chunk_seconds": seconds,
+                "per_call_filter_us": round(time_per_call(lambda c: per_call_filter(c, sample_rate), chunks, args.calls), 1),
+                "cached_filter_us": round(time_per_call(lambda c: normalize_audio(c, sample_rate), chunks, args.calls), 1)
+            }
+            case["speedup"] = round(case["per_call_filter_us"] / case["cached_filter_us"], 2)
+
+            if torchaudio is not None:
+                to_tensor = lambda c: torch.from_numpy(c.T.astype(np.float32) / 32768.0)
+                reused = torchaudio.transforms.Resample(sample_rate, SAMPLE_RATE)
+                case["torchaudio_new_us"] = round(time_per_call(
+                    lambda c: torchaudio.transforms.Resample(sample_rate, SAMPLE_RATE)(to_tensor(c)).mean(dim=0),
+                    chunks, args.calls
+                ), 1)
+                case["torchaudio_reused_us"] = round(time_per_call(
+                    lambda c: reused(to_tensor(c)).mean(dim=0),
+                    chunks, args.calls
+                ), 1)
+
+            results.append(case)
+            line = (f"   {sample_rate:>6} Hz {seconds:>5.2f}s: per-call filter {case['per_call_filter_us']:>9.1f} us"
+                    f"  cached {case['cached_filter_us']:>9.1f} us  ({case['speedup']}x)")
+            if "torchaudio_new_us" in case:
+                line += f"  torchaudio new/reused {case['torchaudio_new_us']:.1f}/{case['torchaudio_reused_us']:.1f} us"
+            print(line)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({"calls": args.calls, "results": results}, f, indent=2)
+        print(f"\n📄 Report written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
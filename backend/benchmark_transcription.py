@@ -0,0 +1,417 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for Faster-Whisper transcription and SpeechBrain diarization
+
+Runs the in-process services on fixed synthetic speech-like audio and writes
+model-load time, real-time factor, CPU time, peak RSS, per-stage timings and
+the cold-start breakdown (library imports vs model load) to a JSON file, so performance regressions are visible across commits.
+
+Every case runs in a fresh process, so model loads are cold and peak RSS
+belongs to that case alone. The suite is CPU-only and offline: models must
+already be in the local Hugging Face / SpeechBrain caches.
+
+The synthetic fixtures are harmonic tones, not words, so they measure speed
+only. Accuracy is measured with --reference DIR: every audio file there
+with a same-named .txt transcript is transcribed per model, compute type
+and profile, and scored by word error rate (WER). No clips ship with the
+repository; use real meeting audio or a public set such as LibriSpeech.
+
+Usage:
+    python benchmark_transcription.py [--durations 10,300,3600] [--models tiny,base]
+        [--compute-types int8] [--profiles archive-accurate,live-fast]
+        [--skip-diarization] [--audio-dir DIR] [--reference DIR] [--output FILE]
+"""
+
+import os
+os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
+# CPU-only and offline before any ML library is imported
+os.environ['CUDA_VISIBLE_DEVICES'] = ''
+os.environ.setdefault('HF_HUB_OFFLINE', '1')
+os.environ.setdefault('TRANSFORMERS_OFFLINE', '1')
+
+import sys
+import json
+import re
+import time
+import argparse
+import platform
+import subprocess
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+SERVICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src', 'services')
+sys.path.insert(0, SERVICES_DIR)
+
+SAMPLE_RATE = 16000
+DEFAULT_DURATIONS = [10, 300, 3600]
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB"""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def generate_speech_like(duration, seed=0, speakers=2):
+    """
+    Deterministic speech-like signal with alternating speakers
+
+    Each utterance is a harmonic series at the speaker's pitch, with vibrato
+    and a 4 Hz syllable envelope, followed by a short pause. Different
+    speakers use different pitches and formant weights, which gives the
+    speaker model distinct voices to separate.
+
+    Args:
+        duration: Length in seconds
+        seed: Random seed (same seed, same audio)
+        speakers: Number of alternating voices
+
+    Returns:
+        (audio, segments): float32 waveform at 16kHz and the ground-truth
+            utterance spans [{"start", "end", "speaker"}]
+    """
+    rng = np.random.default_rng(seed)
+    total = int(duration * SAMPLE_RATE)
+    audio = np.zeros(total, dtype=np.float32)
+    segments = []
+
+    pitches = [110.0 + 70.0 * index for index in range(speakers)]
+    formants = [rng.uniform(0.3, 1.0, size=12) for _ in range(speakers)]
+
+    position = 0
+    turn = 0
+    while position < total:
+        speaker = turn % speakers
+        length = min(int(rng.uniform(1.5, 6.0) * SAMPLE_RATE), total - position)
+        t = np.arange(length) / SAMPLE_RATE
+
+        f0 = pitches[speaker] * (1.0 + 0.03 * np.sin(2 * np.pi * 5.0 * t))
+        phase = 2 * np.pi * np.cumsum(f0) / SAMPLE_RATE
+        voice = sum(
+            weight * np.sin((harmonic + 1) * phase) / (harmonic + 1)
+            for harmonic, weight in enumerate(formants[speaker])
+        )
+        envelope = 0.5 * (1.0 - np.cos(2 * np.pi * 4.0 * t)) ** 2
+        utterance = 0.3 * voice * envelope + 0.005 * rng.standard_normal(length)
+
+        audio[position:position + length] = utterance.astype(np.float32)
+        segments.append({
+            "start": round(position / SAMPLE_RATE, 3),
+            "end": round((position + length) / SAMPLE_RATE, 3),
+            "speaker": f"VOICE_{speaker}",
+            "text": ""
+        })
+
+        position += length + int(rng.uniform(0.2, 0.8) * SAMPLE_RATE)
+        turn += 1
+
+    return audio, segments
+
+
+def load_fixture(duration, audio_dir):
+    """
+    Load (or generate once) the fixed synthetic recording for a duration
+
+    Returns:
+        (npy_path, segments)
+    """
+    os.makedirs(audio_dir, exist_ok=True)
+    npy_path = os.path.join(audio_dir, f"synthetic_{duration}s.npy")
+    segments_path = os.path.join(audio_dir, f"synthetic_{duration}s.json")
+
+    if not (os.path.exists(npy_path) and os.path.exists(segments_path)):
+        print(f"🔧 Generating {duration}s synthetic audio...", file=sys.stderr)
+        audio, segments = generate_speech_like(duration, seed=duration)
+        np.save(npy_path, audio)
+        with open(segments_path, 'w', encoding='utf-8') as f:
+            json.dump(segments, f)
+
+    with open(segments_path, 'r', encoding='utf-8') as f:
+        return npy_path, json.load(f)
+
+
+def normalize_words(text):
+    """Lower-case words without punctuation, for WER scoring"""
+    return re.findall(r"[a-z0-9']+", text.lower())
+
+
+def word_errors(reference, hypothesis):
+    """
+    Word-level edit distance between a reference and a hypothesis
+
+    Returns:
+        (errors, reference_words): substitutions + deletions + insertions,
+            and the reference length (WER = errors / reference_words)
+    """
+    ref, hyp = normalize_words(reference), normalize_words(hypothesis)
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (ref_word != hyp_word)
+            )
+        previous = current
+    return previous[-1], len(ref)
+
+
+def load_references(reference_dir):
+    """
+    Audio clips with reference transcripts: <name>.<audio ext> + <name>.txt
+
+    Returns:
+        List of (audio_path, reference_text)
+    """
+    from batch_transcribe import AUDIO_EXTENSIONS
+
+    references = []
+    for name in sorted(os.listdir(reference_dir)):
+        stem, extension = os.path.splitext(name)
+        text_path = os.path.join(reference_dir, stem + ".txt")
+        if extension.lower() in AUDIO_EXTENSIONS and os.path.exists(text_path):
+            with open(text_path, 'r', encoding='utf-8') as f:
+                references.append((os.path.join(reference_dir, name), f.read()))
+    return references
+
+
+class StageTimer:
+    """Collects wall and CPU seconds per named stage"""
+
+    def __init__(self):
+        self.stages = {}
+
+    def measure(self, name, fn, *args, **kwargs):
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        result = fn(*args, **kwargs)
+        self.stages[name] = {
+            "wall_seconds": round(time.perf_counter() - wall_start, 4),
+            "cpu_seconds": round(time.process_time() - cpu_start, 4),
+            # Cumulative for the case's process, not this stage alone
+            "process_peak_rss_mb": peak_rss_mb()
+        }
+        return result
+
+
+def run_transcription_case(case):
+    """Transcribe one fixture in this (fresh) process"""
+    from metrics import startup_report
+    from transcribe_audio import STARTUP, FasterWhisperTranscriber
+
+    timer = StageTimer()
+    transcriber = timer.measure(
+        "model_load",
+        FasterWhisperTranscriber,
+        model_size=case["model_size"],
+        device="cpu",
+        compute_type=case["compute_type"],
+        cpu_threads=case["cpu_threads"]
+    )
+    result = timer.measure(
+        "transcribe",
+        transcriber.transcribe,
+        case["audio_path"],
+        language=case.get("language", "en"),
+        vad_filter=True,
+        profile=case["profile"]
+    )
+
+    duration = case.get("duration") or result.get("metadata", {}).get("duration") or 0
+    scored = {}
+    if "reference_text" in case:
+        errors, reference_words = word_errors(case.pop("reference_text"), result.get("transcript", ""))
+        scored = {
+            "word_errors": errors,
+            "reference_words": reference_words,
+            "wer": round(errors / reference_words, 4) if reference_words else None
+        }
+
+    return {
+        **case,
+        **scored,
+        "duration": duration,
+        "success": result.get("success", False),
+        "error": result.get("error"),
+        "segments": result.get("metadata", {}).get("total_segments"),
+        "model_load_seconds": timer.stages["model_load"]["wall_seconds"],
+        "real_time_factor": round(timer.stages["transcribe"]["wall_seconds"] / duration, 4) if duration else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.stages,
+        "startup": startup_report(STARTUP)
+    }
+
+
+def run_diarization_case(case):
+    """Diarize one fixture's ground-truth segments in this (fresh) process"""
+    from metrics import startup_report
+    from speaker_identification import STARTUP, SpeakerIdentifier
+
+    timer = StageTimer()
+    identifier = timer.measure("model_load", SpeakerIdentifier, device="cpu")
+    # The two stages diarize_segments is composed of, timed separately
+    segment_embeddings = timer.measure(
+        "embedding_extraction",
+        identifier.extract_embeddings_from_segments,
+        case["audio_path"],
+        case["segments"]
+    )
+    result = timer.measure("clustering", identifier.label_segments, segment_embeddings)
+
+    processing = timer.stages["embedding_extraction"]["wall_seconds"] + timer.stages["clustering"]["wall_seconds"]
+    case = {key: value for key, value in case.items() if key != "segments"}
+    return {
+        **case,
+        "success": result.get("success", False),
+        "error": result.get("error"),
+        "segments": len(segment_embeddings),
+        "total_speakers": result.get("total_speakers"),
+        "model_load_seconds": timer.stages["model_load"]["wall_seconds"],
+        "real_time_factor": round(processing / case["duration"], 4),
+        "peak_rss_mb": peak_rss_mb(),
+        "stages": timer.stages,
+        "startup": startup_report(STARTUP)
+    }
+
+
+def run_isolated(fn, case):
+    """Run a case in a fresh spawned process (cold load, isolated peak RSS)"""
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as executor:
+        try:
+            return executor.submit(fn, case).result()
+        except Exception as e:
+            dropped = ("segments", "reference_text")
+            return {**{k: v for k, v in case.items() if k not in dropped}, "success": False, "error": str(e)}
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def parse_list(value):
+    return [item.strip() for item in value.split(',') if item.strip()]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Transcription and diarization benchmark (CPU, offline)")
+    parser.add_argument("--durations", default=",".join(map(str, DEFAULT_DURATIONS)),
+                        help="Synthetic audio lengths in seconds (default: 10,300,3600)")
+    parser.add_argument("--models", default="tiny,base", help="Whisper model sizes")
+    parser.add_argument("--compute-types", default="int8", help="CTranslate2 compute types")
+    parser.add_argument("--profiles", default="archive-accurate,live-fast", help="Decoding profiles")
+    parser.add_argument("--threads", type=int, default=0, help="CTranslate2 CPU threads (0 = default)")
+    parser.add_argument("--skip-transcription", action="store_true")
+    parser.add_argument("--skip-diarization", action="store_true")
+    parser.add_argument("--audio-dir", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_audio"),
+                        help="Where synthetic fixtures are generated and reused")
+    parser.add_argument("--reference", default=None,
+                        help="Directory of audio clips with same-named .txt transcripts, scored by WER")
+    parser.add_argument("--language", default="en", help="Language of the reference clips")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON report path")
+    args = parser.parse_args()
+
+    print("="*60)
+    print("🏁 Transcription & Diarization Benchmark (CPU, offline)")
+    print("="*60)
+
+    fixtures = {
+        int(duration): load_fixture(int(duration), args.audio_dir)
+        for duration in parse_list(args.durations)
+    }
+
+    results = []
+    if not args.skip_transcription:
+        for duration, (npy_path, _) in fixtures.items():
+            for model_size in parse_list(args.models):
+                for compute_type in parse_list(args.compute_types):
+                    for profile in parse_list(args.profiles):
+                        case = {
+                            "kind": "transcription",
+                            "duration": duration,
+                            "audio_path": npy_path,
+                            "model_size": model_size,
+                            "compute_type": compute_type,
+                            "profile": profile,
+                            "cpu_threads": args.threads
+                        }
+                        print(f"\n▶️  transcribe {duration}s {model_size}/{compute_type} {profile}")
+                        result = run_isolated(run_transcription_case, case)
+                        results.append(result)
+                        print(f"   RTF {result.get('real_time_factor')}  load {result.get('model_load_seconds')}s"
+                              f"  peak {result.get('peak_rss_mb')} MB  {'✅' if result.get('success') else '❌ ' + str(result.get('error'))}")
+
+    accuracy = {}
+    if args.reference:
+        references = load_references(args.reference)
+        print(f"\n📚 {len(references)} reference clips in {args.reference}")
+        for model_size in parse_list(args.models):
+            for compute_type in parse_list(args.compute_types):
+                for profile in parse_list(args.profiles):
+                    totals = {"word_errors": 0, "reference_words": 0, "clips": 0}
+                    for audio_path, reference_text in references:
+                        case = {
+                            "kind": "accuracy",
+                            "audio_path": audio_path,
+                            "reference_text": reference_text,
+                            "language": args.language,
+                            "model_size": model_size,
+                            "compute_type": compute_type,
+                            "profile": profile,
+                            "cpu_threads": args.threads
+                        }
+                        result = run_isolated(run_transcription_case, case)
+                        results.append(result)
+                        if result.get("success"):
+                            totals["word_errors"] += result["word_errors"]
+                            totals["reference_words"] += result["reference_words"]
+                            totals["clips"] += 1
+                    key = f"{model_size}/{compute_type}/{profile}"
+                    words = totals["reference_words"]
+                    accuracy[key] = {**totals, "wer": round(totals["word_errors"] / words, 4) if words else None}
+                    print(f"   {key}: WER {accuracy[key]['wer']} over {words} words ({totals['clips']} clips)")
+
+    if not args.skip_diarization:
+        for duration, (npy_path, segments) in fixtures.items():
+            case = {
+                "kind": "diarization",
+                "duration": duration,
+                "audio_path": npy_path,
+                "segments": segments
+            }
+            print(f"\n▶️  diarize {duration}s ({len(segments)} segments)")
+            result = run_isolated(run_diarization_case, case)
+            results.append(result)
+            print(f"   RTF {result.get('real_time_factor')}  load {result.get('model_load_seconds')}s"
+                  f"  peak {result.get('peak_rss_mb')} MB  {'✅' if result.get('success') else '❌ ' + str(result.get('error'))}")
+
+    report = {
+        "created_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "git_commit": git_commit(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "accuracy": accuracy,
+        "results": results
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+
+    failed = sum(1 for result in results if not result.get("success"))
+    print("\n" + "="*60)
+    print(f"📄 Report written to {args.output} ({len(results)} cases, {failed} failed)")
+    print("="*60)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,415 @@
+#!/usr/bin/env python3
+"""
+Shared audio decoding helpers for the Python transcription services
+
+Decodes any FFmpeg-readable input (WebM, WAV, MP3, M4A, ...) straight into a
+16kHz mono float32 NumPy array, which is the format both Whisper and
+ECAPA-TDNN consume, without writing intermediate files to disk.
+
+A decoded recording can also be cached as a raw 16kHz float32 ``.npy`` file,
+which every entry point accepts in place of the original audio and opens
+memory-mapped, so a meeting is decoded and resampled exactly once no matter
+how many stages consume it.
+
+Long recordings can also be read span by span: PCM/float WAV files are
+memory-mapped in place, other formats are streamed by FFmpeg into a raw
+float32 file that is memory-mapped, and read_slice copies, downmixes and
+resamples only the frames a segment covers.
+
+Audio that does not come out of FFmpeg already at 16kHz (WAV spans, live
+PCM at the capture rate, enrollment samples) goes through normalize_audio,
+whose resampling filter is designed once per rate pair and reused.
+"""
+
+import hashlib
+import os
+import struct
+import subprocess
+import tempfile
+from functools import lru_cache
+from math import gcd
+from typing import Optional, Tuple
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def decode_audio(
+    audio_path: str,
+    sample_rate: int = SAMPLE_RATE,
+    ffmpeg_path: str = "ffmpeg"
+) -> np.ndarray:
+    """
+    Decode an audio file to mono float32 PCM by piping FFmpeg output
+
+    Args:
+        audio_path: Path to any audio/video file FFmpeg can read
+        sample_rate: Output sampling rate in Hz
+        ffmpeg_path: FFmpeg executable
+
+    Returns:
+        numpy array: 1-D float32 waveform in [-1.0, 1.0]
+
+    Raises:
+        FileNotFoundError: If FFmpeg is not installed
+        RuntimeError: If FFmpeg cannot decode the file
+    """
+    command = [
+        ffmpeg_path,
+        "-nostdin",
+        "-loglevel", "error",
+        "-i", audio_path,
+        "-f", "f32le",
+        "-acodec", "pcm_f32le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        "-"
+    ]
+
+    process = subprocess.run(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        message = process.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"FFmpeg failed to decode {audio_path}: {message[:200]}")
+
+    # Zero-copy view over FFmpeg's output buffer (read-only)
+    return np.frombuffer(process.stdout, dtype=np.float32)
+
+
+def pcm_to_float32(data: bytes, pcm_format: str = "s16le") -> np.ndarray:
+    """
+    Convert raw little-endian mono PCM bytes to a float32 waveform
+
+    Args:
+        data: Raw sample bytes (a trailing partial sample is ignored)
+        pcm_format: "s16le" (16-bit signed) or "f32le" (32-bit float)
+
+    Returns:
+        numpy array: 1-D float32 waveform in [-1.0, 1.0]
+    """
+    if pcm_format == "s16le":
+        samples = np.frombuffer(data[:len(data) - len(data) % 2], dtype="<i2")
+        return samples.astype(np.float32) / 32768.0
+    if pcm_format == "f32le":
+        return np.frombuffer(data[:len(data) - len(data) % 4], dtype="<f4").astype(np.float32)
+    raise ValueError(f"Unsupported PCM format: {pcm_format}")
+
+
+def decode_to_memmap(
+    audio_path: str,
+    raw_path: str,
+    sample_rate: int = SAMPLE_RATE,
+    ffmpeg_path: str = "ffmpeg"
+) -> np.ndarray:
+    """
+    Decode to a raw float32 file written by FFmpeg itself, memory-mapped
+
+    Unlike decode_audio, the decoded waveform never passes through this
+    process's memory, so hours of audio cost disk space instead of RAM.
+
+    Args:
+        audio_path: Path to any audio/video file FFmpeg can read
+        raw_path: Output file (overwritten; the caller removes it)
+        sample_rate: Output sampling rate in Hz
+        ffmpeg_path: FFmpeg executable
+
+    Returns:
+        numpy array: Read-only 1-D float32 memmap (empty array if no samples)
+
+    Raises:
+        FileNotFoundError: If FFmpeg is not installed
+        RuntimeError: If FFmpeg cannot decode the file
+    """
+    command = [
+        ffmpeg_path,
+        "-nostdin",
+        "-loglevel", "error",
+        "-y",
+        "-i", audio_path,
+        "-f", "f32le",
+        "-acodec", "pcm_f32le",
+        "-ac", "1",
+        "-ar", str(sample_rate),
+        raw_path
+    ]
+
+    process = subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if process.returncode != 0:
+        message = process.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(f"FFmpeg failed to decode {audio_path}: {message[:200]}")
+
+    if os.path.getsize(raw_path) == 0:
+        return np.zeros(0, dtype=np.float32)
+    return np.memmap(raw_path, dtype="<f4", mode="r")
+
+
+# (WAVE format tag, bits per sample) -> sample dtype; 1 = PCM, 3 = IEEE float
+WAV_SAMPLE_TYPES = {
+    (1, 8): "u1",
+    (1, 16): "<i2",
+    (1, 32): "<i4",
+    (3, 32): "<f4",
+    (3, 64): "<f8",
+}
+
+
+def open_wav(wav_path: str) -> Tuple[np.ndarray, int]:
+    """
+    Memory-map the samples of a WAV file without reading them
+
+    Args:
+        wav_path: PCM (8/16/32-bit) or IEEE float WAV file, including
+            WAVE_FORMAT_EXTENSIBLE and RF64/streamed files
+
+    Returns:
+        (samples, sample_rate): Read-only (frames x channels) memmap in the
+            file's own sample type, and its rate
+
+    Raises:
+        ValueError: Not a WAV file, or an encoding that cannot be mapped
+            (e.g. 24-bit or compressed); decode those with FFmpeg instead
+    """
+    with open(wav_path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] not in (b"RIFF", b"RF64") or header[8:12] != b"WAVE":
+            raise ValueError(f"Not a WAV file: {wav_path}")
+
+        fmt = None
+        while True:
+            chunk = f.read(8)
+            if len(chunk) < 8:
+                raise ValueError(f"WAV file has no data chunk: {wav_path}")
+            chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+            if chunk_id == b"data":
+                data_offset = f.tell()
+                break
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+                f.seek(chunk_size & 1, os.SEEK_CUR)
+            else:
+                # Chunks are word-aligned
+                f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+
+    if fmt is None or len(fmt) < 16:
+        raise ValueError(f"WAV file has no format chunk: {wav_path}")
+
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == 0xFFFE and len(fmt) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE: the real tag leads the subformat GUID
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+
+    dtype = WAV_SAMPLE_TYPES.get((format_tag, bits))
+    if dtype is None or block_align != channels * bits // 8:
+        raise ValueError(f"Unsupported WAV encoding (format {format_tag}, {bits}-bit): {wav_path}")
+
+    # RF64 and streamed files carry a placeholder size; trust the file length
+    available = os.path.getsize(wav_path) - data_offset
+    if chunk_size in (0, 0xFFFFFFFF) or chunk_size > available:
+        chunk_size = available
+
+    frames = chunk_size // block_align
+    if frames == 0:
+        return np.zeros((0, channels), dtype=dtype), sample_rate
+    return np.memmap(wav_path, dtype=dtype, mode="r", offset=data_offset, shape=(frames, channels)), sample_rate
+
+
+@lru_cache(maxsize=32)
+def resample_kernel(up: int, down: int, dtype: str = "float32") -> np.ndarray:
+    """
+    Anti-aliasing FIR filter for polyphase resampling by up/down
+
+    Same design as scipy.signal.resample_poly's default (Kaiser window,
+    beta 5.0, 10 zero crossings per side), but memoized: designing it costs
+    far more than filtering a short chunk (44.1kHz -> 16kHz needs 8821 taps).
+
+    Returns:
+        numpy array: Read-only filter taps in dtype
+    """
+    from scipy.signal import firwin
+
+    max_rate = max(up, down)
+    kernel = firwin(2 * 10 * max_rate + 1, 1.0 / max_rate, window=("kaiser", 5.0)).astype(dtype)
+    kernel.setflags(write=False)
+    return kernel
+
+
+def resample(audio: np.ndarray, orig_rate: int, target_rate: int) -> np.ndarray:
+    """
+    Polyphase resampling of a 1-D float waveform with a cached filter
+
+    Args:
+        audio: float32 (or float64) waveform at orig_rate
+        orig_rate: Input sampling rate in Hz
+        target_rate: Output sampling rate in Hz
+
+    Returns:
+        numpy array: Waveform at target_rate in the input dtype
+    """
+    if orig_rate == target_rate:
+        return audio
+    from scipy.signal import resample_poly
+
+    divisor = gcd(orig_rate, target_rate)
+    up, down = target_rate // divisor, orig_rate // divisor
+    # resample_poly copies an explicit filter before scaling it, so the cached one is never modified
+    return resample_poly(audio, up, down, window=resample_kernel(up, down, audio.dtype.name))
+
+
+def normalize_audio(
+    samples: np.ndarray,
+    sample_rate: int,
+    target_rate: int = SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Convert any decoded audio to the models' input: mono float32 at 16kHz
+
+    Args:
+        samples: (frames,) or (frames x channels) array in any WAV sample
+            type (see open_wav) or float
+        sample_rate: Rate of samples in Hz
+        target_rate: Output sampling rate in Hz
+
+    Returns:
+        numpy array: New contiguous 1-D float32 array in [-1.0, 1.0]
+    """
+    samples = np.asarray(samples)
+    if samples.dtype == np.uint8:
+        audio = (samples.astype(np.float32) - 128.0) / 128.0
+    elif samples.dtype.kind == "i":
+        audio = samples.astype(np.float32) / float(2 ** (8 * samples.dtype.itemsize - 1))
+    else:
+        audio = np.array(samples, dtype=np.float32)
+
+    if audio.ndim == 2:
+        audio = audio.mean(axis=1) if audio.shape[1] > 1 else audio[:, 0]
+
+    return np.ascontiguousarray(resample(audio, sample_rate, target_rate), dtype=np.float32)
+
+
+def read_slice(
+    samples: np.ndarray,
+    sample_rate: int,
+    start: int,
+    end: int,
+    target_rate: int = SAMPLE_RATE
+) -> np.ndarray:
+    """
+    Copy one span of a (memory-mapped) waveform as mono float32
+
+    Only the source frames backing the span are read and passed through
+    normalize_audio, so memory stays proportional to the span rather than
+    to the recording.
+
+    Args:
+        samples: (frames,) or (frames x channels) array in any WAV sample
+            type (see open_wav) or float32
+        sample_rate: Rate of samples in Hz
+        start: First sample of the span, at target_rate
+        end: End sample of the span (exclusive), at target_rate
+        target_rate: Output sampling rate in Hz
+
+    Returns:
+        numpy array: 1-D float32 copy at target_rate (shorter than end - start
+            if the span runs past the end of the audio)
+    """
+    first = start * sample_rate // target_rate
+    last = -(-end * sample_rate // target_rate)
+    return normalize_audio(samples[first:last], sample_rate, target_rate)[:end - start]
+
+
+def is_decoded_audio(audio_path: str) -> bool:
+    """True if the path points at a cached 16kHz float32 .npy waveform"""
+    return audio_path.lower().endswith(".npy")
+
+
+def load_decoded_audio(npy_path: str) -> np.ndarray:
+    """
+    Open a cached waveform memory-mapped (pages are read on demand)
+
+    Args:
+        npy_path: Path written by decode_to_cache
+
+    Returns:
+        numpy array: Read-only 1-D float32 memmap at SAMPLE_RATE
+    """
+    audio = np.load(npy_path, mmap_mode="r")
+    if audio.ndim != 1 or audio.dtype != np.float32:
+        raise ValueError(
+            f"Decoded audio cache must be 1-D float32 at {SAMPLE_RATE} Hz, "
+            f"got shape {audio.shape} dtype {audio.dtype}"
+        )
+    return audio
+
+
+def decoded_cache_path(audio_path: str, cache_dir: str) -> str:
+    """
+    Cache file location for a source recording
+
+    Keyed by absolute path, size and modification time, so a re-recorded
+    file never hits a stale entry.
+    """
+    stat = os.stat(audio_path)
+    key = f"{os.path.abspath(audio_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:20]
+    return os.path.join(cache_dir, f"{digest}.npy")
+
+
+def decode_to_cache(audio_path: str, cache_dir: str) -> str:
+    """
+    Decode a recording once into the shared .npy cache
+
+    Args:
+        audio_path: Source audio file (or an existing .npy cache file)
+        cache_dir: Directory holding decoded waveforms
+
+    Returns:
+        str: Path to the cached 16kHz mono float32 .npy file (audio_path
+            itself if it already is one). Callers must not delete it: it may
+            be the input recording or in use by a concurrent run.
+    """
+    if is_decoded_audio(audio_path):
+        return audio_path
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cache_path = decoded_cache_path(audio_path, cache_dir)
+    if os.path.exists(cache_path):
+        # Entries are shared between runs on the same recording; refresh the
+        # mtime so cache sweeps measure time since last use
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return cache_path
+
+    audio = decode_audio(audio_path)
+
+    # Write to a temp name first so concurrent readers never see a partial file
+    fd, temp_path = tempfile.mkstemp(suffix=".npy", dir=cache_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, audio)
+        os.replace(temp_path, cache_path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    return cache_path
+
+
+def load_audio(audio_path: str, cache_dir: Optional[str] = None) -> np.ndarray:
+    """
+    Get a 16kHz mono float32 waveform for any supported input
+
+    Args:
+        audio_path: Audio file or cached .npy waveform
+        cache_dir: If set, decode through the shared on-disk cache
+
+    Returns:
+        numpy array: 1-D float32 waveform (memory-mapped when cached)
+    """
+    if is_decoded_audio(audio_path):
+        return load_decoded_audio(audio_path)
+    if cache_dir:
+        return load_decoded_audio(decode_to_cache(audio_path, cache_dir))
+    return decode_audio(audio_path)
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Batch Transcription for Meeting Recording Backlogs
+
+Transcribes many recordings with one shared Faster-Whisper model. Files are
+fed through a bounded queue to worker threads that call the same model
+concurrently (CTranslate2 runs num_workers decodes in parallel), and each
+result is written to its own JSON file.
+
+Features:
+- Manifest as a directory, a glob pattern, or a JSONL list
+- Bounded job queue (manifests are read lazily)
+- One result file per recording, written atomically
+- Resumable: recordings with an existing successful result are skipped
+- Result ids from the path below the manifest root; duplicates fail loudly
+- Aggregate throughput report (audio seconds per wall-clock second)
+"""
+
+# Fix OpenMP library conflict (MUST be set before importing any libraries)
+import os
+os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
+
+import sys
+import glob
+import json
+import queue
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+from model_store import ModelStore
+from transcribe_audio import FasterWhisperTranscriber
+
+AUDIO_EXTENSIONS = ('.wav', '.mp3', '.m4a', '.webm', '.ogg', '.flac', '.mp4', '.npy')
+
+
+def job_id(audio_path: str, root: str) -> str:
+    """
+    Result id of a recording: its path below root without the extension,
+    directories joined with "__" (a/standup.webm -> a__standup)
+
+    Paths outside root fall back to the file name.
+    """
+    relative = os.path.relpath(audio_path, root)
+    if relative.startswith(os.pardir):
+        relative = os.path.basename(audio_path)
+    return "__".join(Path(relative).with_suffix("").parts)
+
+
+def iter_manifest(manifest: str) -> Iterator[Dict]:
+    """
+    Yield one job dict per recording listed by a manifest
+
+    Args:
+        manifest: A directory (searched recursively for audio files), a glob
+            pattern, or a .jsonl file whose lines are either a path string or
+            an object with "audio_path" and optional "id", "language" keys
+
+    Yields:
+        dict: Job with "audio_path", "id" (see job_id; relative to the
+            directory, the glob's common directory or the JSONL file's
+            directory) and optional "language"
+    """
+    if os.path.isdir(manifest):
+        for root, _, files in os.walk(manifest):
+            for name in sorted(files):
+                if name.lower().endswith(AUDIO_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    yield {"audio_path": path, "id": job_id(path, manifest)}
+        return
+
+    if manifest.lower().endswith('.jsonl'):
+        base_dir = os.path.dirname(os.path.abspath(manifest))
+        with open(manifest, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                entry = json.loads(line)
+                if isinstance(entry, str):
+                    entry = {"audio_path": entry}
+                entry["audio_path"] = os.path.join(base_dir, entry["audio_path"])
+                entry.setdefault("id", job_id(entry["audio_path"], base_dir))
+                yield entry
+        return
+
+    paths = [path for path in sorted(glob.glob(manifest, recursive=True)) if os.path.isfile(path)]
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in paths]) if paths else ""
+    for path in paths:
+        yield {"audio_path": path, "id": job_id(os.path.abspath(path), root)}
+
+
+def result_path(output_dir: str, job: Dict) -> str:
+    """Per-recording result file location"""
+    return os.path.join(output_dir, f"{job['id']}.json")
+
+
+def is_done(path: str) -> bool:
+    """True if a previous run already wrote a successful result"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return bool(json.load(f).get("success"))
+    except (OSError, ValueError):
+        return False
+
+
+def write_result(path: str, result: Dict):
+    """Write a result file atomically so interrupted runs never leave partial JSON"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f, indent=2)
+    os.replace(temp_path, path)
+
+
+def run_batch(
+    manifest: str,
+    output_dir: str,
+    model_size: str = "base",
+    device: str = "auto",
+    language: Optional[str] = None,
+    vad_filter: bool = True,
+    workers: int = 2,
+    cpu_threads: int = 0,
+    queue_size: Optional[int] = None,
+    model_store: Optional[ModelStore] = None
+) -> Dict:
+    """
+    Transcribe every recording in a manifest
+
+    Args:
+        manifest: Directory, glob pattern or JSONL list (see iter_manifest)
+        output_dir: Directory for per-recording result files
+        model_size: Model size (tiny, base, small, medium, large-v3)
+        device: Device to use ("cuda", "cpu", or "auto")
+        language: Default source language (None for auto-detection)
+        vad_filter: Use Voice Activity Detection to filter silence
+        workers: Concurrent transcriptions sharing the one loaded model
+        cpu_threads: CTranslate2 threads per decode (0 = library default)
+        queue_size: Maximum queued jobs (default: 2 x workers)
+        model_store: Load the model only from this local store
+
+    Returns:
+        dict: Aggregate report with counts and throughput
+    """
+    workers = max(1, workers)
+    os.makedirs(output_dir, exist_ok=True)
+
+    transcriber = FasterWhisperTranscriber(
+        model_size=model_size,
+        device=device,
+        compute_type="auto",
+        cpu_threads=cpu_threads,
+        num_workers=workers,
+        model_store=model_store
+    )
+
+    jobs = queue.Queue(maxsize=queue_size or workers * 2)
+    stats_lock = threading.Lock()
+    stats = {
+        "completed": 0,
+        "skipped": 0,
+        "failed": 0,
+        "audio_seconds": 0.0,
+        "failures": []
+    }
+
+    def worker():
+        while True:
+            job = jobs.get()
+            if job is None:
+                break
+
+            try:
+                result = transcriber.transcribe(
+                    audio_path=job["audio_path"],
+                    language=job.get("language", language),
+                    vad_filter=vad_filter,
+                    word_timestamps=True
+                )
+                result["audio_path"] = job["audio_path"]
+                write_result(result_path(output_dir, job), result)
+            except Exception as e:
+                # Keep the worker alive so the bounded queue never stalls
+                result = {"success": False, "error": str(e)}
+
+            with stats_lock:
+                if result.get("success"):
+                    stats["completed"] += 1
+                    stats["audio_seconds"] += result["metadata"]["duration"]
+                else:
+                    stats["failed"] += 1
+                    stats["failures"].append({"id": job["id"], "error": result.get("error")})
+                done = stats["completed"] + stats["failed"]
+            print(f"📦 [{done}] {job['id']}: {'✅' if result.get('success') else '❌'}", file=sys.stderr)
+
+    start_time = time.time()
+    threads = [threading.Thread(target=worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+
+    # Producer: blocks when the queue is full, so large manifests stay lazy.
+    # A repeated id would share (and overwrite) a result file, so it fails
+    # instead of being transcribed or counted as already done.
+    seen = {}
+    for job in iter_manifest(manifest):
+        if job["id"] in seen:
+            error = f"Duplicate job id (also {seen[job['id']]}); give it a distinct \"id\" in a JSONL manifest"
+            with stats_lock:
+                stats["failed"] += 1
+                stats["failures"].append({"id": job["id"], "audio_path": job["audio_path"], "error": error})
+            print(f"❌ {job['audio_path']}: {error}", file=sys.stderr)
+            continue
+        seen[job["id"]] = job["audio_path"]
+
+        if is_done(result_path(output_dir, job)):
+            stats["skipped"] += 1
+            continue
+        jobs.put(job)
+
+    for _ in threads:
+        jobs.put(None)
+    for thread in threads:
+        thread.join()
+
+    wall_seconds = time.time() - start_time
+    report = {
+        "success": stats["failed"] == 0,
+        "completed": stats["completed"],
+        "skipped": stats["skipped"],
+        "failed": stats["failed"],
+        "failures": stats["failures"],
+        "audio_seconds": round(stats["audio_seconds"], 2),
+        "wall_seconds": round(wall_seconds, 2),
+        "throughput": round(stats["audio_seconds"] / wall_seconds, 2) if wall_seconds > 0 else 0.0,
+        "model_size": model_size,
+        "workers": workers,
+        "output_dir": output_dir
+    }
+
+    print(f"\n✅ Batch complete!", file=sys.stderr)
+    print(f"   Completed: {report['completed']}, Skipped: {report['skipped']}, Failed: {report['failed']}", file=sys.stderr)
+    print(f"   Throughput: {report['throughput']:.2f} audio-seconds per wall-second", file=sys.stderr)
+
+    return report
+
+
+def main():
+    """
+    CLI entry point
+
+    Usage:
+        python batch_transcribe.py <manifest> <output_dir> [model_size] [device] [language] [vad_filter] [workers]
+
+    Examples:
+        python batch_transcribe.py recordings/ transcripts/
+        python batch_transcribe.py "recordings/**/*.webm" transcripts/ medium auto en true 4
+        python batch_transcribe.py backlog.jsonl transcripts/ base cpu null true 8
+
+    Re-running with the same output_dir skips recordings that already have a
+    successful result file. With $MODEL_STORE_DIR set, the model loads only
+    from that local store.
+    """
+    if len(sys.argv) < 3:
+        print(json.dumps({
+            "success": False,
+            "error": "Usage: python batch_transcribe.py <manifest> <output_dir> [model_size] [device] [language] [vad_filter] [workers]"
+        }))
+        sys.exit(1)
+
+    manifest = sys.argv[1]
+    output_dir = sys.argv[2]
+    model_size = sys.argv[3] if len(sys.argv) > 3 else "base"
+    device = sys.argv[4] if len(sys.argv) > 4 else "auto"
+    language = sys.argv[5] if len(sys.argv) > 5 and sys.argv[5] != 'null' else None
+    vad_filter = sys.argv[6].lower() != 'false' if len(sys.argv) > 6 else True
+    workers = int(sys.argv[7]) if len(sys.argv) > 7 else 2
+
+    report = run_batch(
+        manifest,
+        output_dir,
+        model_size=model_size,
+        device=device,
+        language=language,
+        vad_filter=vad_filter,
+        workers=workers,
+        model_store=ModelStore(os.environ["MODEL_STORE_DIR"]) if os.environ.get("MODEL_STORE_DIR") else None
+    )
+
+    # Output JSON report
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+#!/usr/bin/env python3
+"""
+Command-line argument helpers shared by the service scripts
+
+The services take positional arguments plus --flags parsed by hand (so the
+Node callers' argument lists stay unchanged); this holds the flag parsing
+they have in common.
+"""
+
+from typing import List
+
+
+def pop_option(args: List[str], name: str, has_value: bool = True):
+    """
+    Remove a --flag (and its value) from an argument list
+
+    Returns the flag value, True for a bare flag, or None if absent.
+
+    Raises:
+        ValueError: The flag is the last argument but needs a value
+    """
+    if name not in args:
+        return None
+
+    index = args.index(name)
+    args.pop(index)
+    if not has_value:
+        return True
+    if index >= len(args):
+        raise ValueError(f"Missing value for {name}")
+    return args.pop(index)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Persistent per-segment speaker embedding cache
+
+Embeddings are stored per recording (keyed by audio content hash) as one
+contiguous float32 ``.npy`` matrix plus a small JSON index mapping each
+segment span to its row. Spans that yielded no embedding (too short once
+read, e.g. running past the end of the audio) are listed in the index as
+skipped, so they are not retried either. Re-clustering a meeting with
+different settings then only reads the memory-mapped matrix, with no model
+forward passes and without reopening the audio.
+"""
+
+import json
+import os
+import tempfile
+import threading
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+def span_key(start: float, end: float) -> str:
+    """Index key for a segment span (millisecond resolution)"""
+    return f"{start:.3f}-{end:.3f}"
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding store: <cache_dir>/<audio_hash>/embeddings.npy + index.json
+    """
+
+    def __init__(self, cache_dir: str, model_id: str = "speechbrain/spkrec-ecapa-voxceleb"):
+        """
+        Args:
+            cache_dir: Root directory of the cache
+            model_id: Embedding model identifier; entries from another model are ignored
+        """
+        self.cache_dir = cache_dir
+        self.model_id = model_id
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, audio_hash: str) -> Tuple[str, str]:
+        directory = os.path.join(self.cache_dir, audio_hash)
+        return os.path.join(directory, "embeddings.npy"), os.path.join(directory, "index.json")
+
+    def _load(self, audio_hash: str) -> Tuple[Optional[np.ndarray], Dict[str, int], Set[str]]:
+        matrix_path, index_path = self._paths(audio_hash)
+        try:
+            with open(index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("model_id") != self.model_id:
+                return None, {}, set()
+            matrix = np.load(matrix_path, mmap_mode="r") if index["rows"] else None
+            return matrix, index["rows"], set(index.get("skipped", []))
+        except (OSError, ValueError, KeyError):
+            return None, {}, set()
+
+    def lookup(
+        self,
+        audio_hash: str,
+        segments: List[Dict]
+    ) -> Tuple[Dict[int, np.ndarray], List[int]]:
+        """
+        Find cached embeddings for segments of one recording
+
+        Args:
+            audio_hash: Content hash of the recording
+            segments: Segments with start/end times
+
+        Returns:
+            (found, missing): embeddings by segment position, and the
+                positions that still need a forward pass; positions stored
+                as skipped are in neither
+        """
+        matrix, rows, skipped = self._load(audio_hash)
+        found = {}
+        missing = []
+
+        for position, segment in enumerate(segments):
+            key = span_key(segment['start'], segment['end'])
+            if key in skipped:
+                continue
+            row = rows.get(key)
+            if matrix is not None and row is not None and row < matrix.shape[0]:
+                found[position] = np.array(matrix[row])
+            else:
+                missing.append(position)
+
+        with self._lock:
+            self.hits += len(found)
+            self.misses += len(missing)
+        return found, missing
+
+    def store(
+        self,
+        audio_hash: str,
+        segment_embeddings: List[Tuple[Dict, np.ndarray]],
+        skipped_segments: Optional[List[Dict]] = None
+    ):
+        """
+        Add embeddings for a recording (existing spans are overwritten)
+
+        Args:
+            audio_hash: Content hash of the recording
+            segment_embeddings: (segment, embedding) tuples
+            skipped_segments: Segments that yielded no embedding
+        """
+        if not segment_embeddings and not skipped_segments:
+            return
+
+        with self._lock:
+            matrix, rows, skipped = self._load(audio_hash)
+            existing = np.array(matrix, dtype=np.float32) if matrix is not None else None
+            rows = dict(rows)
+            skipped.update(span_key(segment['start'], segment['end']) for segment in skipped_segments or [])
+
+            new_rows = []
+            for segment, embedding in segment_embeddings:
+                key = span_key(segment['start'], segment['end'])
+                if key in rows and existing is not None:
+                    existing[rows[key]] = embedding
+                    continue
+                rows[key] = (existing.shape[0] if existing is not None else 0) + len(new_rows)
+                new_rows.append(np.asarray(embedding, dtype=np.float32))
+
+            parts = ([existing] if existing is not None else []) + ([np.stack(new_rows)] if new_rows else [])
+            combined = np.concatenate(parts) if len(parts) > 1 else (parts[0] if parts else None)
+
+            matrix_path, index_path = self._paths(audio_hash)
+            directory = os.path.dirname(matrix_path)
+            os.makedirs(directory, exist_ok=True)
+
+            # Write both files under temp names, then swap them in
+            if combined is not None:
+                fd, temp_matrix = tempfile.mkstemp(suffix=".npy", dir=directory)
+                with os.fdopen(fd, "wb") as f:
+                    np.save(f, combined)
+            fd, temp_index = tempfile.mkstemp(suffix=".json", dir=directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({
+                    "model_id": self.model_id,
+                    "dim": int(combined.shape[1]) if combined is not None else None,
+                    "rows": rows,
+                    "skipped": sorted(skipped)
+                }, f)
+            if combined is not None:
+                os.replace(temp_matrix, matrix_path)
+            os.replace(temp_index, index_path)
+
+    def stats(self) -> Dict:
+        """Segment-level hit/miss counters"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
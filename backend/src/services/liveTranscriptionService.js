@@ -36,7 +36,14 @@ class LiveTranscriptionProcessor {
             modelSize: options.modelSize || 'tiny',  // Use tiny/base for real-time
             chunkDuration: options.chunkDuration || 5,  // Seconds of audio to buffer
             language: options.language || null,
-            enableSpeakerID: options.enableSpeakerID !== false
+            enableSpeakerID: options.enableSpeakerID !== false,
+            // Greedy decoding without word alignment when only text is shown;
+            // speaker ID needs accurate segment times
+            decodeProfile: options.decodeProfile ||
+                (options.enableSpeakerID === false ? 'live-fast' : 'archive-accurate'),
+            // Opt-in speech detector run before Whisper ('energy' or 'silero');
+            // silent chunks come back empty without a decode
+            vadPrestage: options.vadPrestage || null
         };
         
         this.audioBuffer = [];
@@ -127,6 +134,7 @@ class LiveTranscriptionProcessor {
                 }
             } else {
                 const reason = !result.success ? 'error' : 
+                              result.metadata?.skipped_silence ? `silence, speech ratio ${result.metadata.speech.speech_ratio}` :
                               !transcript ? 'empty' : 
                               wordCount < 3 ? `only ${wordCount} words` : 
                               'too short';
@@ -164,8 +172,12 @@ class LiveTranscriptionProcessor {
                 this.options.modelSize,
                 'auto',
                 'en',  // Force English to avoid wrong language detection on short clips
-                'false'  // Disable VAD for live chunks
+                'false',  // Disable VAD for live chunks
+                '--profile', this.options.decodeProfile
             ];
+            if (this.options.vadPrestage) {
+                args.push('--vad-prestage', this.options.vadPrestage);
+            }
             
             let stdout = '';
             let stderr = '';
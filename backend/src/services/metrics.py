@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing and resource instrumentation for the Python services
+
+StageMetrics times named pipeline stages (wall time, CPU time, resident
+memory and its change across the stage) for one request and renders them
+as the "metrics" block of a JSON result. MetricsRegistry aggregates those blocks across requests in a
+resident worker and renders them in the Prometheus text exposition format.
+startup_report describes a worker's cold start (heavy imports, model loads,
+prewarm) against the time since the process was spawned.
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+
+def current_rss_mb() -> Optional[float]:
+    """Current resident set size in MB (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return round(resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024), 1)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the process so far in MB"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS reports bytes
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def process_uptime_seconds() -> Optional[float]:
+    """Seconds since this process was spawned (None where /proc is unavailable)"""
+    try:
+        with open("/proc/self/stat", "r") as f:
+            # Fields after the parenthesized command name; starttime is field 22
+            fields = f.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as f:
+            uptime = float(f.read().split()[0])
+        return round(uptime - int(fields[19]) / os.sysconf("SC_CLK_TCK"), 3)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return None
+
+
+class StageMetrics:
+    """
+    Wall time, CPU time and memory for each named stage of one request
+
+    CPU time is process-wide, so it includes native library threads
+    (CTranslate2, PyTorch) working for the stage. Memory per stage is the
+    resident size when the stage last ended (rss_mb) and the net change in
+    resident size across its calls (rss_delta_mb: memory the stage kept,
+    such as a loaded model or decoded audio). Transient peaks inside a stage
+    are not captured, and the process-wide high-water mark is reported once
+    per block as process_peak_rss_mb.
+    """
+
+    def __init__(self):
+        self.stages = OrderedDict()
+        self._start_wall = time.perf_counter()
+        self._start_cpu = time.process_time()
+
+    @contextmanager
+    def stage(self, name: str):
+        """Time the enclosed block; repeated names accumulate"""
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        rss_start = current_rss_mb()
+        try:
+            yield
+        finally:
+            rss_end = current_rss_mb()
+            self.add(
+                name,
+                time.perf_counter() - wall_start,
+                time.process_time() - cpu_start,
+                rss_end - rss_start if rss_start is not None and rss_end is not None else None
+            )
+
+    def add(self, name: str, wall_seconds: float, cpu_seconds: float, rss_delta_mb: Optional[float] = None):
+        """Record an externally timed stage (rss_delta_mb is unknown for work done elsewhere)"""
+        entry = self.stages.setdefault(
+            name, {"wall_seconds": 0.0, "cpu_seconds": 0.0, "calls": 0, "rss_delta_mb": None}
+        )
+        entry["wall_seconds"] += wall_seconds
+        entry["cpu_seconds"] += cpu_seconds
+        entry["calls"] += 1
+        if rss_delta_mb is not None:
+            entry["rss_delta_mb"] = (entry["rss_delta_mb"] or 0.0) + rss_delta_mb
+        entry["rss_mb"] = current_rss_mb()
+
+    def as_dict(self, audio_seconds: Optional[float] = None) -> Dict:
+        """
+        Metrics block for a JSON result
+
+        Args:
+            audio_seconds: Processed audio length, used for the real-time factor
+        """
+        wall = time.perf_counter() - self._start_wall
+        block = {
+            "stages": {
+                name: {
+                    "wall_seconds": round(entry["wall_seconds"], 4),
+                    "cpu_seconds": round(entry["cpu_seconds"], 4),
+                    "calls": entry["calls"],
+                    "rss_mb": entry["rss_mb"],
+                    "rss_delta_mb": round(entry["rss_delta_mb"], 1) if entry["rss_delta_mb"] is not None else None
+                }
+                for name, entry in self.stages.items()
+            },
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(time.process_time() - self._start_cpu, 4),
+            "process_peak_rss_mb": peak_rss_mb()
+        }
+        if audio_seconds:
+            block["audio_seconds"] = round(audio_seconds, 2)
+            block["real_time_factor"] = round(wall / audio_seconds, 4)
+        return block
+
+
+@contextmanager
+def optional_stage(metrics: Optional[StageMetrics], name: str):
+    """StageMetrics.stage that is a no-op when metrics is None"""
+    if metrics is None:
+        yield
+    else:
+        with metrics.stage(name):
+            yield
+
+
+def startup_report(startup: StageMetrics) -> Dict:
+    """
+    Cold-start report of a worker process
+
+    Args:
+        startup: Process-wide stages recorded while starting (imports, model
+            loads, prewarm)
+
+    Returns:
+        dict: Those stages, the process uptime (which also covers interpreter
+            start and light imports) and peak RSS
+    """
+    block = startup.as_dict()
+    return {
+        "stages": block["stages"],
+        "process_uptime_seconds": process_uptime_seconds(),
+        "peak_rss_mb": block["process_peak_rss_mb"]
+    }
+
+
+def startup_summary(report: Dict) -> str:
+    """One log line for a startup report"""
+    parts = [f"{name} {stage['wall_seconds']:.2f}s" for name, stage in report["stages"].items()]
+    uptime = report.get("process_uptime_seconds")
+    if uptime is not None:
+        parts.append(f"ready after {uptime:.2f}s")
+    return ", ".join(parts) or "no start-up stages recorded"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class MetricsRegistry:
+    """
+    Aggregates per-request metrics blocks for Prometheus scraping
+
+    Exposed series (all labelled with service):
+        acta_requests_total{status}
+        acta_audio_seconds_total
+        acta_stage_calls_total{stage}
+        acta_stage_wall_seconds_total{stage}
+        acta_stage_cpu_seconds_total{stage}
+        acta_process_peak_rss_bytes
+
+    Stage names carry work that faster-whisper does inside a timed call:
+    "prepare(+vad)" includes its VAD filter and "decode(+align)" its word
+    alignment pass.
+    """
+
+    def __init__(self, service: str, export_path: Optional[str] = None):
+        """
+        Args:
+            service: Value of the "service" label
+            export_path: If set, the text exposition is rewritten there after
+                every request (for node_exporter's textfile collector)
+        """
+        self.service = service
+        self.export_path = export_path
+        self.requests = {}
+        self.audio_seconds = 0.0
+        self.stages = OrderedDict()
+        self._lock = threading.Lock()
+
+    def observe(self, result: Dict):
+        """Fold one result (with or without a metrics block) into the totals"""
+        status = "success" if result.get("success") else "error"
+        block = result.get("metrics") or {}
+
+        with self._lock:
+            self.requests[status] = self.requests.get(status, 0) + 1
+            self.audio_seconds += block.get("audio_seconds") or 0.0
+            for name, stage in block.get("stages", {}).items():
+                totals = self.stages.setdefault(name, {"calls": 0, "wall_seconds": 0.0, "cpu_seconds": 0.0})
+                totals["calls"] += stage.get("calls", 1)
+                totals["wall_seconds"] += stage.get("wall_seconds", 0.0)
+                totals["cpu_seconds"] += stage.get("cpu_seconds", 0.0)
+
+        if self.export_path:
+            self.export()
+
+    def prometheus_text(self) -> str:
+        """Current totals in the Prometheus text exposition format"""
+        service = _escape(self.service)
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                label_text = ",".join([f'service="{service}"'] + [f'{key}="{_escape(val)}"' for key, val in labels])
+                lines.append(f"{name}{{{label_text}}} {value}")
+
+        with self._lock:
+            metric("acta_requests_total", "counter", "Requests handled by status",
+                   [((("status", status),), count) for status, count in self.requests.items()])
+            metric("acta_audio_seconds_total", "counter", "Seconds of audio processed",
+                   [((), round(self.audio_seconds, 3))])
+            metric("acta_stage_calls_total", "counter", "Pipeline stage executions",
+                   [((("stage", name),), totals["calls"]) for name, totals in self.stages.items()])
+            metric("acta_stage_wall_seconds_total", "counter", ("Wall-clock seconds spent per pipeline stage "
+                    "(prepare(+vad) includes VAD, decode(+align) word alignment)"),
+                   [((("stage", name),), round(totals["wall_seconds"], 6)) for name, totals in self.stages.items()])
+            metric("acta_stage_cpu_seconds_total", "counter", ("Process CPU seconds spent per pipeline stage "
+                    "(prepare(+vad) includes VAD, decode(+align) word alignment)"),
+                   [((("stage", name),), round(totals["cpu_seconds"], 6)) for name, totals in self.stages.items()])
+
+        peak = peak_rss_mb()
+        metric("acta_process_peak_rss_bytes", "gauge", "Peak resident memory of the worker process",
+               [((), int(peak * 1024 * 1024) if peak is not None else 0)])
+        return "\n".join(lines) + "\n"
+
+    def export(self):
+        """Atomically rewrite export_path with the current exposition"""
+        directory = os.path.dirname(os.path.abspath(self.export_path))
+        fd, temp_path = tempfile.mkstemp(suffix=".prom", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.prometheus_text())
+            os.replace(temp_path, self.export_path)
+        except OSError as e:
+            if os.path.exists(temp_path):
+                os.unlink(temp_path)
+            print(f"⚠️  Could not export metrics: {str(e)[:100]}", file=sys.stderr)
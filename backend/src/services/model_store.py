@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""
+Local model store for offline worker start-up
+
+Without a store, both services resolve their models through the Hugging Face
+hub on first use, and SpeechBrain copies its files into a directory relative
+to the working directory. A model store is one root directory that models
+are fetched into once, with a manifest of per-file SHA-256 checksums. Workers
+then load exclusively from it (local_files_only), so start-up never waits on
+a hub lookup, and every worker on a machine maps the same weight files and
+shares them through the page cache.
+
+Layout:
+    <root>/manifest.json
+    <root>/whisper/<model_size>/               CTranslate2 model directory
+    <root>/speechbrain/spkrec-ecapa-voxceleb/  SpeechBrain hparams + checkpoints
+"""
+
+import os
+import sys
+import json
+import shutil
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional
+
+from cli import pop_option
+from result_cache import file_sha256
+
+MODEL_KINDS = ("whisper", "speechbrain")
+
+# SpeechBrain models by store name -> hub repository
+SPEECHBRAIN_MODELS = {
+    "spkrec-ecapa-voxceleb": "speechbrain/spkrec-ecapa-voxceleb",
+}
+
+
+class ModelStore:
+    """
+    Model directories under one root, tracked in <root>/manifest.json
+    """
+
+    def __init__(self, root: str):
+        """
+        Args:
+            root: Store directory (created if missing)
+        """
+        self.root = os.path.abspath(root)
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key(kind: str, name: str) -> str:
+        """Manifest key of a model, e.g. "whisper/base" """
+        if kind not in MODEL_KINDS:
+            raise ValueError(f"Unknown model kind: {kind} (available: {', '.join(MODEL_KINDS)})")
+        return f"{kind}/{name}"
+
+    def model_dir(self, kind: str, name: str) -> str:
+        return os.path.join(self.root, self.key(kind, name))
+
+    def _manifest_path(self) -> str:
+        return os.path.join(self.root, "manifest.json")
+
+    def manifest(self) -> Dict:
+        """
+        Current manifest, re-read from disk since other processes may fetch
+
+        Returns:
+            dict: {"models": {key: {"kind", "name", "source", "files", "fetched_at"}}}
+        """
+        try:
+            with open(self._manifest_path(), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {"models": {}}
+
+    def _save_manifest(self, manifest: Dict):
+        fd, temp_path = tempfile.mkstemp(suffix=".json", dir=self.root)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(temp_path, self._manifest_path())
+
+    @staticmethod
+    def _checksums(directory: str) -> Dict[str, Dict]:
+        """SHA-256 and size of every file below directory (hub metadata skipped)"""
+        files = {}
+        for parent, dirnames, filenames in os.walk(directory):
+            # huggingface_hub keeps download bookkeeping in .cache/
+            dirnames[:] = sorted(name for name in dirnames if not name.startswith("."))
+            for filename in sorted(filenames):
+                path = os.path.join(parent, filename)
+                relative = os.path.relpath(path, directory).replace(os.sep, "/")
+                files[relative] = {"sha256": file_sha256(path), "bytes": os.path.getsize(path)}
+        return files
+
+    def fetch(self, kind: str, name: str, force: bool = False) -> Dict:
+        """
+        Download a model into the store and record its checksums
+
+        The download goes to a temporary directory that is renamed into place
+        afterwards, so workers never see a half-written model.
+
+        Args:
+            kind: "whisper" (name is a size such as "base" or a CTranslate2
+                hub repository) or "speechbrain" (name from SPEECHBRAIN_MODELS)
+            name: Model name
+            force: Fetch again even if the model is already in the store
+
+        Returns:
+            dict: The model's manifest entry
+        """
+        key = self.key(kind, name)
+        existing = self.manifest()["models"].get(key)
+        if existing and not force and os.path.isdir(self.model_dir(kind, name)):
+            return existing
+
+        if kind == "speechbrain" and name not in SPEECHBRAIN_MODELS:
+            raise ValueError(
+                f"Unknown SpeechBrain model: {name} (available: {', '.join(SPEECHBRAIN_MODELS)})"
+            )
+
+        target = self.model_dir(kind, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        staging = tempfile.mkdtemp(prefix=f".{os.path.basename(target)}.", dir=os.path.dirname(target))
+
+        print(f"⬇️  Fetching {key}...", file=sys.stderr)
+        try:
+            if kind == "whisper":
+                from faster_whisper.utils import download_model
+                source = name
+                download_model(name, output_dir=staging)
+            else:
+                from huggingface_hub import snapshot_download
+                source = SPEECHBRAIN_MODELS[name]
+                snapshot_download(repo_id=source, local_dir=staging)
+
+            files = self._checksums(staging)
+            if os.path.isdir(target):
+                shutil.rmtree(target)
+            os.replace(staging, target)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        entry = {
+            "kind": kind,
+            "name": name,
+            "source": source,
+            "files": files,
+            "fetched_at": time.time()
+        }
+        with self._lock:
+            manifest = self.manifest()
+            manifest["models"][key] = entry
+            self._save_manifest(manifest)
+
+        total_mb = sum(info["bytes"] for info in files.values()) / (1024 * 1024)
+        print(f"✅ Stored {key} ({len(files)} files, {total_mb:.0f} MB)", file=sys.stderr)
+        return entry
+
+    def verify(self, keys: Optional[List[str]] = None) -> Dict[str, Dict]:
+        """
+        Re-hash stored models against the manifest
+
+        Args:
+            keys: Manifest keys to check (default: every stored model)
+
+        Returns:
+            dict: Per key {"ok", "missing", "mismatched"} with the offending
+                relative file paths
+        """
+        models = self.manifest()["models"]
+        report = {}
+        for key in keys or sorted(models):
+            entry = models.get(key)
+            if entry is None:
+                report[key] = {"ok": False, "missing": ["(not in manifest)"], "mismatched": []}
+                continue
+
+            directory = os.path.join(self.root, key)
+            missing, mismatched = [], []
+            for relative, expected in entry["files"].items():
+                path = os.path.join(directory, relative)
+                if not os.path.isfile(path):
+                    missing.append(relative)
+                elif file_sha256(path) != expected["sha256"]:
+                    mismatched.append(relative)
+            report[key] = {"ok": not missing and not mismatched, "missing": missing, "mismatched": mismatched}
+        return report
+
+    def path(self, kind: str, name: str) -> str:
+        """
+        Directory to load a stored model from
+
+        Only file presence and sizes are checked here (hashing multi-GB
+        weights on every start-up would defeat the point); use verify() for
+        a full integrity check.
+
+        Raises:
+            FileNotFoundError: The model is not fetched or files are missing
+        """
+        key = self.key(kind, name)
+        entry = self.manifest()["models"].get(key)
+        directory = self.model_dir(kind, name)
+        hint = f"fetch it with: python model_store.py fetch {kind} {name} --root {self.root}"
+
+        if entry is None:
+            raise FileNotFoundError(f"{key} is not in the model store {self.root}; {hint}")
+        for relative, expected in entry["files"].items():
+            path = os.path.join(directory, relative)
+            if not os.path.isfile(path) or os.path.getsize(path) != expected["bytes"]:
+                raise FileNotFoundError(f"{key} is incomplete in {self.root} ({relative}); {hint} --force")
+        return directory
+
+    def list_models(self) -> List[Dict]:
+        """Stored models with their size on disk"""
+        return [
+            {
+                "key": key,
+                "source": entry["source"],
+                "files": len(entry["files"]),
+                "size_mb": round(sum(info["bytes"] for info in entry["files"].values()) / (1024 * 1024), 1),
+                "fetched_at": entry["fetched_at"]
+            }
+            for key, entry in sorted(self.manifest()["models"].items())
+        ]
+
+
+def main():
+    """
+    CLI entry point
+
+    Usage:
+        python model_store.py fetch <kind> <name> [<name> ...] [--root DIR] [--force]
+        python model_store.py verify [<kind>/<name> ...] [--root DIR]
+        python model_store.py list [--root DIR]
+
+    --root defaults to $MODEL_STORE_DIR; kind is "whisper" or "speechbrain".
+
+    Examples:
+        python model_store.py fetch whisper tiny base --root /srv/acta/models
+        python model_store.py fetch speechbrain spkrec-ecapa-voxceleb --root /srv/acta/models
+        python model_store.py verify whisper/base --root /srv/acta/models
+        MODEL_STORE_DIR=/srv/acta/models python transcribe_audio.py --serve base
+
+    The services load from the store named by --model-store or
+    $MODEL_STORE_DIR with local_files_only, and fail fast if a model has not
+    been fetched instead of downloading it.
+    """
+    args = sys.argv[1:]
+
+    try:
+        root = pop_option(args, "--root") or os.environ.get("MODEL_STORE_DIR")
+        force = pop_option(args, "--force", has_value=False)
+        if not root:
+            raise ValueError("No store directory: pass --root DIR or set MODEL_STORE_DIR")
+        if not args or args[0] not in ("fetch", "verify", "list"):
+            raise ValueError("Usage: python model_store.py fetch|verify|list [...] [--root DIR]")
+        store = ModelStore(root)
+        command = args[0]
+
+        if command == "fetch":
+            if len(args) < 3:
+                raise ValueError("Usage: python model_store.py fetch <kind> <name> [<name> ...]")
+            entries = {store.key(args[1], name): store.fetch(args[1], name, force=bool(force)) for name in args[2:]}
+            result = {
+                "success": True,
+                "root": store.root,
+                "fetched": {key: {"source": entry["source"], "files": len(entry["files"])} for key, entry in entries.items()}
+            }
+        elif command == "verify":
+            report = store.verify(args[1:] or None)
+            result = {
+                "success": all(model["ok"] for model in report.values()),
+                "root": store.root,
+                "models": report
+            }
+        else:
+            result = {"success": True, "root": store.root, "models": store.list_models()}
+    except Exception as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
+
+    print(json.dumps(result, indent=2))
+    sys.exit(0 if result["success"] else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Bounded store for per-client state held by the service workers
+
+Live diarization sessions and streaming transcriptions are opened by one
+request and normally closed by another. A client that crashes or drops its
+connection never sends the close, so the workers keep that state in a
+SessionStore instead of a plain dict: entries idle for longer than a TTL
+are dropped, and past a maximum count the least recently used entry is
+dropped to make room. Evictions are counted for the "stats" command.
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterator, MutableMapping, Optional
+
+# Defaults for the --session-ttl / --stream-ttl and --max-sessions /
+# --max-streams options
+DEFAULT_IDLE_SECONDS = 1800.0
+DEFAULT_MAX_ENTRIES = 64
+
+
+class SessionStore(MutableMapping):
+    """
+    Dict of live state with an idle TTL and an LRU size cap
+
+    Reading or writing an entry marks it as used. Expired entries are
+    dropped lazily on the next access, so an idle worker holds them until
+    its next request.
+    """
+
+    def __init__(
+        self,
+        kind: str = "session",
+        idle_seconds: Optional[float] = DEFAULT_IDLE_SECONDS,
+        max_entries: Optional[int] = DEFAULT_MAX_ENTRIES
+    ):
+        """
+        Args:
+            kind: What the entries are, for log lines ("live stream", ...)
+            idle_seconds: Drop entries unused for this long (None: never)
+            max_entries: Keep at most this many entries (None: unbounded)
+        """
+        self.kind = kind
+        self.idle_seconds = idle_seconds
+        self.max_entries = max_entries
+        self.idle_evictions = 0
+        self.capacity_evictions = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()  # Least recently used first
+        self._last_used: Dict[Hashable, float] = {}
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        if self.idle_seconds is None:
+            return
+        while self._entries:
+            key = next(iter(self._entries))
+            if now - self._last_used[key] <= self.idle_seconds:
+                break
+            self._drop(key)
+            self.idle_evictions += 1
+            print(f"⌛ Dropped idle {self.kind}: {key}", file=sys.stderr)
+
+    def _drop(self, key: Hashable):
+        del self._entries[key]
+        del self._last_used[key]
+
+    def __getitem__(self, key: Hashable) -> Any:
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            value = self._entries[key]
+            self._entries.move_to_end(key)
+            self._last_used[key] = now
+            return value
+
+    def __setitem__(self, key: Hashable, value: Any):
+        with self._lock:
+            now = time.monotonic()
+            self._expire(now)
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            self._last_used[key] = now
+            while self.max_entries is not None and len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.capacity_evictions += 1
+                print(f"⌛ Dropped least recently used {self.kind}: {oldest}", file=sys.stderr)
+
+    def __delitem__(self, key: Hashable):
+        with self._lock:
+            self._drop(key)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        with self._lock:
+            self._expire(time.monotonic())
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        with self._lock:
+            self._expire(time.monotonic())
+            return len(self._entries)
+
+    def stats(self) -> Dict:
+        """Open entries, limits and eviction counts"""
+        return {
+            "open": len(self),
+            "idle_seconds": self.idle_seconds,
+            "max_entries": self.max_entries,
+            "idle_evictions": self.idle_evictions,
+            "capacity_evictions": self.capacity_evictions
+        }
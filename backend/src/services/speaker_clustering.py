@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Offline (global) speaker clustering over a full embedding matrix
+
+Online diarization assigns each segment greedily as it arrives, so early
+mistakes stick. When a whole recording is available, all segment embeddings
+can be clustered at once instead: the cosine similarity matrix is computed
+in one matrix product and clustered with average-linkage agglomerative or
+spectral clustering, with either a known speaker count or an automatic
+estimate.
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+from scipy.cluster.hierarchy import fcluster, linkage
+
+CLUSTERING_METHODS = ("agglomerative", "spectral")
+
+
+def normalize_rows(embeddings: np.ndarray) -> np.ndarray:
+    """L2-normalize each embedding row"""
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def cosine_similarity_matrix(embeddings: np.ndarray) -> np.ndarray:
+    """Pairwise cosine similarities of all rows (N x N)"""
+    normalized = normalize_rows(embeddings)
+    return np.clip(normalized @ normalized.T, -1.0, 1.0)
+
+
+def relabel_by_first_appearance(labels: np.ndarray) -> np.ndarray:
+    """Renumber cluster labels 0..K-1 in order of first occurrence"""
+    _, first_index, inverse = np.unique(labels, return_index=True, return_inverse=True)
+    order = np.argsort(np.argsort(first_index))
+    return order[inverse]
+
+
+def agglomerative_cluster(
+    embeddings: np.ndarray,
+    similarity_threshold: float = 0.75,
+    num_speakers: Optional[int] = None
+) -> np.ndarray:
+    """
+    Average-linkage clustering on cosine distance
+
+    Without a speaker count, merging stops once the average similarity
+    between two clusters falls below similarity_threshold, which matches the
+    online "mean" scoring rule applied globally.
+
+    Returns:
+        numpy array: Cluster label per row
+    """
+    if embeddings.shape[0] < 2:
+        return np.zeros(embeddings.shape[0], dtype=np.int64)
+
+    tree = linkage(normalize_rows(embeddings), method="average", metric="cosine")
+    if num_speakers:
+        labels = fcluster(tree, t=num_speakers, criterion="maxclust")
+    else:
+        labels = fcluster(tree, t=1.0 - similarity_threshold, criterion="distance")
+    return labels - 1
+
+
+def _affinity(similarity: np.ndarray, prune_ratio: float = 0.2) -> np.ndarray:
+    """Keep each row's strongest neighbours and symmetrize (row-wise p-pruning)"""
+    n = similarity.shape[0]
+    keep = max(2, int(np.ceil(prune_ratio * n)))
+    affinity = np.clip(similarity, 0.0, None)
+    np.fill_diagonal(affinity, 0.0)
+
+    if keep < n:
+        # Zero all but the top `keep` entries of every row
+        cutoff = np.partition(affinity, n - keep, axis=1)[:, n - keep][:, None]
+        affinity = np.where(affinity >= cutoff, affinity, 0.0)
+
+    return 0.5 * (affinity + affinity.T)
+
+
+def _kmeans(points: np.ndarray, k: int, iterations: int = 50) -> np.ndarray:
+    """Deterministic k-means with farthest-point initialization"""
+    centers = [points[0]]
+    for _ in range(1, k):
+        distances = np.min(
+            np.linalg.norm(points[:, None, :] - np.array(centers)[None, :, :], axis=2),
+            axis=1
+        )
+        centers.append(points[int(np.argmax(distances))])
+    centers = np.array(centers)
+
+    labels = np.zeros(points.shape[0], dtype=np.int64)
+    for iteration in range(iterations):
+        distances = np.linalg.norm(points[:, None, :] - centers[None, :, :], axis=2)
+        new_labels = np.argmin(distances, axis=1)
+        if iteration > 0 and np.array_equal(new_labels, labels):
+            break
+        labels = new_labels
+        for cluster in range(k):
+            members = points[labels == cluster]
+            if len(members):
+                centers[cluster] = members.mean(axis=0)
+    return labels
+
+
+def spectral_cluster(
+    embeddings: np.ndarray,
+    num_speakers: Optional[int] = None,
+    max_speakers: int = 10
+) -> np.ndarray:
+    """
+    Spectral clustering on a pruned cosine affinity graph
+
+    Without a speaker count, the number of clusters is estimated from the
+    largest gap between consecutive eigenvalues of the normalized Laplacian.
+
+    Returns:
+        numpy array: Cluster label per row
+    """
+    n = embeddings.shape[0]
+    if n < 3:
+        return agglomerative_cluster(embeddings, num_speakers=num_speakers)
+
+    affinity = _affinity(cosine_similarity_matrix(embeddings))
+    degree = np.maximum(affinity.sum(axis=1), 1e-12)
+    inv_sqrt = 1.0 / np.sqrt(degree)
+    laplacian = np.eye(n) - inv_sqrt[:, None] * affinity * inv_sqrt[None, :]
+
+    eigenvalues, eigenvectors = np.linalg.eigh(laplacian)
+
+    if num_speakers:
+        k = min(num_speakers, n)
+    else:
+        limit = min(max_speakers, n - 1)
+        gaps = np.diff(eigenvalues[:limit + 1])
+        k = int(np.argmax(gaps)) + 1
+
+    if k <= 1:
+        return np.zeros(n, dtype=np.int64)
+
+    spectral_embedding = normalize_rows(eigenvectors[:, :k])
+    return _kmeans(spectral_embedding, k)
+
+
+def cluster_embeddings(
+    embeddings: np.ndarray,
+    method: str = "agglomerative",
+    similarity_threshold: float = 0.75,
+    num_speakers: Optional[int] = None,
+    max_speakers: int = 10
+) -> np.ndarray:
+    """
+    Cluster a full embedding matrix
+
+    Args:
+        embeddings: One speaker embedding per row (N x dim)
+        method: "agglomerative" or "spectral"
+        similarity_threshold: Merge threshold for agglomerative clustering
+            when the speaker count is unknown
+        num_speakers: Known number of speakers (None to estimate)
+        max_speakers: Upper bound for the spectral eigengap estimate
+
+    Returns:
+        numpy array: Labels 0..K-1 numbered by first appearance
+    """
+    if method not in CLUSTERING_METHODS:
+        raise ValueError(f"Unknown clustering method: {method}")
+    if embeddings.shape[0] == 0:
+        return np.zeros(0, dtype=np.int64)
+
+    if method == "spectral":
+        labels = spectral_cluster(embeddings, num_speakers, max_speakers)
+    else:
+        labels = agglomerative_cluster(embeddings, similarity_threshold, num_speakers)
+    return relabel_by_first_appearance(labels)
+
+
+def cluster_quality(embeddings: np.ndarray, labels: np.ndarray) -> Dict:
+    """
+    Cosine silhouette and intra/inter-cluster similarity of a labelling
+
+    Args:
+        embeddings: One embedding per row (N x dim)
+        labels: Cluster labels 0..K-1
+
+    Returns:
+        dict: Overall silhouette, mean intra/inter similarity, and
+            per-cluster silhouette/size lists indexed by label
+    """
+    n = embeddings.shape[0]
+    k = int(labels.max()) + 1 if n else 0
+    similarity = cosine_similarity_matrix(embeddings) if n else np.zeros((0, 0))
+
+    one_hot = np.zeros((n, k))
+    one_hot[np.arange(n), labels] = 1.0
+    sizes = one_hot.sum(axis=0)
+
+    same = labels[:, None] == labels[None, :]
+    off_diagonal = ~np.eye(n, dtype=bool)
+    intra = similarity[same & off_diagonal]
+    inter = similarity[~same]
+
+    silhouette = np.zeros(n)
+    if k > 1:
+        # Mean cosine distance from every point to every cluster in one product
+        distance_sums = (1.0 - similarity) @ one_hot
+        own_counts = sizes[labels] - 1
+        own = distance_sums[np.arange(n), labels] / np.maximum(own_counts, 1)
+        others = distance_sums / np.maximum(sizes, 1)
+        others[np.arange(n), labels] = np.inf
+        nearest = others.min(axis=1)
+        silhouette = np.where(
+            own_counts > 0,
+            (nearest - own) / np.maximum(np.maximum(own, nearest), 1e-12),
+            0.0
+        )
+
+    per_cluster = [
+        float(silhouette[labels == cluster].mean()) if sizes[cluster] else 0.0
+        for cluster in range(k)
+    ]
+
+    return {
+        "silhouette": round(float(silhouette.mean()), 4) if k > 1 else None,
+        "mean_intra_similarity": round(float(intra.mean()), 4) if intra.size else None,
+        "mean_inter_similarity": round(float(inter.mean()), 4) if inter.size else None,
+        "cluster_silhouette": [round(value, 4) for value in per_cluster],
+        "cluster_sizes": [int(size) for size in sizes]
+    }
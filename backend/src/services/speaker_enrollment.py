@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Persistent enrollment database of named speakers
+
+Each enrolled person is one voiceprint row in a contiguous float32 ``.npy``
+matrix (the mean of their L2-normalized samples), with names and enrollment
+counts in a small JSON index next to it. Matching a meeting's speakers
+against every enrolled person is a single (speakers x dim) @ (dim x
+enrolled) product over the normalized rows, which stays in the milliseconds
+even for thousands of enrolled users.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+def _normalize(embeddings: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(embeddings, axis=-1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+class SpeakerEnrollment:
+    """
+    On-disk voiceprint store: <db_dir>/speakers.npy + speakers.json
+
+    The whole matrix is held in memory (thousands of 192-dim rows are well
+    under a few MB) and rewritten atomically on every change.
+    """
+
+    def __init__(self, db_dir: str, model_id: str = "speechbrain/spkrec-ecapa-voxceleb"):
+        """
+        Args:
+            db_dir: Directory holding the enrollment database
+            model_id: Embedding model identifier; a database built with
+                another model is rejected since its vectors are not comparable
+        """
+        self.db_dir = db_dir
+        self.model_id = model_id
+        self._lock = threading.Lock()
+        os.makedirs(db_dir, exist_ok=True)
+
+        self.matrix = np.zeros((0, 0), dtype=np.float32)  # Row -> mean of unit samples
+        self._unit = self.matrix  # Row -> normalized voiceprint, used for matching
+        self.speakers: List[Dict] = []  # Row -> {"name", "count", "enrolled_at"}
+        self._rows: Dict[str, int] = {}
+        self._load()
+
+    def _paths(self) -> Tuple[str, str]:
+        return os.path.join(self.db_dir, "speakers.npy"), os.path.join(self.db_dir, "speakers.json")
+
+    def _load(self):
+        matrix_path, index_path = self._paths()
+        if not os.path.exists(index_path):
+            return
+
+        with open(index_path, "r", encoding="utf-8") as f:
+            index = json.load(f)
+        if index.get("model_id") != self.model_id:
+            raise ValueError(
+                f"Enrollment database {self.db_dir} was built with {index.get('model_id')}, "
+                f"not {self.model_id}"
+            )
+
+        self.matrix = np.load(matrix_path).astype(np.float32)
+        self._unit = _normalize(self.matrix)
+        self.speakers = index["speakers"]
+        self._rows = {speaker["name"]: row for row, speaker in enumerate(self.speakers)}
+
+    def _save(self):
+        matrix_path, index_path = self._paths()
+
+        # Write both files under temp names, then swap them in
+        fd, temp_matrix = tempfile.mkstemp(suffix=".npy", dir=self.db_dir)
+        with os.fdopen(fd, "wb") as f:
+            np.save(f, self.matrix)
+        fd, temp_index = tempfile.mkstemp(suffix=".json", dir=self.db_dir)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({
+                "model_id": self.model_id,
+                "dim": int(self.matrix.shape[1]) if self.matrix.size else 0,
+                "speakers": self.speakers
+            }, f)
+        os.replace(temp_matrix, matrix_path)
+        os.replace(temp_index, index_path)
+
+    def __len__(self) -> int:
+        return len(self.speakers)
+
+    def enroll(self, name: str, embeddings: np.ndarray) -> Dict:
+        """
+        Add a person, or refine an existing voiceprint with more samples
+
+        Args:
+            name: Display name of the speaker
+            embeddings: One embedding (dim,) or several (k x dim) from the
+                same person; they are averaged into the stored voiceprint
+
+        Returns:
+            dict: The speaker's entry ("name", "count", "enrolled_at")
+        """
+        samples = _normalize(np.atleast_2d(np.asarray(embeddings, dtype=np.float32)))
+
+        with self._lock:
+            row = self._rows.get(name)
+            if row is None:
+                if self.matrix.size and samples.shape[1] != self.matrix.shape[1]:
+                    raise ValueError(
+                        f"Embedding dimension {samples.shape[1]} does not match "
+                        f"database dimension {self.matrix.shape[1]}"
+                    )
+                voiceprint = samples.mean(axis=0)
+                self.matrix = (
+                    np.vstack([self.matrix, voiceprint[None, :]])
+                    if self.matrix.size else voiceprint[None, :]
+                )
+                entry = {"name": name, "count": len(samples), "enrolled_at": time.time()}
+                self.speakers.append(entry)
+                self._rows[name] = len(self.speakers) - 1
+            else:
+                # Running mean of the normalized samples; only the matching
+                # copy is renormalized, so earlier samples keep their weight
+                entry = self.speakers[row]
+                total = self.matrix[row] * entry["count"] + samples.sum(axis=0)
+                entry["count"] += len(samples)
+                self.matrix[row] = total / entry["count"]
+
+            self._unit = _normalize(self.matrix)
+            self._save()
+            return dict(entry)
+
+    def remove(self, name: str) -> bool:
+        """Delete a person; returns False if they were not enrolled"""
+        with self._lock:
+            row = self._rows.get(name)
+            if row is None:
+                return False
+
+            self.matrix = np.delete(self.matrix, row, axis=0)
+            self._unit = np.delete(self._unit, row, axis=0)
+            self.speakers.pop(row)
+            self._rows = {speaker["name"]: index for index, speaker in enumerate(self.speakers)}
+            self._save()
+            return True
+
+    def match(
+        self,
+        embeddings: np.ndarray,
+        threshold: float = 0.75
+    ) -> List[Tuple[Optional[str], float]]:
+        """
+        Assign enrolled people to query embeddings, at most one each
+
+        The queries are distinct speakers, so no enrolled person is given to
+        two of them: pairs are taken greedily from the highest similarity
+        down, skipping queries and people already assigned.
+
+        Args:
+            embeddings: Query embeddings (k x dim), e.g. a meeting's speaker centroids
+            threshold: Minimum cosine similarity for a match
+
+        Returns:
+            List of (name or None, similarity) per query row; the similarity
+            is that of the assigned person, or the best one if none was
+        """
+        queries = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+
+        with self._lock:
+            if not len(self.speakers) or not len(queries):
+                return [(None, 0.0)] * len(queries)
+
+            scores = _normalize(queries) @ self._unit.T
+            names = [speaker["name"] for speaker in self.speakers]
+
+        matches = [(None, float(score)) for score in scores.max(axis=1)]
+        taken = set()
+        for flat in np.argsort(scores, axis=None)[::-1]:
+            query, row = np.unravel_index(flat, scores.shape)
+            if scores[query, row] < threshold:
+                break
+            if matches[query][0] is not None or row in taken:
+                continue
+            matches[query] = (names[row], float(scores[query, row]))
+            taken.add(row)
+            if len(taken) == len(queries):
+                break
+        return matches
+
+    def list_speakers(self) -> List[Dict]:
+        """Enrolled speakers with their sample counts"""
+        with self._lock:
+            return [dict(speaker) for speaker in self.speakers]
+
+    def stats(self) -> Dict:
+        """Database size summary"""
+        return {
+            "enrolled_speakers": len(self.speakers),
+            "dim": int(self.matrix.shape[1]) if self.matrix.size else 0,
+            "db_dir": self.db_dir
+        }
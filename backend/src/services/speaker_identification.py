@@ -8,36 +8,159 @@ using SpeechBrain's ECAPA-TDNN model for speaker embeddings.
 Features:
 - GPU-accelerated speaker embedding extraction
 - Real-time speaker clustering
-- Speaker enrollment from audio samples
+- Speaker enrollment from audio samples (persistent named voiceprints)
 - Cosine similarity-based speaker matching
 - Low latency suitable for live transcription
+- Resident service mode (JSON lines on stdin or a Unix socket)
+- Accepts decoded 16kHz .npy audio shared with transcribe_audio.py
+- Segment-sliced, memory-mapped audio reads (memory bounded by batch size)
+- Incremental per-meeting sessions with persistent speaker labels
+- Persistent per-segment embedding cache for cheap re-clustering
+- Offline global clustering (agglomerative or spectral) for full recordings
+- Per-stage timing/memory metrics in results, Prometheus export in service mode
+- Deferred torch/SpeechBrain imports, model prewarm and a cold-start timing report
+- Offline loading from a checksummed local model store (model_store.py)
 """
 
 # Fix OpenMP library conflict (MUST be set before importing any libraries)
 import os
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 
+import inspect
 import sys
 import json
 import warnings
 import tempfile
+import time
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple
 import numpy as np
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
-try:
-    import torch
-    import torchaudio
-    from speechbrain.pretrained import EncoderClassifier
-except ImportError as e:
-    print(json.dumps({
-        "success": False,
-        "error": f"Required library not installed: {str(e)}. Install with: pip install speechbrain torch torchaudio"
-    }))
-    sys.exit(1)
+from audio_utils import (
+    SAMPLE_RATE,
+    decode_to_memmap,
+    is_decoded_audio,
+    load_decoded_audio,
+    normalize_audio,
+    open_wav,
+    read_slice
+)
+from cli import pop_option
+from embedding_cache import EmbeddingCache
+from speaker_enrollment import SpeakerEnrollment
+from speaker_clustering import CLUSTERING_METHODS, cluster_embeddings, cluster_quality, normalize_rows
+from metrics import MetricsRegistry, StageMetrics, optional_stage, startup_report, startup_summary
+from model_store import ModelStore
+from result_cache import file_sha256
+from session_store import DEFAULT_IDLE_SECONDS, DEFAULT_MAX_ENTRIES, SessionStore
+
+# Cold-start stages of this process (torch/SpeechBrain imports, model load,
+# prewarm), reported by {"command": "stats"} and {"command": "prewarm"}
+STARTUP = StageMetrics()
+
+# Bound by import_speechbrain() on first use
+torch = None
+torchaudio = None
+EncoderClassifier = None
+
+
+def import_speechbrain():
+    """
+    Import torch, torchaudio and SpeechBrain on first use
+
+    Together they take seconds to import, so they are deferred until a
+    SpeakerIdentifier is created: argument errors never pay for them.
+
+    Raises:
+        ImportError: One of the libraries is not installed
+    """
+    global torch, torchaudio, EncoderClassifier
+    if EncoderClassifier is not None:
+        return
+
+    try:
+        with STARTUP.stage("import_torch"):
+            import torch
+            import torchaudio
+        with STARTUP.stage("import_speechbrain"):
+            from speechbrain.pretrained import EncoderClassifier
+    except ImportError as e:
+        raise ImportError(
+            f"Required library not installed: {str(e)}. Install with: pip install speechbrain torch torchaudio"
+        )
+
+
+class SpeakerCentroids:
+    """
+    Running per-speaker embedding centroids stored as one contiguous matrix
+    
+    Memory is O(speakers x dim) no matter how many segments are folded in.
+    """
+    
+    def __init__(self):
+        self.speaker_ids = []  # Row index -> speaker ID
+        self.sums = np.zeros((0, 0), dtype=np.float64)  # Running embedding sums
+        self.counts = np.zeros(0, dtype=np.int64)  # Embeddings per speaker
+        self.next_speaker_id = 0
+    
+    def __len__(self) -> int:
+        return len(self.speaker_ids)
+    
+    def add(self, embedding: np.ndarray) -> str:
+        """Append a new speaker row seeded with one embedding"""
+        row = len(self.speaker_ids)
+        
+        if row == 0:
+            self.sums = np.zeros((8, embedding.shape[0]), dtype=np.float64)
+            self.counts = np.zeros(8, dtype=np.int64)
+        elif row == self.sums.shape[0]:
+            # Grow capacity geometrically so appends stay amortized O(dim)
+            self.sums = np.concatenate([self.sums, np.zeros_like(self.sums)])
+            self.counts = np.concatenate([self.counts, np.zeros_like(self.counts)])
+        
+        speaker_id = f"SPEAKER_{self.next_speaker_id}"
+        self.next_speaker_id += 1
+        self.speaker_ids.append(speaker_id)
+        self.sums[row] = embedding
+        self.counts[row] = 1
+        return speaker_id
+    
+    def update(self, row: int, embedding: np.ndarray):
+        """Fold an embedding into an existing speaker's centroid"""
+        self.sums[row] += embedding
+        self.counts[row] += 1
+    
+    def score(self, embedding: np.ndarray, scoring: str = "mean") -> np.ndarray:
+        """
+        Score an embedding against every known speaker in one matrix product
+        
+        Args:
+            embedding: Normalized speaker embedding vector
+            scoring: "mean" or "centroid" (see SpeakerIdentifier)
+            
+        Returns:
+            numpy array: One similarity score per known speaker row
+        """
+        count = len(self.speaker_ids)
+        sums = self.sums[:count]
+        dots = sums @ embedding
+        
+        if scoring == "centroid":
+            norms = np.linalg.norm(sums, axis=1)
+            return dots / np.maximum(norms, 1e-12)
+        
+        # Mean of dot products equals the dot product with the mean embedding
+        return dots / self.counts[:count]
+    
+    def means(self) -> Dict[str, np.ndarray]:
+        """Mean embedding per known speaker"""
+        return {
+            speaker_id: self.sums[row] / self.counts[row]
+            for row, speaker_id in enumerate(self.speaker_ids)
+        }
 
 
 class SpeakerIdentifier:
@@ -45,62 +168,135 @@ class SpeakerIdentifier:
     Real-time speaker identification using SpeechBrain ECAPA-TDNN
     """
     
-    def __init__(self, device: str = "auto", similarity_threshold: float = 0.75):
+    def __init__(
+        self,
+        device: str = "auto",
+        similarity_threshold: float = 0.75,
+        batch_size: int = 32,
+        bucket_by_duration: bool = True,
+        scoring: str = "mean",
+        embedding_cache: Optional[EmbeddingCache] = None,
+        enrollment: Optional[SpeakerEnrollment] = None,
+        model_store: Optional[ModelStore] = None
+    ):
         """
         Initialize the speaker identifier
         
         Args:
             device: Device to use ("cuda", "cpu", or "auto")
             similarity_threshold: Cosine similarity threshold for speaker matching (0.0-1.0)
+            batch_size: Number of segments per ECAPA forward pass
+            bucket_by_duration: Group segments of similar length into the same
+                batch to limit padding
+            scoring: "mean" scores against the average similarity to every
+                embedding of a speaker (the original behaviour), "centroid"
+                scores against the cosine of the normalized speaker centroid
+            embedding_cache: Reuse per-segment embeddings stored by earlier runs
+                on the same audio
+            enrollment: Database of named speakers; diarized speakers that
+                match an enrolled voiceprint get their real name
+            model_store: Load ECAPA-TDNN only from this local store instead
+                of the hub and a savedir relative to the working directory
         """
+        if scoring not in ("mean", "centroid"):
+            raise ValueError(f"Unknown scoring mode: {scoring}")
+        
+        import_speechbrain()
+        
         # Auto-detect device
         if device == "auto":
             device = "cuda" if torch.cuda.is_available() else "cpu"
         
         self.device = device
         self.similarity_threshold = similarity_threshold
-        self.speaker_embeddings = {}  # Store known speaker embeddings
-        self.speaker_labels = {}  # Map speaker IDs to labels
-        self.next_speaker_id = 0
+        self.batch_size = max(1, batch_size)
+        self.bucket_by_duration = bucket_by_duration
+        self.scoring = scoring
+        self.embedding_cache = embedding_cache
+        self.enrollment = enrollment
+        self.metrics: Optional[StageMetrics] = None  # Stage timings of the running request
+        self.reset()
         
         print(f"⚙️  Initializing SpeechBrain ECAPA-TDNN...", file=sys.stderr)
         print(f"   Device: {device}", file=sys.stderr)
         print(f"   Similarity Threshold: {similarity_threshold}", file=sys.stderr)
         
+        if model_store is not None:
+            # Files are read in place: with savedir == source, SpeechBrain
+            # finds every file already present and never contacts the hub
+            source = savedir = model_store.path("speechbrain", "spkrec-ecapa-voxceleb")
+            print(f"   Store: {source}", file=sys.stderr)
+        else:
+            source = "speechbrain/spkrec-ecapa-voxceleb"
+            savedir = "pretrained_models/spkrec-ecapa-voxceleb"
+        
         try:
             # Load pre-trained ECAPA-TDNN model for speaker recognition
-            self.classifier = EncoderClassifier.from_hparams(
-                source="speechbrain/spkrec-ecapa-voxceleb",
-                savedir="pretrained_models/spkrec-ecapa-voxceleb",
-                run_opts={"device": device}
-            )
+            startup = StageMetrics()
+            with STARTUP.stage("model_load"), startup.stage("model_load"):
+                self.classifier = EncoderClassifier.from_hparams(
+                    source=source,
+                    savedir=savedir,
+                    run_opts={"device": device}
+                )
+            self.load_metrics = startup.as_dict()["stages"]["model_load"]
             print(f"✅ ECAPA-TDNN model loaded successfully", file=sys.stderr)
         except Exception as e:
             print(f"❌ Error loading model: {e}", file=sys.stderr)
             raise
     
+    def reset(self):
+        """
+        Forget all known speakers so the next meeting starts from SPEAKER_0
+
+        The loaded classifier is kept, which is what makes a resident worker
+        cheap to reuse across meetings.
+        """
+        self.centroids = SpeakerCentroids()
+        self.speaker_labels = {}
+    
+    def prewarm(self, seconds: float = 3.0) -> Dict:
+        """
+        Encode a throwaway batch so the first real request starts warm
+        
+        Two synthetic segments of different lengths go through the padded
+        batch path, which initializes PyTorch's kernels and allocator (and
+        cuDNN autotuning on GPU) and the filterbank feature pipeline. Known
+        speakers are not touched.
+        
+        Args:
+            seconds: Length of the longer synthetic segment
+            
+        Returns:
+            dict: Wall/CPU seconds and memory of the warm-up pass
+        """
+        rng = np.random.default_rng(0)
+        waveform = (0.01 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+        segments = [{"start": 0.0, "end": seconds}, {"start": 0.0, "end": seconds / 2}]
+        
+        timings = StageMetrics()
+        with STARTUP.stage("prewarm"), timings.stage("prewarm"):
+            self.extract_embeddings_from_waveform(waveform, segments)
+        
+        print("🔥 Prewarmed ECAPA-TDNN", file=sys.stderr)
+        return timings.as_dict()["stages"]["prewarm"]
+    
     def extract_embedding(self, audio_path: str) -> np.ndarray:
         """
         Extract speaker embedding from audio file
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file or decoded 16kHz .npy cache
             
         Returns:
             numpy array: Speaker embedding vector
         """
         try:
-            # Load audio
-            signal, fs = torchaudio.load(audio_path)
-            
-            # Resample to 16kHz if needed (ECAPA-TDNN expects 16kHz)
-            if fs != 16000:
-                resampler = torchaudio.transforms.Resample(fs, 16000)
-                signal = resampler(signal)
-            
-            # Convert to mono if stereo
-            if signal.shape[0] > 1:
-                signal = torch.mean(signal, dim=0, keepdim=True)
+            # Load as 16kHz mono float32 (ECAPA-TDNN expects 16kHz)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                samples, sample_rate = self._open_audio(audio_path, temp_dir)
+                signal = torch.from_numpy(normalize_audio(samples, sample_rate)).unsqueeze(0)
+                del samples
             
             # Extract embedding
             with torch.no_grad():
@@ -119,123 +315,421 @@ class SpeakerIdentifier:
     def extract_embeddings_from_segments(
         self, 
         audio_path: str, 
-        segments: List[Dict]
+        segments: List[Dict],
+        batch_size: Optional[int] = None
     ) -> List[Tuple[Dict, np.ndarray]]:
         """
         Extract embeddings for each segment with timestamps
         
+        Segments are zero-padded into batches and encoded together, with their
+        relative lengths passed as wav_lens so padding does not affect pooling.
+        
+        With an embedding cache, segments already embedded for the same audio
+        content are read back from disk and only the rest go through the model.
+        Segments too short to embed are dropped before the lookup, and ones
+        that only turn out too short once read are stored as skipped, so a
+        fully cached rerun never reopens the audio.
+        
         Args:
-            audio_path: Path to full audio file
+            audio_path: Path to full audio file or decoded 16kHz .npy cache
             segments: List of segments with start/end times and text
+            batch_size: Segments per forward pass (defaults to self.batch_size)
             
         Returns:
-            List of (segment, embedding) tuples
+            List of (segment, embedding) tuples, in input segment order
         """
-        results = []
+        if self.embedding_cache is None:
+            return self._extract_embeddings_uncached(audio_path, segments, batch_size)
+        
+        # Spans under the minimum length never get an embedding
+        segments = [segment for segment, _, _ in self._segment_spans(segments)]
         
+        with optional_stage(self.metrics, "embedding_cache"):
+            audio_hash = file_sha256(audio_path)
+            found, missing = self.embedding_cache.lookup(audio_hash, segments)
+        print(f"   Embedding cache: {len(found)} cached, {len(missing)} to compute", file=sys.stderr)
+        
+        computed = {}
+        if missing:
+            missing_segments = [segments[position] for position in missing]
+            results = self._extract_embeddings_uncached(audio_path, missing_segments, batch_size)
+            computed = {id(segment): embedding for segment, embedding in results}
+            skipped = [segment for segment in missing_segments if id(segment) not in computed]
+            with optional_stage(self.metrics, "embedding_cache"):
+                self.embedding_cache.store(audio_hash, results, skipped)
+        
+        ordered = []
+        for position, segment in enumerate(segments):
+            if position in found:
+                ordered.append((segment, found[position]))
+            elif id(segment) in computed:
+                ordered.append((segment, computed[id(segment)]))
+        return ordered
+    
+    def _extract_embeddings_uncached(
+        self,
+        audio_path: str,
+        segments: List[Dict],
+        batch_size: Optional[int] = None
+    ) -> List[Tuple[Dict, np.ndarray]]:
+        """Run the model on every segment (see extract_embeddings_from_segments)"""
         try:
-            # Load full audio
-            full_audio, fs = torchaudio.load(audio_path)
-            
-            # Resample to 16kHz if needed
-            if fs != 16000:
-                resampler = torchaudio.transforms.Resample(fs, 16000)
-                full_audio = resampler(full_audio)
-                fs = 16000
-            
-            # Convert to mono if stereo
-            if full_audio.shape[0] > 1:
-                full_audio = torch.mean(full_audio, dim=0, keepdim=True)
-            
-            for segment in segments:
-                start_sample = int(segment['start'] * fs)
-                end_sample = int(segment['end'] * fs)
-                
-                # Extract segment audio
-                segment_audio = full_audio[:, start_sample:end_sample]
-                
-                # Skip very short segments (< 0.5 seconds)
-                if segment_audio.shape[1] < fs * 0.5:
-                    continue
-                
-                # Extract embedding
-                with torch.no_grad():
-                    embedding = self.classifier.encode_batch(segment_audio)
-                    embedding = embedding.squeeze().cpu().numpy()
-                
-                # Normalize
-                embedding = embedding / np.linalg.norm(embedding)
-                
-                results.append((segment, embedding))
-            
-            return results
+            with tempfile.TemporaryDirectory() as temp_dir:
+                with optional_stage(self.metrics, "audio_load"):
+                    samples, sample_rate = self._open_audio(audio_path, temp_dir)
+                try:
+                    return self.extract_embeddings_from_waveform(samples, segments, batch_size, sample_rate)
+                finally:
+                    # Unmap before the temporary directory is removed
+                    del samples
             
         except Exception as e:
             print(f"❌ Error extracting segment embeddings: {e}", file=sys.stderr)
             raise
     
+    def _open_audio(self, audio_path: str, temp_dir: str) -> Tuple[np.ndarray, int]:
+        """
+        Open a recording for span reads without loading it whole
+        
+        Decoded .npy caches and PCM/float WAV files are memory-mapped in
+        place; other formats are streamed by FFmpeg into a 16kHz float32 file
+        in temp_dir and memory-mapped from there. Only without FFmpeg is the
+        whole file loaded through torchaudio.
+        
+        Returns:
+            (samples, sample_rate): (frames,) or (frames x channels) array
+                for read_slice, and its rate
+        """
+        if is_decoded_audio(audio_path):
+            return load_decoded_audio(audio_path), SAMPLE_RATE
+        
+        try:
+            return open_wav(audio_path)
+        except ValueError:
+            pass
+        
+        try:
+            return decode_to_memmap(audio_path, os.path.join(temp_dir, "audio.f32")), SAMPLE_RATE
+        except FileNotFoundError:
+            print("⚠️  FFmpeg not found, loading the whole file with torchaudio", file=sys.stderr)
+            full_audio, fs = torchaudio.load(audio_path)
+            return full_audio.numpy().T, fs
+    
+    def extract_embeddings_from_waveform(
+        self,
+        waveform: np.ndarray,
+        segments: List[Dict],
+        batch_size: Optional[int] = None,
+        sample_rate: int = SAMPLE_RATE
+    ) -> List[Tuple[Dict, np.ndarray]]:
+        """
+        Extract embeddings for segments of an already opened waveform
+        
+        Each batch's segments are copied out of the waveform (downmixed and
+        resampled to 16kHz per slice) only when that batch is encoded, so
+        peak memory depends on the batch size, not on the recording length.
+        
+        Args:
+            waveform: (frames,) or (frames x channels) samples, typically a
+                memmap of a decoded cache or WAV file
+            segments: List of segments with start/end times and text
+            batch_size: Segments per forward pass (defaults to self.batch_size)
+            sample_rate: Rate of waveform in Hz
+            
+        Returns:
+            List of (segment, embedding) tuples, in input segment order
+        """
+        batch_size = max(1, batch_size or self.batch_size)
+        get_slice = lambda start, end: torch.from_numpy(read_slice(waveform, sample_rate, start, end))
+        with optional_stage(self.metrics, "embedding_extraction"):
+            return self._encode_batched(self._segment_spans(segments), get_slice, batch_size)
+    
+    def _segment_spans(self, segments: List[Dict]) -> List[Tuple[Dict, int, int]]:
+        """
+        16kHz sample span of each segment, skipping very short ones (< 0.5 seconds)
+        
+        Args:
+            segments: List of segments with start/end times
+            
+        Returns:
+            List of (segment, start_sample, end_sample)
+        """
+        spans = []
+        for segment in segments:
+            start_sample = int(segment['start'] * SAMPLE_RATE)
+            end_sample = int(segment['end'] * SAMPLE_RATE)
+            
+            if end_sample - start_sample < SAMPLE_RATE * 0.5:
+                continue
+            
+            spans.append((segment, start_sample, end_sample))
+        return spans
+    
+    def _encode_batched(
+        self,
+        spans: List[Tuple[Dict, int, int]],
+        get_slice: Callable[[int, int], "torch.Tensor"],
+        batch_size: int
+    ) -> List[Tuple[Dict, np.ndarray]]:
+        """
+        Encode segment spans in padded batches
+        
+        Args:
+            spans: (segment, start_sample, end_sample) at 16kHz
+            get_slice: Returns the 1-D 16kHz mono waveform between two sample
+                indices; called per batch so only one batch is held in memory
+            batch_size: Segments per forward pass
+            
+        Returns:
+            List of (segment, normalized embedding) tuples, in input order
+            (spans that turn out shorter than 0.5 seconds, e.g. past the end
+            of the audio, are dropped)
+        """
+        if not spans:
+            return []
+        
+        order = list(range(len(spans)))
+        if self.bucket_by_duration:
+            # Similar lengths in one batch means less zero padding to encode
+            order.sort(key=lambda index: spans[index][2] - spans[index][1])
+        
+        embeddings = [None] * len(spans)
+        total_start = time.perf_counter()
+        num_batches = (len(order) + batch_size - 1) // batch_size
+        
+        for batch_number, offset in enumerate(range(0, len(order), batch_size), start=1):
+            # Only this batch's audio is read; spans past the end come back short
+            sliced = [
+                (index, get_slice(spans[index][1], spans[index][2]))
+                for index in order[offset:offset + batch_size]
+            ]
+            sliced = [(index, waveform) for index, waveform in sliced if waveform.shape[0] >= SAMPLE_RATE * 0.5]
+            if not sliced:
+                continue
+            batch_indices = [index for index, _ in sliced]
+            waveforms = [waveform for _, waveform in sliced]
+            lengths = torch.tensor([w.shape[0] for w in waveforms], dtype=torch.float32)
+            max_length = int(lengths.max().item())
+            
+            batch = torch.zeros(len(waveforms), max_length)
+            for row, waveform in enumerate(waveforms):
+                batch[row, :waveform.shape[0]] = waveform
+            
+            batch_start = time.perf_counter()
+            with torch.no_grad():
+                batch_embeddings = self.classifier.encode_batch(
+                    batch.to(self.device),
+                    wav_lens=(lengths / max_length).to(self.device)
+                )
+                batch_embeddings = batch_embeddings.squeeze(1).cpu().numpy()
+            batch_time = time.perf_counter() - batch_start
+            
+            # Normalize
+            norms = np.linalg.norm(batch_embeddings, axis=1, keepdims=True)
+            batch_embeddings = batch_embeddings / np.maximum(norms, 1e-12)
+            
+            for row, index in enumerate(batch_indices):
+                embeddings[index] = batch_embeddings[row]
+            
+            padding = 1.0 - float(lengths.sum().item()) / (max_length * len(waveforms))
+            print(
+                f"   Batch {batch_number}/{num_batches}: {len(waveforms)} segments, "
+                f"{max_length / 16000:.2f}s max, {padding:.0%} padding, {batch_time * 1000:.0f} ms",
+                file=sys.stderr
+            )
+        
+        total_time = time.perf_counter() - total_start
+        print(
+            f"   Embeddings: {len(spans)} segments in {num_batches} batches ({total_time:.2f}s)",
+            file=sys.stderr
+        )
+        
+        return [(spans[index][0], embeddings[index]) for index in range(len(spans)) if embeddings[index] is not None]
+    
     def cosine_similarity(self, emb1: np.ndarray, emb2: np.ndarray) -> float:
         """Calculate cosine similarity between two embeddings"""
         return float(np.dot(emb1, emb2))
     
-    def identify_speaker(self, embedding: np.ndarray) -> Tuple[str, float]:
+    @property
+    def num_speakers(self) -> int:
+        """Number of speakers seen since the last reset"""
+        return len(self.centroids)
+    
+    @property
+    def speaker_embeddings(self) -> Dict[str, np.ndarray]:
+        """Mean embedding per known speaker"""
+        return self.centroids.means()
+    
+    def score_speakers(self, embedding: np.ndarray) -> np.ndarray:
+        """Score an embedding against every known speaker (see SpeakerCentroids.score)"""
+        return self.centroids.score(embedding, self.scoring)
+    
+    def identify_speaker(
+        self,
+        embedding: np.ndarray,
+        centroids: Optional[SpeakerCentroids] = None
+    ) -> Tuple[str, float]:
         """
         Identify speaker from embedding
         
         Args:
             embedding: Speaker embedding vector
+            centroids: Speaker state to match against and update
+                (defaults to this identifier's own state)
             
         Returns:
             (speaker_id, confidence): Speaker ID and confidence score
         """
-        if not self.speaker_embeddings:
+        centroids = centroids if centroids is not None else self.centroids
+        
+        if not len(centroids):
             # First speaker
-            speaker_id = f"SPEAKER_{self.next_speaker_id}"
-            self.next_speaker_id += 1
-            self.speaker_embeddings[speaker_id] = [embedding]
-            return speaker_id, 1.0
+            return centroids.add(embedding), 1.0
         
         # Compare with known speakers
-        best_match = None
-        best_score = 0.0
-        
-        for speaker_id, embeddings in self.speaker_embeddings.items():
-            # Calculate average similarity with all embeddings of this speaker
-            similarities = [self.cosine_similarity(embedding, emb) for emb in embeddings]
-            avg_similarity = np.mean(similarities)
-            
-            if avg_similarity > best_score:
-                best_score = avg_similarity
-                best_match = speaker_id
+        scores = centroids.score(embedding, self.scoring)
+        best_row = int(np.argmax(scores))
+        best_score = float(scores[best_row])
         
         # Check if best match is above threshold
         if best_score >= self.similarity_threshold:
-            # Add to existing speaker's embeddings
-            self.speaker_embeddings[best_match].append(embedding)
-            return best_match, best_score
+            # Fold into the existing speaker's running centroid
+            centroids.update(best_row, embedding)
+            return centroids.speaker_ids[best_row], best_score
         else:
             # New speaker
-            speaker_id = f"SPEAKER_{self.next_speaker_id}"
-            self.next_speaker_id += 1
-            self.speaker_embeddings[speaker_id] = [embedding]
-            return speaker_id, 1.0
+            return centroids.add(embedding), 1.0
+    
+    def enroll_speaker(
+        self,
+        name: str,
+        audio_path: str,
+        segments: Optional[List[Dict]] = None
+    ) -> Dict:
+        """
+        Store a named voiceprint in the enrollment database
+        
+        Args:
+            name: Person's display name
+            audio_path: Sample recording of only this person (or decoded .npy cache)
+            segments: Optional spans within the recording to use; the whole
+                file is used when omitted
+            
+        Returns:
+            dict: Enrollment entry or error
+        """
+        if self.enrollment is None:
+            return {
+                "success": False,
+                "error": "No enrollment database configured"
+            }
+        
+        try:
+            if segments:
+                embeddings = [
+                    embedding for _, embedding
+                    in self.extract_embeddings_from_segments(audio_path, segments)
+                ]
+                if not embeddings:
+                    raise ValueError("No segment long enough to extract a voiceprint")
+            else:
+                embeddings = [self.extract_embedding(audio_path)]
+            
+            entry = self.enrollment.enroll(name, np.stack(embeddings))
+            print(f"🪪 Enrolled speaker: {name} ({entry['count']} samples)", file=sys.stderr)
+            return {"success": True, "speaker": entry}
+            
+        except Exception as e:
+            error_msg = f"Speaker enrollment error: {str(e)}"
+            print(f"\n❌ {error_msg}", file=sys.stderr)
+            
+            return {
+                "success": False,
+                "error": error_msg
+            }
+    
+    def name_speakers(
+        self,
+        result: Dict,
+        centroids: Optional[SpeakerCentroids] = None
+    ) -> Dict:
+        """
+        Attach enrolled names to the speakers of a diarization result
+        
+        All speaker centroids are matched against the enrollment database in
+        one matrix product. Matched speakers get "speaker_name" on their
+        segments and "name"/"name_similarity" in speaker_stats; the mapping
+        is returned as "speaker_labels".
+        
+        Args:
+            result: Output of label_segments / cluster_segments
+            centroids: Speaker state the result was labeled against (defaults
+                to this identifier's own state, whose speaker_labels are updated)
+            
+        Returns:
+            dict: The same result, annotated in place
+        """
+        if self.enrollment is None or not len(self.enrollment) or not result.get("success"):
+            return result
+        
+        own_state = centroids is None
+        centroids = self.centroids if own_state else centroids
+        if not len(centroids):
+            return result
+        
+        means = centroids.means()
+        matches = self.enrollment.match(
+            np.stack(list(means.values())),
+            threshold=self.similarity_threshold
+        )
+        
+        labels = {}
+        for speaker_id, (name, score) in zip(means, matches):
+            if name is None:
+                continue
+            labels[speaker_id] = name
+            if speaker_id in result.get("speaker_stats", {}):
+                result["speaker_stats"][speaker_id]["name"] = name
+                result["speaker_stats"][speaker_id]["name_similarity"] = round(score, 4)
+        
+        for segment in result.get("segments", []):
+            if segment["speaker"] in labels:
+                segment["speaker_name"] = labels[segment["speaker"]]
+        
+        if own_state:
+            self.speaker_labels = labels
+        result["speaker_labels"] = labels
+        return result
     
     def diarize_segments(
         self, 
         audio_path: str, 
-        transcription_segments: List[Dict]
+        transcription_segments: List[Dict],
+        mode: str = "online",
+        num_speakers: Optional[int] = None,
+        clustering: str = "agglomerative"
     ) -> Dict:
         """
         Perform speaker diarization on transcription segments
         
         Args:
-            audio_path: Path to audio file
+            audio_path: Path to audio file or decoded 16kHz .npy cache
             transcription_segments: List of segments from Whisper with start/end times and text
+            mode: "online" assigns segments one by one in time order (live
+                behaviour), "offline" clusters all embeddings of the recording at once
+            num_speakers: Known number of speakers for offline mode (None to estimate)
+            clustering: Offline method, "agglomerative" or "spectral"
             
         Returns:
-            dict: Segments with speaker labels and statistics
+            dict: Segments with speaker labels and statistics, plus a metrics
+                block with the embedding_cache, audio_load,
+                embedding_extraction, clustering and speaker_naming stages
         """
+        self.metrics = metrics = StageMetrics()
         try:
+            if mode not in ("online", "offline"):
+                raise ValueError(f"Unknown diarization mode: {mode}")
+            
             print(f"\n📁 Processing: {Path(audio_path).name}", file=sys.stderr)
             print(f"🎙️  Analyzing {len(transcription_segments)} segments...", file=sys.stderr)
             
@@ -245,46 +739,147 @@ class SpeakerIdentifier:
                 transcription_segments
             )
             
+            with metrics.stage("clustering"):
+                if mode == "offline":
+                    result = self.cluster_segments(segment_embeddings, num_speakers, clustering)
+                else:
+                    result = self.label_segments(segment_embeddings)
+            with metrics.stage("speaker_naming"):
+                result = self.name_speakers(result)
+            
+            audio_seconds = max((segment['end'] for segment in transcription_segments), default=0)
+            result["metrics"] = metrics.as_dict(audio_seconds)
+            result["metrics"]["startup"] = self.load_metrics
+            return result
+            
+        except Exception as e:
+            error_msg = f"Speaker identification error: {str(e)}"
+            print(f"\n❌ {error_msg}", file=sys.stderr)
+            
+            return {
+                "success": False,
+                "error": error_msg
+            }
+        finally:
+            self.metrics = None
+    
+    def label_segments(
+        self,
+        segment_embeddings: List[Tuple[Dict, np.ndarray]],
+        centroids: Optional[SpeakerCentroids] = None
+    ) -> Dict:
+        """
+        Assign speakers to segments whose embeddings are already extracted
+        
+        Args:
+            segment_embeddings: (segment, embedding) tuples in segment order
+            centroids: Speaker state to label against (defaults to this
+                identifier's own state)
+            
+        Returns:
+            dict: Segments with speaker labels and statistics
+        """
+        try:
             # Identify speakers for each segment
-            labeled_segments = []
-            speaker_stats = {}
-            
-            for segment, embedding in segment_embeddings:
-                speaker_id, confidence = self.identify_speaker(embedding)
-                
-                # Add speaker info to segment
-                labeled_segment = {
-                    "speaker": speaker_id,
-                    "start": segment['start'],
-                    "end": segment['end'],
-                    "duration": segment['end'] - segment['start'],
-                    "text": segment.get('text', ''),
-                    "confidence": confidence
-                }
-                
-                labeled_segments.append(labeled_segment)
-                
-                # Update statistics
-                if speaker_id not in speaker_stats:
-                    speaker_stats[speaker_id] = {
-                        "total_time": 0,
-                        "segment_count": 0
-                    }
-                
-                speaker_stats[speaker_id]["total_time"] += labeled_segment["duration"]
-                speaker_stats[speaker_id]["segment_count"] += 1
+            assignments = [
+                self.identify_speaker(embedding, centroids)
+                for _, embedding in segment_embeddings
+            ]
+            return self._build_result(segment_embeddings, assignments)
             
-            result = {
-                "success": True,
-                "segments": labeled_segments,
-                "speaker_stats": speaker_stats,
-                "total_speakers": len(speaker_stats)
+        except Exception as e:
+            error_msg = f"Speaker identification error: {str(e)}"
+            print(f"\n❌ {error_msg}", file=sys.stderr)
+            
+            return {
+                "success": False,
+                "error": error_msg
             }
+    
+    def cluster_segments(
+        self,
+        segment_embeddings: List[Tuple[Dict, np.ndarray]],
+        num_speakers: Optional[int] = None,
+        clustering: str = "agglomerative"
+    ) -> Dict:
+        """
+        Assign speakers by clustering every embedding of a recording at once
+        
+        Unlike label_segments, a segment's label does not depend on the order
+        segments arrive in. The resulting clusters replace this identifier's
+        speaker state, so speaker_embeddings holds the final centroids.
+        
+        Args:
+            segment_embeddings: (segment, embedding) tuples in segment order
+            num_speakers: Known number of speakers (None to estimate it)
+            clustering: "agglomerative" (threshold = similarity_threshold when
+                the count is unknown) or "spectral" (eigengap estimate)
+            
+        Returns:
+            dict: Same schema as label_segments plus a "clustering" block with
+                cluster-quality scores
+        """
+        try:
+            if clustering not in CLUSTERING_METHODS:
+                raise ValueError(f"Unknown clustering method: {clustering}")
+            
+            self.reset()
+            if not segment_embeddings:
+                result = self._build_result([], [])
+                result["clustering"] = {
+                    "mode": "offline",
+                    "method": clustering,
+                    "num_speakers_requested": num_speakers,
+                    "quality": None
+                }
+                return result
             
-            print(f"\n✅ Speaker identification complete!", file=sys.stderr)
-            print(f"   Speakers identified: {len(speaker_stats)}", file=sys.stderr)
-            print(f"   Segments processed: {len(labeled_segments)}", file=sys.stderr)
+            embeddings = np.stack([embedding for _, embedding in segment_embeddings])
+            print(f"🧮 Clustering {len(embeddings)} embeddings ({clustering})...", file=sys.stderr)
+            labels = cluster_embeddings(
+                embeddings,
+                method=clustering,
+                similarity_threshold=self.similarity_threshold,
+                num_speakers=num_speakers
+            )
+            
+            # Rebuild speaker state from the clusters (labels are numbered by
+            # first appearance, so rows line up with SPEAKER_<label>)
+            for row, embedding in zip(labels, embeddings):
+                if row == len(self.centroids):
+                    self.centroids.add(embedding)
+                else:
+                    self.centroids.update(int(row), embedding)
+            
+            # Confidence: cosine similarity to the segment's cluster centroid
+            centroid_directions = normalize_rows(self.centroids.sums[:len(self.centroids)])
+            confidences = np.sum(normalize_rows(embeddings) * centroid_directions[labels], axis=1)
             
+            assignments = [
+                (self.centroids.speaker_ids[row], float(confidence))
+                for row, confidence in zip(labels, confidences)
+            ]
+            result = self._build_result(segment_embeddings, assignments)
+            
+            quality = cluster_quality(embeddings, labels)
+            result["clustering"] = {
+                "mode": "offline",
+                "method": clustering,
+                "num_speakers_requested": num_speakers,
+                "quality": {
+                    "silhouette": quality["silhouette"],
+                    "mean_intra_similarity": quality["mean_intra_similarity"],
+                    "mean_inter_similarity": quality["mean_inter_similarity"],
+                    "per_speaker": {
+                        speaker_id: {
+                            "segment_count": quality["cluster_sizes"][row],
+                            "silhouette": quality["cluster_silhouette"][row]
+                        }
+                        for row, speaker_id in enumerate(self.centroids.speaker_ids)
+                    }
+                }
+            }
+            print(f"   Silhouette: {quality['silhouette']}", file=sys.stderr)
             return result
             
         except Exception as e:
@@ -295,6 +890,512 @@ class SpeakerIdentifier:
                 "success": False,
                 "error": error_msg
             }
+    
+    def _build_result(
+        self,
+        segment_embeddings: List[Tuple[Dict, np.ndarray]],
+        assignments: List[Tuple[str, float]]
+    ) -> Dict:
+        """Labeled segments and per-speaker statistics from (speaker, confidence) pairs"""
+        labeled_segments = []
+        speaker_stats = {}
+        
+        for (segment, _), (speaker_id, confidence) in zip(segment_embeddings, assignments):
+            # Add speaker info to segment
+            labeled_segment = {
+                "speaker": speaker_id,
+                "start": segment['start'],
+                "end": segment['end'],
+                "duration": segment['end'] - segment['start'],
+                "text": segment.get('text', ''),
+                "confidence": confidence
+            }
+            
+            labeled_segments.append(labeled_segment)
+            
+            # Update statistics
+            if speaker_id not in speaker_stats:
+                speaker_stats[speaker_id] = {
+                    "total_time": 0,
+                    "segment_count": 0
+                }
+            
+            speaker_stats[speaker_id]["total_time"] += labeled_segment["duration"]
+            speaker_stats[speaker_id]["segment_count"] += 1
+        
+        result = {
+            "success": True,
+            "segments": labeled_segments,
+            "speaker_stats": speaker_stats,
+            "total_speakers": len(speaker_stats)
+        }
+        
+        print(f"\n✅ Speaker identification complete!", file=sys.stderr)
+        print(f"   Speakers identified: {len(speaker_stats)}", file=sys.stderr)
+        print(f"   Segments processed: {len(labeled_segments)}", file=sys.stderr)
+        
+        return result
+
+
+class DiarizationSession:
+    """
+    Incremental speaker identification for one live meeting
+    
+    Each chunk's segments are matched against the meeting's running speaker
+    centroids, so SPEAKER_0 in chunk 6 is the same person as SPEAKER_0 in
+    chunk 5. Updates cost O(speakers x dim) per segment, independent of how
+    long the meeting has been running.
+    """
+    
+    def __init__(self, identifier: SpeakerIdentifier, meeting_id: str):
+        """
+        Args:
+            identifier: Shared speaker identifier (classifier and settings)
+            meeting_id: Meeting this session belongs to
+        """
+        self.identifier = identifier
+        self.meeting_id = meeting_id
+        self.centroids = SpeakerCentroids()
+        self.speaker_stats = {}
+        self.speaker_labels = {}
+        self.chunk_count = 0
+        self.segment_count = 0
+        self.created_at = time.time()
+    
+    def update(
+        self,
+        audio_path: str,
+        segments: List[Dict],
+        time_offset: float = 0.0
+    ) -> Dict:
+        """
+        Label the segments of one new chunk
+        
+        Args:
+            audio_path: Chunk audio file (segment times are relative to it)
+            segments: Whisper segments for this chunk
+            time_offset: Chunk start within the meeting, added to the
+                returned start/end times
+            
+        Returns:
+            dict: Chunk result (same schema as diarize_segments) with
+                meeting-wide speaker_stats and total_speakers
+        """
+        metrics = self.identifier.metrics = StageMetrics()
+        try:
+            segment_embeddings = self.identifier.extract_embeddings_from_segments(audio_path, segments)
+        except Exception as e:
+            return {
+                "success": False,
+                "error": f"Speaker identification error: {str(e)}"
+            }
+        finally:
+            self.identifier.metrics = None
+        
+        with metrics.stage("clustering"):
+            result = self.identifier.label_segments(segment_embeddings, self.centroids)
+        if not result.get("success"):
+            return result
+        
+        self.chunk_count += 1
+        for segment in result["segments"]:
+            segment["start"] += time_offset
+            segment["end"] += time_offset
+            
+            stats = self.speaker_stats.setdefault(segment["speaker"], {
+                "total_time": 0,
+                "segment_count": 0
+            })
+            stats["total_time"] += segment["duration"]
+            stats["segment_count"] += 1
+            self.segment_count += 1
+        
+        result["chunk_speaker_stats"] = result["speaker_stats"]
+        result["speaker_stats"] = self.speaker_stats
+        result["total_speakers"] = len(self.centroids)
+        
+        with metrics.stage("speaker_naming"):
+            self.identifier.name_speakers(result, self.centroids)
+        self.speaker_labels = result.get("speaker_labels", {})
+        result["metrics"] = metrics.as_dict(max((segment['end'] for segment in segments), default=0))
+        return result
+    
+    def summary(self) -> Dict:
+        """Meeting-wide speaker statistics so far"""
+        return {
+            "success": True,
+            "meeting_id": self.meeting_id,
+            "speaker_stats": self.speaker_stats,
+            "speaker_labels": self.speaker_labels,
+            "total_speakers": len(self.centroids),
+            "chunks_processed": self.chunk_count,
+            "segments_processed": self.segment_count,
+            "session_duration": round(time.time() - self.created_at, 2)
+        }
+
+
+def handle_request(identifier: SpeakerIdentifier, request: Dict) -> Dict:
+    """
+    Run a single diarization job described by a request dict
+
+    Every job starts from a clean speaker state, so speaker IDs from one
+    meeting never leak into another handled by the same worker.
+
+    Args:
+        identifier: Loaded speaker identifier instance
+        request: Job description with "audio_path", "segments" and optional
+            "meeting_id", "similarity_threshold", "mode" ("online" or
+            "offline"), "num_speakers" and "clustering" keys
+
+    Returns:
+        dict: Diarization result (same schema as SpeakerIdentifier.diarize_segments)
+    """
+    audio_path = request.get("audio_path")
+    if not audio_path:
+        return {
+            "success": False,
+            "error": "Missing required field: audio_path"
+        }
+
+    default_threshold = identifier.similarity_threshold
+    identifier.reset()
+    identifier.similarity_threshold = request.get("similarity_threshold", default_threshold)
+
+    try:
+        result = identifier.diarize_segments(
+            audio_path,
+            request.get("segments", []),
+            mode=request.get("mode", "online"),
+            num_speakers=request.get("num_speakers"),
+            clustering=request.get("clustering", "agglomerative")
+        )
+    finally:
+        identifier.similarity_threshold = default_threshold
+
+    if request.get("meeting_id") is not None:
+        result["meeting_id"] = request["meeting_id"]
+    return result
+
+
+def handle_session_request(
+    identifier: SpeakerIdentifier,
+    sessions: SessionStore,
+    command: str,
+    request: Dict
+) -> Dict:
+    """
+    Create, update or close a live diarization session keyed by meeting id
+
+    Commands:
+        session_create: {"meeting_id"}
+        session_update: {"meeting_id", "audio_path", "segments", "time_offset"}
+            (creates the session if it does not exist yet)
+        session_close: {"meeting_id"} returns the final meeting summary
+    """
+    meeting_id = request.get("meeting_id")
+    if meeting_id is None:
+        return {
+            "success": False,
+            "error": "Missing required field: meeting_id"
+        }
+
+    if command == "session_create":
+        sessions[meeting_id] = DiarizationSession(identifier, meeting_id)
+        print(f"🆕 Diarization session opened: {meeting_id}", file=sys.stderr)
+        return {"success": True, "meeting_id": meeting_id}
+
+    if command == "session_close":
+        session = sessions.pop(meeting_id, None)
+        if session is None:
+            return {
+                "success": False,
+                "error": f"No diarization session for meeting: {meeting_id}"
+            }
+        print(f"🔒 Diarization session closed: {meeting_id}", file=sys.stderr)
+        return session.summary()
+
+    # session_update
+    if not request.get("audio_path"):
+        return {
+            "success": False,
+            "error": "Missing required field: audio_path"
+        }
+
+    session = sessions.get(meeting_id)
+    if session is None:
+        session = sessions[meeting_id] = DiarizationSession(identifier, meeting_id)
+        print(f"🆕 Diarization session opened: {meeting_id}", file=sys.stderr)
+
+    result = session.update(
+        request["audio_path"],
+        request.get("segments", []),
+        time_offset=float(request.get("time_offset", 0.0))
+    )
+    result["meeting_id"] = meeting_id
+    return result
+
+
+def handle_enrollment_request(
+    identifier: SpeakerIdentifier,
+    command: str,
+    request: Dict
+) -> Dict:
+    """
+    Manage the named-speaker enrollment database
+
+    Commands:
+        enroll: {"name", "audio_path", optional "segments"}
+        enrollment_remove: {"name"}
+        enrollment_list: {}
+    """
+    if identifier.enrollment is None:
+        return {
+            "success": False,
+            "error": "No enrollment database configured (use --enrollment-db)"
+        }
+
+    if command == "enrollment_list":
+        return {"success": True, "speakers": identifier.enrollment.list_speakers()}
+
+    name = request.get("name")
+    if not name:
+        return {
+            "success": False,
+            "error": "Missing required field: name"
+        }
+
+    if command == "enrollment_remove":
+        removed = identifier.enrollment.remove(name)
+        return {"success": removed, "name": name} if removed else {
+            "success": False,
+            "error": f"Speaker not enrolled: {name}"
+        }
+
+    # enroll
+    if not request.get("audio_path"):
+        return {
+            "success": False,
+            "error": "Missing required field: audio_path"
+        }
+    return identifier.enroll_speaker(name, request["audio_path"], request.get("segments"))
+
+
+def _process_line(
+    identifier: SpeakerIdentifier,
+    line: str,
+    sessions: SessionStore,
+    registry: Optional[MetricsRegistry] = None
+) -> Optional[Dict]:
+    """
+    Decode one JSON-lines request and produce its response
+
+    Returns None for blank lines. A {"command": "shutdown"} request returns a
+    response with "shutdown": true so the caller can stop serving. Finished
+    diarization jobs are folded into registry, which {"command": "metrics"}
+    renders in the Prometheus text format.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Invalid JSON request: {e}"
+        }
+
+    request_id = request.get("id")
+    command = request.get("command", "diarize")
+
+    if command == "ping":
+        response = {"success": True, "pong": True}
+    elif command == "shutdown":
+        response = {"success": True, "shutdown": True}
+    elif command == "stats":
+        cache = identifier.embedding_cache
+        response = {
+            "success": True,
+            "embedding_cache": cache.stats() if cache else None,
+            "enrollment": identifier.enrollment.stats() if identifier.enrollment else None,
+            "open_sessions": len(sessions),
+            "sessions": sessions.stats(),
+            "startup": startup_report(STARTUP)
+        }
+    elif command == "metrics":
+        response = {
+            "success": registry is not None,
+            "format": "prometheus",
+            "metrics": registry.prometheus_text() if registry else ""
+        }
+    elif command == "prewarm":
+        try:
+            response = {
+                "success": True,
+                "prewarm": identifier.prewarm(),
+                "startup": startup_report(STARTUP)
+            }
+        except Exception as e:
+            response = {"success": False, "error": str(e)}
+    elif command == "diarize":
+        response = handle_request(identifier, request)
+        if registry:
+            registry.observe(response)
+    elif command in ("session_create", "session_update", "session_close"):
+        response = handle_session_request(identifier, sessions, command, request)
+        if registry and command == "session_update":
+            registry.observe(response)
+    elif command in ("enroll", "enrollment_remove", "enrollment_list"):
+        response = handle_enrollment_request(identifier, command, request)
+    else:
+        response = {
+            "success": False,
+            "error": f"Unknown command: {command}"
+        }
+
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+def serve_stdin(
+    identifier: SpeakerIdentifier,
+    registry: Optional[MetricsRegistry] = None,
+    sessions: Optional[SessionStore] = None
+):
+    """
+    Answer newline-delimited JSON requests from stdin until EOF or shutdown
+
+    Live sessions never closed by their client expire from sessions
+    (default: SessionStore defaults).
+    """
+    print(f"⏱️  Startup: {startup_summary(startup_report(STARTUP))}", file=sys.stderr)
+    print("🟢 Speaker identification worker ready (stdin)", file=sys.stderr)
+    sessions = sessions if sessions is not None else SessionStore("diarization session")
+    registry = registry or MetricsRegistry("speaker_identification")
+
+    for line in sys.stdin:
+        response = _process_line(identifier, line, sessions, registry)
+        if response is None:
+            continue
+
+        sys.stdout.write(json.dumps(response) + "\n")
+        sys.stdout.flush()
+
+        if response.get("shutdown"):
+            break
+
+    print("🛑 Speaker identification worker stopped", file=sys.stderr)
+
+
+def serve_socket(
+    identifier: SpeakerIdentifier,
+    socket_path: str,
+    registry: Optional[MetricsRegistry] = None,
+    sessions: Optional[SessionStore] = None
+):
+    """
+    Answer newline-delimited JSON requests on a Unix domain socket
+
+    Jobs are serialized through a lock because they share one identifier.
+    Live sessions never closed by their client expire from sessions.
+    """
+    import socket
+    import socketserver
+    import threading
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix domain sockets are not supported on this platform; use stdin mode")
+
+    model_lock = threading.Lock()
+    sessions = sessions if sessions is not None else SessionStore("diarization session")
+    registry = registry or MetricsRegistry("speaker_identification")
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            for raw_line in self.rfile:
+                with model_lock:
+                    response = _process_line(identifier, raw_line.decode("utf-8"), sessions, registry)
+                if response is None:
+                    continue
+
+                self.wfile.write((json.dumps(response) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+                if response.get("shutdown"):
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    break
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+    server.daemon_threads = True
+    print(f"⏱️  Startup: {startup_summary(startup_report(STARTUP))}", file=sys.stderr)
+    print(f"🟢 Speaker identification worker ready ({socket_path})", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        print("🛑 Speaker identification worker stopped", file=sys.stderr)
+
+
+def _read_segments_argument(argument: str) -> List[Dict]:
+    """
+    Parse the CLI segments argument, exiting with a JSON error if invalid
+
+    "-" reads the segments from stdin and "@file" from a file, which avoids
+    OS argument-length limits on long meetings.
+    """
+    try:
+        if argument == "-":
+            segments_json = sys.stdin.read()
+        elif argument.startswith("@"):
+            with open(argument[1:], "r", encoding="utf-8") as f:
+                segments_json = f.read()
+        else:
+            segments_json = argument
+        segments_data = json.loads(segments_json)
+        return segments_data.get('segments', [])
+    except json.JSONDecodeError as e:
+        print(json.dumps({
+            "success": False,
+            "error": f"Invalid JSON for segments: {e}"
+        }))
+        sys.exit(1)
+    except OSError as e:
+        print(json.dumps({
+            "success": False,
+            "error": f"Could not read segments: {e}"
+        }))
+        sys.exit(1)
+
+
+def _require_speechbrain():
+    """Import torch/SpeechBrain now, exiting with a JSON error if missing"""
+    try:
+        import_speechbrain()
+    except ImportError as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
+
+
+def _require_audio_file(audio_path: str):
+    """Exit with a JSON error before loading torch and SpeechBrain if the audio is missing"""
+    if not os.path.exists(audio_path):
+        print(f"❌ Audio file not found: {audio_path}", file=sys.stderr)
+        print(json.dumps({
+            "success": False,
+            "error": f"Audio file not found: {audio_path}"
+        }))
+        sys.exit(1)
 
 
 def main():
@@ -302,38 +1403,159 @@ def main():
     CLI entry point
     
     Usage:
-        python speaker_identification.py <audio_path> <segments_json>
+        python speaker_identification.py <audio_path> <segments_json | @segments_file | ->
+        python speaker_identification.py --serve [device] [--socket PATH] [--metrics-file PATH] [--prewarm]
+        python speaker_identification.py <sample_audio> [segments] --enroll NAME --enrollment-db DIR
+
+    Options for both modes:
+        --threshold X            Similarity threshold (default: 0.75)
+        --embedding-cache DIR    Per-segment embedding cache (default: $SPEAKER_EMBEDDING_CACHE_DIR)
+        --enrollment-db DIR      Named speaker voiceprints (default: $SPEAKER_ENROLLMENT_DB_DIR)
+        --model-store DIR        Load ECAPA-TDNN only from this local store (default: $MODEL_STORE_DIR)
+
+    Options for service mode:
+        --session-ttl SECONDS    Drop live sessions idle this long (default: 1800, 0: never)
+        --max-sessions N         Drop the least recently used session past N (default: 64, 0: no cap)
+
+    Options for one-shot mode:
+        --offline                Cluster all segments at once instead of in time order
+        --num-speakers N         Known speaker count for --offline (default: estimated)
+        --clustering METHOD      agglomerative (default) or spectral
     
     Examples:
         python speaker_identification.py audio.wav '{"segments": [{"start": 0, "end": 2.5, "text": "Hello"}]}'
+        python speaker_identification.py audio.wav @segments.json
+        python speaker_identification.py audio.wav - < segments.json
+        python speaker_identification.py --serve auto
+        python speaker_identification.py --serve auto --prewarm
+        python speaker_identification.py audio.wav @segments.json --threshold 0.7 --embedding-cache /tmp/acta_embeddings
+        python speaker_identification.py meeting.wav @segments.json --offline --num-speakers 3
+        python speaker_identification.py alice_intro.wav --enroll "Alice" --enrollment-db /data/voiceprints
+
+    Service mode keeps ECAPA-TDNN loaded and answers one JSON request per line,
+    e.g. {"id": 1, "meeting_id": "abc", "audio_path": "meeting.wav", "segments": [...]}.
+    Live meetings use {"command": "session_update", "meeting_id": ..., ...}
+    per chunk to keep speaker labels consistent, then "session_close";
+    sessions a client never closes expire after --session-ttl, and
+    {"command": "stats"} reports open sessions and evictions.
+    With an embedding cache, re-running a meeting with another --threshold
+    reuses the stored embeddings instead of running the model again.
+    Requests can also set "mode": "offline" (with optional "num_speakers"
+    and "clustering") to cluster a finished recording globally.
+    With an enrollment database, speakers matching an enrolled voiceprint get
+    "speaker_name" and a "speaker_labels" map; the database is managed with
+    the "enroll", "enrollment_remove" and "enrollment_list" commands.
+    Results carry a "metrics" block with per-stage wall time, CPU time and
+    memory; {"command": "metrics"} returns the service totals as Prometheus
+    text, also rewritten to --metrics-file after each job if given.
+    torch and SpeechBrain are only imported once the model is needed. With
+    --prewarm, the worker encodes a dummy batch before announcing it is
+    ready; {"command": "prewarm"} does the same on demand, and it and
+    {"command": "stats"} return a "startup" report of import, model load and
+    prewarm times.
     """
-    if len(sys.argv) < 3:
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(inspect.cleandoc(main.__doc__))
+        return
+
+    try:
+        serve_mode = pop_option(args, "--serve", has_value=False)
+        prewarm = pop_option(args, "--prewarm", has_value=False)
+        socket_path = pop_option(args, "--socket")
+        threshold = pop_option(args, "--threshold")
+        threshold = float(threshold) if threshold else 0.75
+        cache_dir = pop_option(args, "--embedding-cache") or os.environ.get("SPEAKER_EMBEDDING_CACHE_DIR")
+        offline = pop_option(args, "--offline", has_value=False)
+        num_speakers = pop_option(args, "--num-speakers")
+        num_speakers = int(num_speakers) if num_speakers else None
+        clustering = pop_option(args, "--clustering") or "agglomerative"
+        enrollment_dir = pop_option(args, "--enrollment-db") or os.environ.get("SPEAKER_ENROLLMENT_DB_DIR")
+        enroll_name = pop_option(args, "--enroll")
+        metrics_file = pop_option(args, "--metrics-file")
+        model_store_dir = pop_option(args, "--model-store") or os.environ.get("MODEL_STORE_DIR")
+        session_ttl = pop_option(args, "--session-ttl")
+        session_ttl = float(session_ttl) if session_ttl else DEFAULT_IDLE_SECONDS
+        max_sessions = pop_option(args, "--max-sessions")
+        max_sessions = int(max_sessions) if max_sessions else DEFAULT_MAX_ENTRIES
+    except ValueError as e:
         print(json.dumps({
             "success": False,
-            "error": "Usage: python speaker_identification.py <audio_path> <segments_json>"
+            "error": str(e)
         }))
         sys.exit(1)
-    
-    audio_path = sys.argv[1]
-    
-    try:
-        segments_data = json.loads(sys.argv[2])
-        segments = segments_data.get('segments', [])
-    except json.JSONDecodeError as e:
+
+    embedding_cache = EmbeddingCache(cache_dir) if cache_dir else None
+    enrollment = SpeakerEnrollment(enrollment_dir) if enrollment_dir else None
+    model_store = ModelStore(model_store_dir) if model_store_dir else None
+
+    if serve_mode:
+        _require_speechbrain()
+        identifier = SpeakerIdentifier(
+            device=args[0] if args else "auto",
+            similarity_threshold=threshold,
+            embedding_cache=embedding_cache,
+            enrollment=enrollment,
+            model_store=model_store
+        )
+        if prewarm:
+            identifier.prewarm()
+
+        registry = MetricsRegistry("speaker_identification", export_path=metrics_file)
+        sessions = SessionStore("diarization session", session_ttl or None, max_sessions or None)
+        if socket_path:
+            serve_socket(identifier, socket_path, registry, sessions)
+        else:
+            serve_stdin(identifier, registry, sessions)
+        return
+
+    if enroll_name and args:
+        _require_audio_file(args[0])
+        _require_speechbrain()
+        identifier = SpeakerIdentifier(
+            device="auto",
+            similarity_threshold=threshold,
+            embedding_cache=embedding_cache,
+            enrollment=enrollment,
+            model_store=model_store
+        )
+        segments = _read_segments_argument(args[1]) if len(args) > 1 else None
+        print(json.dumps(handle_enrollment_request(identifier, "enroll", {
+            "name": enroll_name,
+            "audio_path": args[0],
+            "segments": segments
+        }), indent=2))
+        return
+
+    if len(args) < 2:
         print(json.dumps({
             "success": False,
-            "error": f"Invalid JSON for segments: {e}"
+            "error": "Usage: python speaker_identification.py <audio_path> <segments_json>"
         }))
         sys.exit(1)
     
+    audio_path = args[0]
+    segments = _read_segments_argument(args[1])
+    _require_audio_file(audio_path)
+    _require_speechbrain()
+    
     # Initialize speaker identifier
     identifier = SpeakerIdentifier(
         device="auto",
-        similarity_threshold=0.75
+        similarity_threshold=threshold,
+        embedding_cache=embedding_cache,
+        enrollment=enrollment,
+        model_store=model_store
     )
     
     # Perform speaker diarization
-    result = identifier.diarize_segments(audio_path, segments)
+    result = handle_request(identifier, {
+        "audio_path": audio_path,
+        "segments": segments,
+        "mode": "offline" if offline else "online",
+        "num_speakers": num_speakers,
+        "clustering": clustering
+    })
     
     # Output JSON result
     print(json.dumps(result, indent=2))
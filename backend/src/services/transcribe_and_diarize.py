@@ -0,0 +1,248 @@
+#!/usr/bin/env python3
+"""
+Single-process Transcription + Speaker Identification Pipeline
+
+Runs Faster-Whisper transcription and SpeechBrain ECAPA-TDNN speaker
+identification in one process, so Whisper segments are handed to the
+speaker model in memory instead of being serialized onto a command line.
+
+Features:
+- Recording decoded once and shared by both models
+- Speaker embeddings extracted on a background thread while Whisper is
+  still decoding later segments
+- Same result schema as transcribe_audio.py, plus speaker_segments,
+  speaker_stats and total_speakers from speaker_identification.py
+"""
+
+# Fix OpenMP library conflict (MUST be set before importing any libraries)
+import os
+os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
+
+import sys
+import json
+import queue
+import threading
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from audio_utils import load_audio
+from metrics import StageMetrics
+from model_store import ModelStore
+from transcribe_audio import FasterWhisperTranscriber
+from speaker_identification import SpeakerIdentifier
+
+
+class EmbeddingWorker:
+    """
+    Extracts speaker embeddings on a background thread as segments stream in
+
+    Segments are buffered until a full batch is available, so ECAPA runs
+    batched forward passes while CTranslate2 keeps decoding (both release
+    the GIL during inference).
+    """
+
+    def __init__(self, identifier: SpeakerIdentifier, waveform: np.ndarray):
+        """
+        Args:
+            identifier: Loaded speaker identifier
+            waveform: 16kHz mono float32 recording the segments refer to
+        """
+        self.identifier = identifier
+        self.waveform = waveform
+        self.batch_size = identifier.batch_size
+        self.results: List[Tuple[Dict, np.ndarray]] = []
+        self.error: Optional[Exception] = None
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def submit(self, segment: Dict):
+        """Queue one transcribed segment for embedding extraction"""
+        self._queue.put(segment)
+
+    def finish(self) -> List[Tuple[Dict, np.ndarray]]:
+        """
+        Flush remaining segments and wait for the worker
+
+        Returns:
+            List of (segment, embedding) tuples in segment order
+        """
+        self._queue.put(None)
+        self._thread.join()
+        if self.error:
+            raise self.error
+        return self.results
+
+    def _run(self):
+        pending = []
+        while True:
+            segment = self._queue.get()
+            if segment is not None:
+                pending.append(segment)
+            if pending and (segment is None or len(pending) >= self.batch_size):
+                self._flush(pending)
+                pending = []
+            if segment is None:
+                break
+
+    def _flush(self, segments: List[Dict]):
+        if self.error:
+            return
+        try:
+            self.results.extend(
+                self.identifier.extract_embeddings_from_waveform(self.waveform, segments)
+            )
+        except Exception as e:
+            # Keep draining the queue; the error is raised from finish()
+            self.error = e
+
+
+def transcribe_and_diarize(
+    transcriber: FasterWhisperTranscriber,
+    identifier: SpeakerIdentifier,
+    audio_path: str,
+    language: Optional[str] = None,
+    vad_filter: bool = True,
+    word_timestamps: bool = True
+) -> Dict:
+    """
+    Transcribe a recording and label every segment with a speaker
+
+    Args:
+        transcriber: Loaded Faster-Whisper transcriber
+        identifier: Loaded speaker identifier (its speaker state is reset)
+        audio_path: Audio file or decoded 16kHz .npy cache
+        language: Source language code (None for auto-detection)
+        vad_filter: Use Voice Activity Detection to filter silence
+        word_timestamps: Include word-level timestamps
+
+    Returns:
+        dict: Transcription result with speaker_segments, speaker_stats and
+            total_speakers added (or speaker_error if diarization failed)
+    """
+    try:
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+
+        print(f"🔄 Decoding audio once for both models...", file=sys.stderr)
+        waveform = load_audio(audio_path)
+    except Exception as e:
+        error_msg = f"Audio decode error: {str(e)}"
+        print(f"\n❌ {error_msg}", file=sys.stderr)
+        return {
+            "success": False,
+            "error": error_msg
+        }
+
+    identifier.reset()
+    worker = EmbeddingWorker(identifier, waveform)
+    worker.start()
+
+    result = transcriber.transcribe(
+        audio_path=audio_path,
+        language=language,
+        vad_filter=vad_filter,
+        word_timestamps=word_timestamps,
+        segment_callback=worker.submit,
+        audio=waveform
+    )
+
+    # Time spent after decoding: waiting for the embedding thread to drain,
+    # then labeling; merged into the transcription metrics block
+    pipeline = StageMetrics()
+    try:
+        with pipeline.stage("embedding_wait"):
+            segment_embeddings = worker.finish()
+    except Exception as e:
+        if result.get("success"):
+            result["speaker_error"] = f"Speaker identification error: {str(e)}"
+            print(f"\n⚠️  {result['speaker_error']}", file=sys.stderr)
+        return result
+
+    if not result.get("success"):
+        return result
+
+    with pipeline.stage("clustering"):
+        diarization = identifier.name_speakers(identifier.label_segments(segment_embeddings))
+    if "metrics" in result:
+        result["metrics"]["stages"].update(pipeline.as_dict()["stages"])
+
+    if diarization.get("success"):
+        result["speaker_segments"] = diarization["segments"]
+        result["speaker_stats"] = diarization["speaker_stats"]
+        result["total_speakers"] = diarization["total_speakers"]
+        if "speaker_labels" in diarization:
+            result["speaker_labels"] = diarization["speaker_labels"]
+    else:
+        result["speaker_error"] = diarization.get("error")
+
+    return result
+
+
+def main():
+    """
+    CLI entry point
+
+    Usage:
+        python transcribe_and_diarize.py <audio_path> [model_size] [device] [language] [vad_filter]
+
+    Examples:
+        python transcribe_and_diarize.py meeting.webm
+        python transcribe_and_diarize.py meeting.wav medium auto en
+        MODEL_STORE_DIR=/srv/acta/models python transcribe_and_diarize.py meeting.wav
+
+    With $MODEL_STORE_DIR set, both models load only from that local store.
+    """
+    if len(sys.argv) < 2:
+        print(json.dumps({
+            "success": False,
+            "error": "Usage: python transcribe_and_diarize.py <audio_path> [model_size] [device] [language] [vad_filter]"
+        }))
+        sys.exit(1)
+
+    audio_path = sys.argv[1]
+    model_size = sys.argv[2] if len(sys.argv) > 2 else "base"
+    device = sys.argv[3] if len(sys.argv) > 3 else "auto"
+    language = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != 'null' else None
+    vad_filter = sys.argv[5].lower() != 'false' if len(sys.argv) > 5 else True
+
+    # faster-whisper and SpeechBrain are imported while the models load;
+    # report a missing package or model as JSON like the other services
+    try:
+        model_store = ModelStore(os.environ["MODEL_STORE_DIR"]) if os.environ.get("MODEL_STORE_DIR") else None
+        transcriber = FasterWhisperTranscriber(
+            model_size=model_size,
+            device=device,
+            compute_type="auto",
+            model_store=model_store
+        )
+        identifier = SpeakerIdentifier(
+            device=device,
+            similarity_threshold=0.75,
+            model_store=model_store
+        )
+    except Exception as e:
+        print(f"❌ Could not load models: {str(e)}", file=sys.stderr)
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
+
+    result = transcribe_and_diarize(
+        transcriber,
+        identifier,
+        audio_path,
+        language=language,
+        vad_filter=vad_filter
+    )
+
+    # Output JSON result
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == "__main__":
+    main()
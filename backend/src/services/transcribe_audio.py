@@ -13,30 +13,576 @@ Features:
 - Automatic fallback to CPU if GPU not available
 - VAD (Voice Activity Detection) filtering
 - Progress callbacks for real-time updates
+- Resident service mode (JSON lines on stdin or a Unix socket)
+- Shared model pool with LRU eviction under a memory budget
+- Parallel long-file mode split at silences across worker processes
+- Content-addressed result cache for re-submitted recordings
+- Sliding-window streaming transcription of live PCM with local agreement
+- Per-stage timing/memory metrics in results, Prometheus export in service mode
+- Deferred faster-whisper import, model prewarm and a cold-start timing report
+- Offline loading from a checksummed local model store (model_store.py)
+- Energy or Silero VAD pre-stage that skips silent chunks before the model
 """
 
 # Fix OpenMP library conflict (MUST be set before importing any libraries)
 import os
 os.environ['KMP_DUPLICATE_LIB_OK'] = 'TRUE'
 
+import gc
+import inspect
 import sys
 import json
+import threading
+import time
 import warnings
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Callable
-import tempfile
+from typing import Optional, Callable, Dict, List, Tuple
 
 # Suppress warnings
 warnings.filterwarnings('ignore')
 
-try:
-    from faster_whisper import WhisperModel
-except ImportError:
-    print(json.dumps({
-        "success": False,
-        "error": "faster-whisper not installed. Install with: pip install faster-whisper"
-    }))
-    sys.exit(1)
+import numpy as np
+
+from audio_utils import (
+    SAMPLE_RATE,
+    decode_audio,
+    decode_to_cache,
+    is_decoded_audio,
+    load_decoded_audio,
+    normalize_audio,
+    pcm_to_float32
+)
+from cli import pop_option
+from metrics import MetricsRegistry, StageMetrics, startup_report, startup_summary
+from model_store import ModelStore
+from result_cache import ResultCache, file_sha256
+from session_store import DEFAULT_IDLE_SECONDS, DEFAULT_MAX_ENTRIES, SessionStore
+
+# Cold-start stages of this process (faster-whisper import, model loads,
+# prewarm), reported by {"command": "stats"} and {"command": "prewarm"}
+STARTUP = StageMetrics()
+
+# faster_whisper.WhisperModel once imported (see import_whisper_model)
+WhisperModel = None
+
+# Named decoding profiles passed to WhisperModel.transcribe (also part of
+# cache keys). "word_timestamps" is the profile default and can be overridden
+# per call.
+#
+# archive-accurate: beam search (5 beams, 5 candidates on temperature
+#   fallback), conditioning on previous text and a word-alignment pass.
+#   Best accuracy and word timings; the slowest option.
+# live-fast: greedy decoding, no previous-text conditioning, no timestamp
+#   tokens and no word alignment. Much lower latency for short live chunks
+#   where only the text is displayed, but segment times are coarse (whole
+#   30s windows) and accuracy drops on difficult audio.
+#
+# These trade-offs follow from the decoding settings; none are measured
+# numbers. Accuracy has not been measured for either profile in this
+# repository. backend/benchmark_transcription.py times both profiles on
+# synthetic tones (speed only) and, with --reference DIR, scores word error
+# rate on real clips with reference transcripts. Run it on representative
+# meeting audio before choosing a profile by accuracy.
+DECODE_PROFILES = {
+    "archive-accurate": {
+        "beam_size": 5,
+        "best_of": 5,
+        "temperature": 0.0,
+        "condition_on_previous_text": True,
+        "without_timestamps": False,
+        "word_timestamps": True
+    },
+    "live-fast": {
+        "beam_size": 1,
+        "best_of": 1,
+        "temperature": 0.0,
+        "condition_on_previous_text": False,
+        "without_timestamps": True,
+        "word_timestamps": False
+    }
+}
+DEFAULT_PROFILE = "archive-accurate"
+
+
+def decode_options(
+    profile: str = DEFAULT_PROFILE,
+    word_timestamps: Optional[bool] = None
+) -> Tuple[Dict, bool]:
+    """
+    Resolve a decoding profile into WhisperModel.transcribe keyword arguments
+    
+    Args:
+        profile: Name of an entry in DECODE_PROFILES
+        word_timestamps: Override the profile's word-alignment setting
+        
+    Returns:
+        (options, word_timestamps): Decoder options without word_timestamps,
+            and the effective word_timestamps flag
+    """
+    if profile not in DECODE_PROFILES:
+        raise ValueError(
+            f"Unknown decoding profile: {profile} (available: {', '.join(DECODE_PROFILES)})"
+        )
+    
+    options = dict(DECODE_PROFILES[profile])
+    default_word_timestamps = options.pop("word_timestamps")
+    if word_timestamps is None:
+        word_timestamps = default_word_timestamps
+    return options, word_timestamps
+
+
+# Speech detectors for the VAD pre-stage (see detect_speech). faster-whisper's
+# own vad_filter runs inside model.transcribe, after the model is loaded and
+# the request has queued for it; the pre-stage runs on the decoded waveform
+# first, so silent chunks never reach the model at all.
+VAD_BACKENDS = ("energy", "silero")
+
+# Energy detector: 30 ms frames, speech if louder than ENERGY_THRESHOLD_DB
+# dBFS. A fixed level, not one relative to the chunk's noise floor: a
+# floor-relative threshold rises with steady speech and skips it.
+ENERGY_FRAME_SECONDS = 0.03
+ENERGY_THRESHOLD_DB = -45.0
+
+
+def detect_speech(
+    audio: np.ndarray,
+    backend: str = "energy",
+    threshold: Optional[float] = None,
+    min_speech_seconds: float = 0.25
+) -> Dict:
+    """
+    Decide cheaply whether a waveform contains speech
+
+    energy: RMS level per 30 ms frame against a fixed level (threshold in
+        dBFS, default -45). No model, well under a millisecond per second
+        of audio. It only skips audio quieter than the threshold: any
+        signal above it counts as speech, so steady loud noise (fans,
+        music) passes too, which only costs a normal decode.
+    silero: faster-whisper's bundled Silero VAD (threshold is the speech
+        probability, default 0.5). Robust to noise, a few milliseconds per
+        second of audio on CPU; needs faster-whisper but not a Whisper model.
+
+    Args:
+        audio: 1-D 16kHz mono float32 waveform
+        backend: One of VAD_BACKENDS
+        threshold: Backend-specific threshold (None: backend default)
+        min_speech_seconds: Speech needed before the chunk counts as speech
+
+    Returns:
+        dict: {"backend", "has_speech", "speech_seconds", "duration",
+            "speech_ratio", "seconds"} where seconds is the detector's run time
+    """
+    if backend not in VAD_BACKENDS:
+        raise ValueError(f"Unknown VAD backend: {backend} (available: {', '.join(VAD_BACKENDS)})")
+
+    started = time.perf_counter()
+    duration = len(audio) / SAMPLE_RATE
+
+    if backend == "energy":
+        frame = int(ENERGY_FRAME_SECONDS * SAMPLE_RATE)
+        frames = len(audio) // frame
+        if frames == 0:
+            speech_seconds = 0.0
+        else:
+            blocks = np.asarray(audio[:frames * frame], dtype=np.float32).reshape(frames, frame)
+            levels = 10.0 * np.log10(np.mean(blocks * blocks, axis=1) + 1e-10)
+            voiced = levels > (ENERGY_THRESHOLD_DB if threshold is None else threshold)
+            speech_seconds = float(np.count_nonzero(voiced)) * frame / SAMPLE_RATE
+    else:
+        from faster_whisper.vad import get_speech_timestamps
+        spans = get_speech_timestamps(
+            np.ascontiguousarray(audio, dtype=np.float32),
+            threshold=0.5 if threshold is None else threshold,
+            min_speech_duration_ms=int(min_speech_seconds * 1000),
+            # Unpadded spans, so the ratio measures speech only
+            speech_pad_ms=0
+        )
+        speech_seconds = sum(span["end"] - span["start"] for span in spans) / SAMPLE_RATE
+
+    return {
+        "backend": backend,
+        "has_speech": speech_seconds >= min_speech_seconds,
+        "speech_seconds": round(speech_seconds, 2),
+        "duration": round(duration, 2),
+        "speech_ratio": round(speech_seconds / duration, 4) if duration else 0.0,
+        "seconds": round(time.perf_counter() - started, 4)
+    }
+
+
+def silent_result(
+    speech: Dict,
+    language: Optional[str],
+    model_size: str,
+    device: str,
+    compute_type: str,
+    profile: str,
+    collect_segments: bool = True
+) -> Dict:
+    """
+    Empty transcription result for audio the VAD pre-stage found silent
+
+    Same schema as FasterWhisperTranscriber.transcribe, with
+    metadata.skipped_silence set and no language detected.
+    """
+    result = {"success": True}
+    if collect_segments:
+        result["transcript"] = ""
+        result["segments"] = []
+    result["metadata"] = {
+        "language": language,
+        "language_probability": None,
+        "duration": speech["duration"],
+        "model_size": model_size,
+        "device": device,
+        "compute_type": compute_type,
+        "profile": profile,
+        "total_segments": 0,
+        "speech": speech,
+        "skipped_silence": True
+    }
+    return result
+
+
+# Approximate resident size of each model in MB at float16 precision, used to
+# keep the model pool under its memory budget (int8 is about half of this,
+# float32 about double)
+MODEL_MEMORY_MB = {
+    "tiny": 75,
+    "tiny.en": 75,
+    "base": 145,
+    "base.en": 145,
+    "small": 485,
+    "small.en": 485,
+    "medium": 1530,
+    "medium.en": 1530,
+    "large-v1": 3100,
+    "large-v2": 3100,
+    "large-v3": 3100,
+    "large": 3100,
+}
+
+COMPUTE_TYPE_MEMORY_SCALE = {
+    "float32": 2.0,
+    "float16": 1.0,
+    "bfloat16": 1.0,
+    "int8_float16": 0.5,
+    "int8_bfloat16": 0.5,
+    "int8_float32": 0.5,
+    "int8": 0.5,
+}
+
+
+def import_whisper_model():
+    """
+    Import faster_whisper.WhisperModel on first use
+    
+    Importing faster-whisper loads CTranslate2 (plus PyAV and tokenizers),
+    which dominates start-up, so it is deferred until a model is actually
+    loaded: argument errors and socket forwarding never pay for it.
+    
+    Returns:
+        The WhisperModel class
+        
+    Raises:
+        ImportError: faster-whisper is not installed
+    """
+    global WhisperModel
+    if WhisperModel is None:
+        try:
+            with STARTUP.stage("import_faster_whisper"):
+                from faster_whisper import WhisperModel
+        except ImportError:
+            raise ImportError("faster-whisper not installed. Install with: pip install faster-whisper")
+    return WhisperModel
+
+
+def resolve_device(device: str = "auto", compute_type: str = "auto") -> Tuple[str, str]:
+    """
+    Resolve "auto" device and compute type to concrete values
+    
+    Args:
+        device: "cuda", "cpu", or "auto"
+        compute_type: Computation precision or "auto"
+        
+    Returns:
+        (device, compute_type) tuple
+    """
+    # Auto-detect device with cuDNN check
+    if device == "auto":
+        # Force CPU mode to avoid cuDNN issues
+        # GPU requires cuDNN library which may not be installed
+        device = "cpu"
+        
+        # Uncomment below to try GPU (requires cuDNN installed)
+        # try:
+        #     import torch
+        #     if torch.cuda.is_available():
+        #         device = "cuda"
+        # except:
+        #     device = "cpu"
+    
+    # Auto-detect compute type based on device
+    if compute_type == "auto":
+        if device == "cuda":
+            compute_type = "float16"  # Best for GPU
+        else:
+            compute_type = "int8"  # Best for CPU
+    
+    return device, compute_type
+
+
+def load_whisper_model(
+    model_size: str,
+    device: str,
+    compute_type: str,
+    cpu_threads: int = 0,
+    num_workers: int = 1,
+    model_store: Optional[ModelStore] = None
+) -> Tuple["WhisperModel", str, str]:
+    """
+    Load a WhisperModel, falling back to CPU if GPU initialization fails
+    
+    Args:
+        model_size: Model size (tiny, base, small, medium, large-v3)
+        device: Concrete device ("cuda" or "cpu")
+        compute_type: Concrete computation precision
+        cpu_threads: CTranslate2 threads per model (0 = library default)
+        num_workers: Parallel decodes the model serves when transcribe() is
+            called from several threads
+        model_store: Load only from this local store (local_files_only),
+            never from the hub
+        
+    Returns:
+        (model, device, compute_type) with the values actually used
+    """
+    if model_store is not None:
+        # Raises before any load attempt if the model was never fetched
+        source, local_files_only = model_store.path("whisper", model_size), True
+    else:
+        source, local_files_only = model_size, False
+    
+    print(f"⚙️  Initializing Faster-Whisper...", file=sys.stderr)
+    print(f"   Model: {model_size}", file=sys.stderr)
+    if model_store is not None:
+        print(f"   Store: {source}", file=sys.stderr)
+    print(f"   Device: {device}", file=sys.stderr)
+    print(f"   Compute Type: {compute_type}", file=sys.stderr)
+    
+    model_class = import_whisper_model()
+    
+    # Load model with GPU fallback to CPU
+    try:
+        with STARTUP.stage("model_load"):
+            model = model_class(
+                source,
+                device=device,
+                compute_type=compute_type,
+                cpu_threads=cpu_threads,
+                num_workers=num_workers,
+                download_root=None,  # Use default cache directory
+                local_files_only=local_files_only
+            )
+        print(f"✅ Model loaded successfully", file=sys.stderr)
+        return model, device, compute_type
+    except Exception as e:
+        # If GPU fails (e.g., missing cuDNN), fallback to CPU
+        if device == "cuda":
+            print(f"⚠️  GPU initialization failed: {str(e)[:100]}", file=sys.stderr)
+            print(f"🔄 Falling back to CPU...", file=sys.stderr)
+            try:
+                with STARTUP.stage("model_load"):
+                    model = model_class(
+                        source,
+                        device="cpu",
+                        compute_type="int8",
+                        cpu_threads=cpu_threads,
+                        num_workers=num_workers,
+                        download_root=None,
+                        local_files_only=local_files_only
+                    )
+                print(f"✅ Model loaded successfully on CPU", file=sys.stderr)
+                return model, "cpu", "int8"
+            except Exception as cpu_error:
+                print(f"❌ CPU fallback also failed: {cpu_error}", file=sys.stderr)
+                raise
+        else:
+            print(f"❌ Error loading model: {e}", file=sys.stderr)
+            raise
+
+
+def estimate_model_memory_mb(model_size: str, compute_type: str) -> float:
+    """Approximate resident memory of a loaded model in MB"""
+    base_mb = MODEL_MEMORY_MB.get(model_size, MODEL_MEMORY_MB["medium"])
+    return base_mb * COMPUTE_TYPE_MEMORY_SCALE.get(compute_type, 1.0)
+
+
+def stage_name(stage: str, vad: bool = False, align: bool = False) -> str:
+    """
+    Metrics name of a Whisper stage, e.g. "decode(+align)"
+
+    faster-whisper folds its VAD filter and word alignment into the calls
+    timed as prepare and decode, so the name carries what was included and
+    the two are never mistaken for plain feature extraction or decoding.
+    """
+    extras = [name for name, enabled in (("+vad", vad), ("+align", align)) if enabled]
+    return f"{stage}({','.join(extras)})" if extras else stage
+
+
+def transcription_cache_key(
+    audio_path: str,
+    model_size: str,
+    compute_type: str,
+    language: Optional[str],
+    task: str,
+    vad_filter: bool,
+    word_timestamps: Optional[bool],
+    profile: str = DEFAULT_PROFILE,
+    vad_prestage: Optional[str] = None
+) -> str:
+    """
+    Result cache key: audio content hash plus every option shaping the result
+
+    That is the model and precision, the decoding options the profile
+    resolves to, and the VAD pre-stage backend (it decides metadata.speech
+    and whether the audio is decoded at all), so a hit never carries another
+    request's speech report.
+    """
+    options, word_timestamps = decode_options(profile, word_timestamps)
+    return ResultCache.make_key(
+        file_sha256(audio_path),
+        model_size=model_size,
+        compute_type=compute_type,
+        language=language,
+        task=task,
+        vad_filter=vad_filter,
+        word_timestamps=word_timestamps,
+        vad_prestage=vad_prestage,
+        **options
+    )
+
+
+class WhisperModelPool:
+    """
+    Shared WhisperModel instances keyed by (model_size, device, compute_type)
+    
+    Models are loaded lazily on first use and shared by every transcriber
+    that asks for the same key. When the estimated resident size exceeds
+    max_memory_mb, the least recently used models are evicted (the most
+    recently used one is always kept).
+    """
+    
+    def __init__(
+        self,
+        max_memory_mb: Optional[float] = None,
+        model_store: Optional[ModelStore] = None
+    ):
+        """
+        Args:
+            max_memory_mb: Memory budget for resident models (None = unbounded)
+            model_store: Load models only from this local store
+        """
+        self.max_memory_mb = max_memory_mb
+        self.model_store = model_store
+        self._models = OrderedDict()  # key -> (model, device, compute_type, memory_mb)
+        self._lock = threading.RLock()
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+    
+    def get(
+        self,
+        model_size: str,
+        device: str = "auto",
+        compute_type: str = "auto"
+    ) -> Tuple["WhisperModel", str, str]:
+        """
+        Return a loaded model, loading it if needed
+        
+        Returns:
+            (model, device, compute_type) with the values actually used
+        """
+        device, compute_type = resolve_device(device, compute_type)
+        key = (model_size, device, compute_type)
+        
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                return entry[0], entry[1], entry[2]
+            
+            model, actual_device, actual_compute_type = load_whisper_model(
+                model_size,
+                device,
+                compute_type,
+                model_store=self.model_store
+            )
+            memory_mb = estimate_model_memory_mb(model_size, actual_compute_type)
+            self._models[key] = (model, actual_device, actual_compute_type, memory_mb)
+            self.loads += 1
+            self._evict()
+            return model, actual_device, actual_compute_type
+    
+    def record_request(
+        self,
+        model_size: str,
+        device: str = "auto",
+        compute_type: str = "auto"
+    ):
+        """
+        Count one request for a model as a hit if it is already resident
+        
+        Called once per transcription request or stream session, before the
+        model is fetched; get() itself is also used for property reads and
+        device resolution, so it does not count hits (loads are counted there).
+        """
+        device, compute_type = resolve_device(device, compute_type)
+        with self._lock:
+            if (model_size, device, compute_type) in self._models:
+                self.hits += 1
+    
+    def resident_memory_mb(self) -> float:
+        with self._lock:
+            return sum(entry[3] for entry in self._models.values())
+    
+    def _evict(self):
+        if self.max_memory_mb is None:
+            return
+        
+        evicted = False
+        while len(self._models) > 1 and self.resident_memory_mb() > self.max_memory_mb:
+            (model_size, device, compute_type), _ = self._models.popitem(last=False)
+            self.evictions += 1
+            evicted = True
+            print(f"♻️  Evicted model {model_size} ({device}/{compute_type})", file=sys.stderr)
+        
+        if evicted:
+            gc.collect()
+    
+    def stats(self) -> Dict:
+        """
+        Load/hit/evict counters and the currently resident models
+        
+        hits counts requests (see record_request) whose model was already
+        resident; loads counts model loads, including the initial one.
+        """
+        with self._lock:
+            return {
+                "loads": self.loads,
+                "hits": self.hits,
+                "evictions": self.evictions,
+                "resident_memory_mb": round(self.resident_memory_mb(), 1),
+                "max_memory_mb": self.max_memory_mb,
+                "resident_models": [
+                    {
+                        "model_size": key[0],
+                        "device": entry[1],
+                        "compute_type": entry[2],
+                        "memory_mb": round(entry[3], 1)
+                    }
+                    for key, entry in self._models.items()
+                ]
+            }
 
 
 class FasterWhisperTranscriber:
@@ -48,7 +594,12 @@ class FasterWhisperTranscriber:
         self, 
         model_size: str = "base",
         device: str = "auto",
-        compute_type: str = "auto"
+        compute_type: str = "auto",
+        model_pool: Optional[WhisperModelPool] = None,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        result_cache: Optional[ResultCache] = None,
+        model_store: Optional[ModelStore] = None
     ):
         """
         Initialize the transcriber
@@ -57,76 +608,144 @@ class FasterWhisperTranscriber:
             model_size: Model size (tiny, base, small, medium, large-v3)
             device: Device to use ("cuda", "cpu", or "auto")
             compute_type: Computation precision ("float16", "int8", "auto")
+            model_pool: Share models through this pool instead of owning one
+            cpu_threads: CTranslate2 threads for an owned model (0 = default)
+            num_workers: Concurrent transcribe() calls an owned model serves
+            result_cache: Return stored results for audio already transcribed
+                with identical options
+            model_store: Load an owned model only from this local store
+                (a pool uses its own)
         """
         self.model_size = model_size
+        self.result_cache = result_cache
+        self.model_store = model_store
+        self.requested_device = device
+        self.requested_compute_type = compute_type
+        self.model_pool = model_pool
         
-        # Auto-detect device with cuDNN check
         if device == "auto":
-            # Force CPU mode to avoid cuDNN issues
-            # GPU requires cuDNN library which may not be installed
-            device = "cpu"
             print("💻 Using CPU mode (avoiding cuDNN dependency)", file=sys.stderr)
-            
-            # Uncomment below to try GPU (requires cuDNN installed)
-            # try:
-            #     import torch
-            #     if torch.cuda.is_available():
-            #         device = "cuda"
-            #         print(f"🎮 GPU detected: {torch.cuda.get_device_name(0)}", file=sys.stderr)
-            #     else:
-            #         device = "cpu"
-            #         print("💻 Using CPU (no GPU available)", file=sys.stderr)
-            # except:
-            #     device = "cpu"
-            #     print("💻 Using CPU (torch not available)", file=sys.stderr)
-        
-        # Auto-detect compute type based on device
-        if compute_type == "auto":
-            if device == "cuda":
-                compute_type = "float16"  # Best for GPU
-            else:
-                compute_type = "int8"  # Best for CPU
         
-        self.device = device
-        self.compute_type = compute_type
+        device, compute_type = resolve_device(device, compute_type)
+        
+        startup = StageMetrics()
+        with startup.stage("model_load"):
+            if model_pool is not None:
+                _, self.device, self.compute_type = model_pool.get(model_size, device, compute_type)
+                self._model = None
+            else:
+                self._model, self.device, self.compute_type = load_whisper_model(
+                    model_size,
+                    device,
+                    compute_type,
+                    cpu_threads=cpu_threads,
+                    num_workers=num_workers,
+                    model_store=model_store
+                )
+        self.load_metrics = startup.as_dict()["stages"]["model_load"]
+    
+    @property
+    def model(self) -> "WhisperModel":
+        """Loaded model (fetched from the pool, reloading it if evicted)"""
+        if self.model_pool is not None:
+            model, self.device, self.compute_type = self.model_pool.get(
+                self.model_size,
+                self.requested_device,
+                self.requested_compute_type
+            )
+            return model
+        return self._model
+    
+    def with_model(
+        self,
+        model_size: Optional[str] = None,
+        compute_type: Optional[str] = None
+    ) -> "FasterWhisperTranscriber":
+        """
+        Transcriber for another model size/compute type sharing this pool
         
-        print(f"⚙️  Initializing Faster-Whisper...", file=sys.stderr)
-        print(f"   Model: {model_size}", file=sys.stderr)
-        print(f"   Device: {device}", file=sys.stderr)
-        print(f"   Compute Type: {compute_type}", file=sys.stderr)
+        Returns self when nothing differs.
+        """
+        model_size = model_size or self.model_size
+        compute_type = compute_type or self.requested_compute_type
+        if model_size == self.model_size and compute_type == self.requested_compute_type:
+            return self
         
-        # Load model with GPU fallback to CPU
-        try:
-            self.model = WhisperModel(
-                model_size,
-                device=device,
-                compute_type=compute_type,
-                download_root=None,  # Use default cache directory
-                local_files_only=False
+        return FasterWhisperTranscriber(
+            model_size=model_size,
+            device=self.requested_device,
+            compute_type=compute_type,
+            model_pool=self.model_pool,
+            result_cache=self.result_cache,
+            model_store=self.model_store
+        )
+    
+    def record_request(self, model_size: Optional[str] = None, compute_type: Optional[str] = None):
+        """Count a request for this (or another) model in the shared pool's hit counter"""
+        if self.model_pool is not None:
+            self.model_pool.record_request(
+                model_size or self.model_size,
+                self.requested_device,
+                compute_type or self.requested_compute_type
             )
-            print(f"✅ Model loaded successfully", file=sys.stderr)
-        except Exception as e:
-            # If GPU fails (e.g., missing cuDNN), fallback to CPU
-            if device == "cuda":
-                print(f"⚠️  GPU initialization failed: {str(e)[:100]}", file=sys.stderr)
-                print(f"🔄 Falling back to CPU...", file=sys.stderr)
-                self.device = "cpu"
-                self.compute_type = "int8"
-                try:
-                    self.model = WhisperModel(
-                        model_size,
-                        device="cpu",
-                        compute_type="int8",
-                        download_root=None,
-                        local_files_only=False
-                    )
-                    print(f"✅ Model loaded successfully on CPU", file=sys.stderr)
-                except Exception as cpu_error:
-                    print(f"❌ CPU fallback also failed: {cpu_error}", file=sys.stderr)
-                    raise
-            else:
-                print(f"❌ Error loading model: {e}", file=sys.stderr)
-                raise
+    
+    def prewarm(self, profiles: Optional[List[str]] = None, seconds: float = 2.0) -> Dict:
+        """
+        Run a throwaway decode so the first real request starts warm
+        
+        Decodes a short synthetic signal once per profile with language
+        detection on. This initializes CTranslate2's kernels and allocator
+        pools, the mel filterbank, the tokenizer and, for profiles with word
+        timestamps, the alignment path, all of which are otherwise set up
+        lazily during the first request.
+        
+        Args:
+            profiles: Decoding profiles to warm (default: DEFAULT_PROFILE)
+            seconds: Length of the synthetic signal
+            
+        Returns:
+            dict: Wall/CPU seconds per warmed profile
+        """
+        rng = np.random.default_rng(0)
+        audio = (0.01 * rng.standard_normal(int(seconds * SAMPLE_RATE))).astype(np.float32)
+        timings = StageMetrics()
+        
+        for profile in profiles or [DEFAULT_PROFILE]:
+            options, word_timestamps = decode_options(profile)
+            with STARTUP.stage("prewarm"), timings.stage(profile):
+                segments, _ = self.model.transcribe(
+                    audio,
+                    vad_filter=False,
+                    word_timestamps=word_timestamps,
+                    **options
+                )
+                # Segments are decoded lazily while iterating
+                list(segments)
+        
+        print(f"🔥 Prewarmed {self.model_size} ({', '.join(timings.stages)})", file=sys.stderr)
+        return timings.as_dict()["stages"]
+    
+    def _cache_key(
+        self,
+        audio_path: str,
+        language: Optional[str],
+        task: str,
+        vad_filter: bool,
+        word_timestamps: Optional[bool],
+        profile: str = DEFAULT_PROFILE,
+        vad_prestage: Optional[str] = None
+    ) -> str:
+        return transcription_cache_key(
+            audio_path,
+            self.model_size,
+            self.compute_type,
+            language,
+            task,
+            vad_filter,
+            word_timestamps,
+            profile,
+            vad_prestage
+        )
     
     def transcribe(
         self,
@@ -134,8 +753,14 @@ class FasterWhisperTranscriber:
         language: Optional[str] = None,
         task: str = "transcribe",
         vad_filter: bool = True,
-        word_timestamps: bool = True,
-        progress_callback: Optional[Callable] = None
+        word_timestamps: Optional[bool] = None,
+        progress_callback: Optional[Callable] = None,
+        segment_callback: Optional[Callable[[Dict], None]] = None,
+        collect_segments: bool = True,
+        decoded_cache_dir: Optional[str] = None,
+        audio: Optional[np.ndarray] = None,
+        profile: str = DEFAULT_PROFILE,
+        vad_prestage: Optional[str] = None
     ) -> dict:
         """
         Transcribe audio file
@@ -145,117 +770,198 @@ class FasterWhisperTranscriber:
             language: Source language code (None for auto-detection)
             task: "transcribe" or "translate" (translate to English)
             vad_filter: Use Voice Activity Detection to filter silence
-            word_timestamps: Include word-level timestamps
+            word_timestamps: Include word-level timestamps (None: profile default)
             progress_callback: Optional callback for progress updates
+            segment_callback: Optional callback invoked with each segment dict
+                as soon as the decoder yields it
+            collect_segments: Keep segments and the joined transcript in the
+                result; disable when streaming to avoid holding them in memory
+            decoded_cache_dir: Decode once into this shared .npy cache and
+                report the cached path as metadata.decoded_audio_path, so
+                speaker identification can reuse the same buffer
+            audio: Already decoded 16kHz mono float32 waveform; when given,
+                audio_path is not decoded again and only keys the result
+                cache (if it is an existing file) and logging
+            profile: Decoding profile from DECODE_PROFILES ("archive-accurate"
+                or "live-fast")
+            vad_prestage: Run this detect_speech backend ("energy" or
+                "silero") on the decoded audio first; silent audio returns an
+                empty result (metadata.skipped_silence) without touching the
+                model, and metadata.speech reports the speech ratio
             
         Returns:
-            dict: Transcription result with text, segments, and metadata
+            dict: Transcription result with text, segments, metadata and a
+                metrics block. Metrics stages: cache_lookup, model_load (pool
+                fetch, or reload after eviction), audio_decode, vad_prestage,
+                prepare (feature extraction and language detection), decode
+                and cache_store; "startup" holds this transcriber's initial
+                model load. faster-whisper runs its VAD filter inside prepare
+                and word alignment inside decode, so with those enabled the
+                stages are named "prepare(+vad)" and "decode(+align)".
         """
+        metrics = StageMetrics()
         try:
+            options, word_timestamps = decode_options(profile, word_timestamps)
+            if vad_prestage is not None and vad_prestage not in VAD_BACKENDS:
+                raise ValueError(f"Unknown VAD backend: {vad_prestage} (available: {', '.join(VAD_BACKENDS)})")
+            
             # Check if file exists
-            if not os.path.exists(audio_path):
+            if audio is None and not os.path.exists(audio_path):
                 raise FileNotFoundError(f"Audio file not found: {audio_path}")
             
-            file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
-            print(f"\n📁 Processing: {Path(audio_path).name} ({file_size_mb:.2f} MB)", file=sys.stderr)
+            if audio is None:
+                file_size_mb = os.path.getsize(audio_path) / (1024 * 1024)
+                print(f"\n📁 Processing: {Path(audio_path).name} ({file_size_mb:.2f} MB)", file=sys.stderr)
+            else:
+                print(f"\n📁 Processing: {Path(audio_path).name} ({len(audio) / SAMPLE_RATE:.2f}s decoded)", file=sys.stderr)
+            
+            # Identical audio + options: return the stored result immediately
+            cache_key = None
+            if self.result_cache is not None and (audio is None or os.path.isfile(audio_path)):
+                with metrics.stage("cache_lookup"):
+                    cache_key = self._cache_key(
+                        audio_path, language, task, vad_filter, word_timestamps, profile, vad_prestage
+                    )
+                    cached = self.result_cache.get(cache_key)
+                if cached is not None:
+                    print(f"⚡ Cache hit: returning stored transcription", file=sys.stderr)
+                    if segment_callback:
+                        for segment_data in cached["segments"]:
+                            segment_callback(segment_data)
+                    if not collect_segments:
+                        cached.pop("transcript", None)
+                        cached.pop("segments", None)
+                    cached["metadata"]["cache_hit"] = True
+                    if decoded_cache_dir:
+                        cached["metadata"]["decoded_audio_path"] = decode_to_cache(audio_path, decoded_cache_dir)
+                    if progress_callback:
+                        progress_callback("complete", "Transcription complete!")
+                    cached["metrics"] = metrics.as_dict(cached["metadata"].get("duration"))
+                    return cached
             
             if progress_callback:
                 progress_callback("loading", "Loading audio file...")
             
-            # Convert WebM to WAV if needed (Whisper works better with WAV)
-            temp_wav = None
-            original_path = audio_path
-            if audio_path.lower().endswith('.webm'):
-                try:
-                    from pydub import AudioSegment
-                    print("🔄 Converting WebM to WAV...", file=sys.stderr)
-                    
-                    temp_wav = tempfile.NamedTemporaryFile(suffix='.wav', delete=False)
-                    temp_wav.close()
-                    
-                    # Load WebM and convert to mono 16kHz WAV (optimal for Whisper)
-                    audio = AudioSegment.from_file(audio_path, format='webm')
-                    audio = audio.set_channels(1)  # Mono
-                    audio = audio.set_frame_rate(16000)  # 16kHz
-                    audio.export(temp_wav.name, format='wav', parameters=["-ac", "1", "-ar", "16000"])
-                    audio_path = temp_wav.name
-                    
-                    print("✅ Conversion complete", file=sys.stderr)
-                except Exception as e:
-                    print(f"⚠️  WebM conversion failed: {str(e)[:100]}", file=sys.stderr)
-                    # If conversion fails, try using original file
-                    audio_path = original_path
-                    if temp_wav:
-                        try:
-                            os.unlink(temp_wav.name)
-                        except:
-                            pass
-                        temp_wav = None
+            # Decode WebM straight to a 16kHz mono float32 array in memory
+            # (one FFmpeg pass, no temp WAV, no second decode by Whisper)
+            with metrics.stage("audio_decode"):
+                audio_input = audio_path
+                decoded_audio_path = None
+                if audio is not None:
+                    audio_input = audio
+                elif is_decoded_audio(audio_path) or decoded_cache_dir:
+                    # Shared decode: memory-map the cached 16kHz float32 waveform
+                    try:
+                        decoded_audio_path = decode_to_cache(audio_path, decoded_cache_dir)
+                        audio_input = load_decoded_audio(decoded_audio_path)
+                        print(f"📦 Using decoded audio cache: {Path(decoded_audio_path).name}", file=sys.stderr)
+                    except Exception as e:
+                        if is_decoded_audio(audio_path):
+                            raise
+                        print(f"⚠️  Shared decode failed: {str(e)[:100]}", file=sys.stderr)
+                        decoded_audio_path = None
+                elif audio_path.lower().endswith('.webm'):
+                    try:
+                        print("🔄 Decoding WebM in memory...", file=sys.stderr)
+                        audio_input = decode_audio(audio_path)
+                        print(f"✅ Decoded {len(audio_input) / SAMPLE_RATE:.2f}s of audio", file=sys.stderr)
+                    except Exception as e:
+                        print(f"⚠️  WebM decode failed: {str(e)[:100]}", file=sys.stderr)
+                        # If decoding fails, let faster-whisper read the original file
+                        audio_input = audio_path
+                if vad_prestage and isinstance(audio_input, str):
+                    # The detector needs samples; Whisper then reuses them
+                    audio_input = decode_audio(audio_path)
+            
+            # Skip the model entirely for silent audio
+            speech = None
+            if vad_prestage:
+                with metrics.stage("vad_prestage"):
+                    speech = detect_speech(audio_input, vad_prestage)
+                if not speech["has_speech"]:
+                    print(f"🔇 No speech ({vad_prestage} VAD, {speech['duration']:.2f}s), skipping transcription", file=sys.stderr)
+                    result = silent_result(
+                        speech, language, self.model_size, self.device, self.compute_type, profile, collect_segments
+                    )
+                    if decoded_audio_path:
+                        result["metadata"]["decoded_audio_path"] = decoded_audio_path
+                    if progress_callback:
+                        progress_callback("complete", "No speech detected")
+                    result["metrics"] = metrics.as_dict(speech["duration"])
+                    return result
             
             if progress_callback:
                 progress_callback("transcribing", "Transcribing audio...")
             
-            print(f"🎙️  Starting transcription...", file=sys.stderr)
+            print(f"🎙️  Starting transcription ({profile})...", file=sys.stderr)
             
-            # Transcribe
-            segments, info = self.model.transcribe(
-                audio_path,
-                language=language,
-                task=task,
-                vad_filter=vad_filter,
-                word_timestamps=word_timestamps,
-                beam_size=5,
-                best_of=5,
-                temperature=0.0
-            )
+            with metrics.stage("model_load"):
+                model = self.model
+            
+            # Transcribe (features, VAD and language detection run eagerly;
+            # segments are decoded and word-aligned lazily while iterating).
+            # The stage names say which of the two extras they include.
+            with metrics.stage(stage_name("prepare", vad=vad_filter)):
+                segments, info = model.transcribe(
+                    audio_input,
+                    language=language,
+                    task=task,
+                    vad_filter=vad_filter,
+                    word_timestamps=word_timestamps,
+                    **options
+                )
             
             # Process segments
             all_segments = []
             full_text = []
+            segment_count = 0
+            character_count = 0
             
-            for i, segment in enumerate(segments):
-                segment_data = {
-                    "id": i,
-                    "start": round(segment.start, 2),
-                    "end": round(segment.end, 2),
-                    "text": segment.text.strip(),
-                    "avg_logprob": round(segment.avg_logprob, 4),
-                    "no_speech_prob": round(segment.no_speech_prob, 4)
-                }
-                
-                # Add word-level timestamps if available
-                if word_timestamps and hasattr(segment, 'words') and segment.words:
-                    segment_data["words"] = [
-                        {
-                            "word": word.word,
-                            "start": round(word.start, 2),
-                            "end": round(word.end, 2),
-                            "probability": round(word.probability, 4)
-                        }
-                        for word in segment.words
-                    ]
-                
-                all_segments.append(segment_data)
-                full_text.append(segment.text.strip())
-                
-                # Progress update every 10 segments
-                if progress_callback and (i + 1) % 10 == 0:
-                    progress_callback("processing", f"Processed {i + 1} segments...")
-            
-            # Clean up temp file
-            if temp_wav:
-                try:
-                    os.unlink(temp_wav.name)
-                except:
-                    pass
+            with metrics.stage(stage_name("decode", align=word_timestamps)):
+                for i, segment in enumerate(segments):
+                    segment_data = {
+                        "id": i,
+                        "start": round(segment.start, 2),
+                        "end": round(segment.end, 2),
+                        "text": segment.text.strip(),
+                        "avg_logprob": round(segment.avg_logprob, 4),
+                        "no_speech_prob": round(segment.no_speech_prob, 4)
+                    }
+                    
+                    # Add word-level timestamps if available
+                    if word_timestamps and hasattr(segment, 'words') and segment.words:
+                        segment_data["words"] = [
+                            {
+                                "word": word.word,
+                                "start": round(word.start, 2),
+                                "end": round(word.end, 2),
+                                "probability": round(word.probability, 4)
+                            }
+                            for word in segment.words
+                        ]
+                    
+                    segment_count += 1
+                    character_count += len(segment_data["text"])
+                    
+                    if segment_callback:
+                        segment_callback(segment_data)
+                    
+                    if collect_segments:
+                        all_segments.append(segment_data)
+                        full_text.append(segment_data["text"])
+                    
+                    # Progress update every 10 segments
+                    if progress_callback and (i + 1) % 10 == 0:
+                        progress_callback("processing", f"Processed {i + 1} segments...")
             
             # Build result
-            transcript_text = " ".join(full_text)
+            result = {"success": True}
+            
+            if collect_segments:
+                result["transcript"] = " ".join(full_text)
+                result["segments"] = all_segments
             
-            result = {
-                "success": True,
-                "transcript": transcript_text,
-                "segments": all_segments,
+            result.update({
                 "metadata": {
                     "language": info.language,
                     "language_probability": round(info.language_probability, 4),
@@ -263,15 +969,31 @@ class FasterWhisperTranscriber:
                     "model_size": self.model_size,
                     "device": self.device,
                     "compute_type": self.compute_type,
-                    "total_segments": len(all_segments)
+                    "profile": profile,
+                    "total_segments": segment_count
                 }
-            }
+            })
+            if speech is not None:
+                result["metadata"]["speech"] = speech
+            
+            if cache_key and collect_segments:
+                with metrics.stage("cache_store"):
+                    try:
+                        self.result_cache.put(cache_key, result)
+                    except Exception as e:
+                        print(f"⚠️  Could not store result in cache: {str(e)[:100]}", file=sys.stderr)
+            
+            if decoded_audio_path:
+                result["metadata"]["decoded_audio_path"] = decoded_audio_path
+            
+            result["metrics"] = metrics.as_dict(info.duration)
+            result["metrics"]["startup"] = self.load_metrics
             
             print(f"\n✅ Transcription complete!", file=sys.stderr)
             print(f"   Language: {info.language} ({info.language_probability:.2%})", file=sys.stderr)
             print(f"   Duration: {info.duration:.2f}s", file=sys.stderr)
-            print(f"   Segments: {len(all_segments)}", file=sys.stderr)
-            print(f"   Characters: {len(transcript_text)}", file=sys.stderr)
+            print(f"   Segments: {segment_count}", file=sys.stderr)
+            print(f"   Characters: {character_count}", file=sys.stderr)
             
             if progress_callback:
                 progress_callback("complete", "Transcription complete!")
@@ -291,48 +1013,1242 @@ class FasterWhisperTranscriber:
             }
 
 
+def plan_windows(
+    audio: np.ndarray,
+    window_seconds: float = 300.0
+) -> List[Tuple[int, int]]:
+    """
+    Split a waveform into roughly window_seconds long pieces at silences
+    
+    Cut points are placed in the middle of the non-speech gap (found with
+    faster-whisper's Silero VAD) closest to each target boundary, so no
+    window starts or ends inside a word. Falls back to fixed-length cuts if
+    VAD is unavailable or finds no gap nearby.
+    
+    Args:
+        audio: 1-D 16kHz mono float32 waveform
+        window_seconds: Target window length in seconds
+        
+    Returns:
+        List of (start_sample, end_sample) windows covering the whole audio
+    """
+    total = len(audio)
+    target = int(window_seconds * SAMPLE_RATE)
+    if total <= target:
+        return [(0, total)]
+    
+    gaps = []
+    try:
+        from faster_whisper.vad import get_speech_timestamps
+        speech = get_speech_timestamps(audio)
+        gaps = [
+            (previous["end"] + current["start"]) // 2
+            for previous, current in zip(speech, speech[1:])
+        ]
+    except Exception as e:
+        print(f"⚠️  VAD split failed, using fixed windows: {str(e)[:100]}", file=sys.stderr)
+    
+    cuts = []
+    start = 0
+    gap_index = 0
+    while total - start > target:
+        ideal = start + target
+        low, high = start + target // 2, start + target + target // 2
+        
+        # Gaps are sorted; skip the ones already behind this window
+        while gap_index < len(gaps) and gaps[gap_index] < low:
+            gap_index += 1
+        
+        best = None
+        index = gap_index
+        while index < len(gaps) and gaps[index] <= high:
+            if best is None or abs(gaps[index] - ideal) < abs(best - ideal):
+                best = gaps[index]
+            index += 1
+        
+        cut = best if best is not None else ideal
+        if total - cut < target // 4:
+            # Don't leave a tiny tail window
+            break
+        cuts.append(cut)
+        start = cut
+    
+    bounds = [0] + cuts + [total]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+# Per-process transcriber used by transcribe_long worker processes
+_worker_transcriber = None
+
+
+def _init_long_worker(
+    model_size: str,
+    device: str,
+    compute_type: str,
+    cpu_threads: int,
+    model_store_root: Optional[str] = None
+):
+    """Load one model per worker process"""
+    global _worker_transcriber
+    warnings.filterwarnings('ignore')
+    _worker_transcriber = FasterWhisperTranscriber(
+        model_size=model_size,
+        device=device,
+        compute_type=compute_type,
+        cpu_threads=cpu_threads,
+        model_store=ModelStore(model_store_root) if model_store_root else None
+    )
+
+
+def _transcribe_window(job: Tuple[int, str, int, int, Dict]) -> Tuple[int, Dict]:
+    """Transcribe one window of a cached waveform inside a worker process"""
+    index, npy_path, start_sample, end_sample, options = job
+    window = np.array(load_decoded_audio(npy_path)[start_sample:end_sample])
+    
+    result = _worker_transcriber.transcribe(
+        audio_path=f"{Path(npy_path).name}[window {index}]",
+        audio=window,
+        **options
+    )
+    return index, result
+
+
+def _offset_segment(segment: Dict, offset: float) -> Dict:
+    """Shift a window-relative segment (and its words) onto the global timeline"""
+    segment["start"] = round(segment["start"] + offset, 2)
+    segment["end"] = round(segment["end"] + offset, 2)
+    for word in segment.get("words", []):
+        word["start"] = round(word["start"] + offset, 2)
+        word["end"] = round(word["end"] + offset, 2)
+    return segment
+
+
+def transcribe_long(
+    audio_path: str,
+    model_size: str = "base",
+    device: str = "auto",
+    compute_type: str = "auto",
+    language: Optional[str] = None,
+    task: str = "transcribe",
+    vad_filter: bool = True,
+    word_timestamps: Optional[bool] = None,
+    workers: int = 2,
+    cpu_threads: Optional[int] = None,
+    window_seconds: float = 300.0,
+    decoded_cache_dir: Optional[str] = None,
+    profile: str = DEFAULT_PROFILE,
+    model_store: Optional[ModelStore] = None
+) -> Dict:
+    """
+    Transcribe a long recording in parallel across worker processes
+    
+    The recording is decoded once into a .npy cache, split at silences into
+    windows, and the windows are transcribed concurrently by a pool of
+    processes that each own a model. Segments are stitched back with global
+    timestamps and contiguous ids.
+    
+    Args:
+        audio_path: Audio file or decoded 16kHz .npy cache
+        model_size: Model size (tiny, base, small, medium, large-v3)
+        device: Device to use ("cuda", "cpu", or "auto")
+        compute_type: Computation precision ("float16", "int8", "auto")
+        language: Source language code (None for auto-detection per window)
+        task: "transcribe" or "translate"
+        vad_filter: Use Voice Activity Detection to filter silence
+        word_timestamps: Include word-level timestamps (None: profile default)
+        workers: Number of worker processes
+        cpu_threads: CTranslate2 threads per worker (default: cores / workers)
+        window_seconds: Target window length in seconds
+        decoded_cache_dir: Where to keep the decoded waveform (default: a
+            temporary directory removed afterwards)
+        profile: Decoding profile from DECODE_PROFILES
+        model_store: Workers load the model only from this local store
+        
+    Returns:
+        dict: Transcription result (same schema as FasterWhisperTranscriber.transcribe)
+    """
+    import multiprocessing
+    import shutil
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+    
+    workers = max(1, workers)
+    if cpu_threads is None:
+        cpu_threads = max(1, (os.cpu_count() or 1) // workers)
+    
+    temp_dir = None
+    try:
+        if not os.path.exists(audio_path):
+            raise FileNotFoundError(f"Audio file not found: {audio_path}")
+        
+        start_time = time.time()
+        metrics = StageMetrics()
+        with metrics.stage("audio_decode"):
+            if decoded_cache_dir is None and not is_decoded_audio(audio_path):
+                temp_dir = tempfile.mkdtemp(prefix="acta_long_")
+            npy_path = decode_to_cache(audio_path, decoded_cache_dir or temp_dir)
+            audio = load_decoded_audio(npy_path)
+        duration = len(audio) / SAMPLE_RATE
+        
+        with metrics.stage("plan_windows"):
+            windows = plan_windows(audio, window_seconds)
+        print(f"\n📁 Processing: {Path(audio_path).name} ({duration:.2f}s)", file=sys.stderr)
+        print(f"🧩 Split into {len(windows)} windows across {workers} workers ({cpu_threads} threads each)", file=sys.stderr)
+        
+        options = {
+            "language": language,
+            "task": task,
+            "vad_filter": vad_filter,
+            "word_timestamps": word_timestamps,
+            "profile": profile
+        }
+        jobs = [
+            (index, npy_path, window_start, window_end, options)
+            for index, (window_start, window_end) in enumerate(windows)
+        ]
+        
+        window_results = {}
+        # This stage's CPU time covers only the coordinating process; the
+        # workers' own decode times are folded in below as window_decode
+        with metrics.stage("parallel_transcribe"):
+            # "spawn" keeps CTranslate2 thread pools out of forked children
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(jobs)),
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_long_worker,
+                initargs=(
+                    model_size, device, compute_type, cpu_threads,
+                    model_store.root if model_store else None
+                )
+            ) as executor:
+                futures = [executor.submit(_transcribe_window, job) for job in jobs]
+                for future in as_completed(futures):
+                    index, result = future.result()
+                    if not result.get("success"):
+                        raise RuntimeError(f"Window {index} failed: {result.get('error')}")
+                    window_results[index] = result
+                    print(f"   ✅ Window {len(window_results)}/{len(jobs)} done", file=sys.stderr)
+        
+        # Stitch windows back together in order
+        all_segments = []
+        language_time = {}
+        for index, (window_start, window_end) in enumerate(windows):
+            result = window_results[index]
+            offset = window_start / SAMPLE_RATE
+            for segment in result["segments"]:
+                segment = _offset_segment(segment, offset)
+                segment["id"] = len(all_segments)
+                all_segments.append(segment)
+            
+            window_language = result["metadata"]["language"]
+            language_time[window_language] = language_time.get(window_language, 0.0) + (window_end - window_start)
+            
+            for name, stage in result.get("metrics", {}).get("stages", {}).items():
+                if name.split("(")[0] == "decode":
+                    metrics.add("window_decode", stage["wall_seconds"], stage["cpu_seconds"])
+        
+        first_metadata = window_results[0]["metadata"]
+        detected_language = max(language_time, key=language_time.get)
+        transcript_text = " ".join(segment["text"] for segment in all_segments)
+        elapsed = time.time() - start_time
+        
+        print(f"\n✅ Long-file transcription complete in {elapsed:.2f}s ({duration / max(elapsed, 1e-9):.1f}x real-time)", file=sys.stderr)
+        
+        return {
+            "success": True,
+            "transcript": transcript_text,
+            "segments": all_segments,
+            "metadata": {
+                "language": detected_language,
+                "language_probability": first_metadata["language_probability"],
+                "duration": round(duration, 2),
+                "model_size": model_size,
+                "device": first_metadata["device"],
+                "compute_type": first_metadata["compute_type"],
+                "profile": profile,
+                "total_segments": len(all_segments),
+                "windows": len(windows),
+                "workers": workers,
+                "cpu_threads": cpu_threads
+            },
+            "metrics": metrics.as_dict(duration)
+        }
+        
+    except Exception as e:
+        error_msg = f"Transcription error: {str(e)}"
+        print(f"\n❌ {error_msg}", file=sys.stderr)
+        return {
+            "success": False,
+            "error": error_msg
+        }
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def _normalize_word(word: str) -> str:
+    """Comparison form of a word for hypothesis agreement"""
+    return "".join(ch for ch in word.lower() if ch.isalnum())
+
+
+class StreamingTranscriber:
+    """
+    Incremental transcription of a continuous 16kHz PCM stream
+    
+    Audio is appended to a rolling buffer that is re-decoded every
+    min_chunk_seconds. A word is committed once two consecutive decodes agree
+    on it (local agreement), so words straddling a chunk boundary are neither
+    cut nor emitted twice. Committed text is passed as initial_prompt to keep
+    context across decodes, and the buffer is trimmed at the last committed
+    word once it grows past buffer_seconds, so committed audio is never
+    decoded again.
+    """
+    
+    def __init__(
+        self,
+        transcriber: "FasterWhisperTranscriber",
+        language: Optional[str] = None,
+        task: str = "transcribe",
+        min_chunk_seconds: float = 1.0,
+        buffer_seconds: float = 15.0,
+        prompt_chars: int = 200,
+        profile: str = "live-fast"
+    ):
+        """
+        Args:
+            transcriber: Loaded transcriber whose model decodes the buffer
+            language: Source language (None: detected on the first decode, then kept)
+            task: "transcribe" or "translate"
+            min_chunk_seconds: New audio required before the buffer is re-decoded
+            buffer_seconds: Buffer length above which committed audio is dropped
+            prompt_chars: Characters of committed text passed as initial_prompt
+            profile: Decoding profile for the beam settings; word timestamps
+                are always on because agreement and trimming rely on them
+        """
+        self.transcriber = transcriber
+        self.language = language
+        self.task = task
+        self.min_chunk_samples = int(min_chunk_seconds * SAMPLE_RATE)
+        self.buffer_samples = int(buffer_seconds * SAMPLE_RATE)
+        self.prompt_chars = prompt_chars
+        self.profile = profile
+        self.options, _ = decode_options(profile)
+        # The prompt replaces previous-text conditioning, and word times
+        # need timestamp tokens
+        self.options.update(condition_on_previous_text=False, without_timestamps=False)
+        
+        self.buffer = np.zeros(0, dtype=np.float32)
+        self.buffer_offset = 0.0  # Stream time of buffer[0] in seconds
+        self.pending_samples = 0  # Samples added since the last decode
+        self.total_samples = 0
+        self.committed: List[Dict] = []
+        self.hypothesis: List[Dict] = []  # Uncommitted words of the last decode
+        self.decode_passes = 0
+        self.language_probability = None
+        self.metrics = StageMetrics()
+    
+    @property
+    def committed_end(self) -> float:
+        return self.committed[-1]["end"] if self.committed else 0.0
+    
+    def insert_audio(self, audio: np.ndarray) -> List[Dict]:
+        """
+        Append audio and decode if enough new audio has arrived
+        
+        Args:
+            audio: 16kHz mono float32 samples
+            
+        Returns:
+            List of events ({"type": "commit"} and/or {"type": "partial"})
+        """
+        self.buffer = np.concatenate([self.buffer, np.asarray(audio, dtype=np.float32)])
+        self.pending_samples += len(audio)
+        self.total_samples += len(audio)
+        
+        if self.pending_samples < self.min_chunk_samples:
+            return []
+        return self._process()
+    
+    def finish(self) -> List[Dict]:
+        """
+        Decode what is left and commit the remaining hypothesis
+        
+        Returns:
+            List of events ending with a {"type": "final"} record
+        """
+        events = self._process() if self.pending_samples else []
+        
+        if self.hypothesis:
+            events.append(self._commit(self.hypothesis))
+            self.hypothesis = []
+        
+        events.append({
+            "type": "final",
+            "success": True,
+            "transcript": "".join(word["word"] for word in self.committed).strip(),
+            "words": self.committed,
+            "metadata": {
+                "language": self.language,
+                "language_probability": self.language_probability,
+                "duration": round(self.total_samples / SAMPLE_RATE, 2),
+                "model_size": self.transcriber.model_size,
+                "device": self.transcriber.device,
+                "compute_type": self.transcriber.compute_type,
+                "profile": self.profile,
+                "decode_passes": self.decode_passes,
+                "total_words": len(self.committed)
+            },
+            "metrics": self.metrics.as_dict(self.total_samples / SAMPLE_RATE)
+        })
+        return events
+    
+    def _prompt(self) -> Optional[str]:
+        text = "".join(word["word"] for word in self.committed).strip()
+        return text[-self.prompt_chars:] if text else None
+    
+    def _decode(self) -> List[Dict]:
+        """Decode the buffer into words on the stream timeline"""
+        with self.metrics.stage(stage_name("decode", align=True)):
+            segments, info = self.transcriber.model.transcribe(
+                self.buffer,
+                language=self.language,
+                task=self.task,
+                initial_prompt=self._prompt(),
+                vad_filter=False,
+                word_timestamps=True,
+                **self.options
+            )
+            
+            words = []
+            for segment in segments:
+                for word in segment.words or []:
+                    words.append({
+                        "word": word.word,
+                        "start": round(word.start + self.buffer_offset, 2),
+                        "end": round(word.end + self.buffer_offset, 2),
+                        "probability": round(word.probability, 4)
+                    })
+        
+        self.decode_passes += 1
+        if self.language is None:
+            # Lock the detected language so short buffers don't flip it
+            self.language = info.language
+            self.language_probability = round(info.language_probability, 4)
+        return words
+    
+    def _new_words(self, words: List[Dict]) -> List[Dict]:
+        """Drop words that repeat audio or text already committed"""
+        words = [word for word in words if word["start"] > self.committed_end - 0.1]
+        
+        # The buffer may still hold committed audio: remove a leading n-gram
+        # that repeats the tail of the committed text
+        committed_tail = [_normalize_word(word["word"]) for word in self.committed[-5:]]
+        for n in range(min(len(committed_tail), len(words)), 0, -1):
+            if committed_tail[-n:] == [_normalize_word(word["word"]) for word in words[:n]]:
+                return words[n:]
+        return words
+    
+    def _commit(self, words: List[Dict]) -> Dict:
+        self.committed.extend(words)
+        return {
+            "type": "commit",
+            "text": "".join(word["word"] for word in words).strip(),
+            "words": words,
+            "start": words[0]["start"],
+            "end": words[-1]["end"]
+        }
+    
+    def _process(self) -> List[Dict]:
+        self.pending_samples = 0
+        words = self._new_words(self._decode())
+        
+        # Local agreement: commit the prefix both decodes agree on
+        agreed = 0
+        while (
+            agreed < len(words) and agreed < len(self.hypothesis)
+            and _normalize_word(words[agreed]["word"]) == _normalize_word(self.hypothesis[agreed]["word"])
+        ):
+            agreed += 1
+        
+        events = []
+        if agreed:
+            events.append(self._commit(words[:agreed]))
+        self.hypothesis = words[agreed:]
+        
+        if self.hypothesis:
+            events.append({
+                "type": "partial",
+                "text": "".join(word["word"] for word in self.hypothesis).strip(),
+                "start": self.hypothesis[0]["start"]
+            })
+        
+        events.extend(self._trim())
+        return events
+    
+    def _trim(self) -> List[Dict]:
+        """Drop committed audio once the buffer exceeds its budget"""
+        if len(self.buffer) <= self.buffer_samples:
+            return []
+        
+        events = []
+        cut = int((self.committed_end - self.buffer_offset) * SAMPLE_RATE)
+        if cut <= 0 and len(self.buffer) > 2 * self.buffer_samples:
+            # No agreement for a long time: force-commit so memory stays bounded
+            if self.hypothesis:
+                events.append(self._commit(self.hypothesis))
+                self.hypothesis = []
+            cut = len(self.buffer) - self.buffer_samples
+        
+        if cut > 0:
+            self.buffer = self.buffer[cut:]
+            self.buffer_offset += cut / SAMPLE_RATE
+        return events
+
+
+def handle_request(
+    transcriber: FasterWhisperTranscriber,
+    request: Dict,
+    emit: Optional[Callable[[Dict], None]] = None,
+    audio: Optional[np.ndarray] = None
+) -> Dict:
+    """
+    Run a single transcription job described by a request dict
+
+    Shared by the one-shot CLI and the resident service mode so both paths
+    accept exactly the same options.
+
+    With "stream": true and an emit function, every segment is emitted as a
+    {"type": "segment", "segment": {...}} record the moment it is decoded, and
+    the returned result is a final {"type": "metadata", ...} record without
+    the segment list or joined transcript.
+
+    Args:
+        transcriber: Loaded transcriber instance
+        request: Job description with "audio_path" and optional "language",
+            "task", "vad_filter", "vad_prestage", "word_timestamps", "profile",
+            "stream", "decoded_cache_dir", "model_size" and "compute_type" keys
+        emit: Writes one intermediate record (required for streaming)
+        audio: request["audio_path"] already decoded to 16kHz mono float32
+
+    Returns:
+        dict: Transcription result (same schema as FasterWhisperTranscriber.transcribe)
+    """
+    audio_path = request.get("audio_path")
+    if not audio_path:
+        return {
+            "success": False,
+            "error": "Missing required field: audio_path"
+        }
+
+    # Route to another model size/precision through the shared pool if asked
+    transcriber.record_request(request.get("model_size"), request.get("compute_type"))
+    transcriber = transcriber.with_model(request.get("model_size"), request.get("compute_type"))
+
+    stream = bool(request.get("stream")) and emit is not None
+    segment_callback = None
+    if stream:
+        segment_callback = lambda segment: emit({"type": "segment", "segment": segment})
+
+    result = transcriber.transcribe(
+        audio_path=audio_path,
+        language=request.get("language"),
+        task=request.get("task", "transcribe"),
+        vad_filter=request.get("vad_filter", True),
+        word_timestamps=request.get("word_timestamps"),
+        segment_callback=segment_callback,
+        collect_segments=not stream,
+        decoded_cache_dir=request.get("decoded_cache_dir"),
+        profile=request.get("profile") or DEFAULT_PROFILE,
+        vad_prestage=request.get("vad_prestage"),
+        audio=audio
+    )
+
+    if stream:
+        result["type"] = "metadata"
+    return result
+
+
+def handle_prewarm_request(transcriber: FasterWhisperTranscriber, request: Dict) -> Dict:
+    """
+    Load a model and run a dummy decode before real traffic arrives
+
+    Args:
+        transcriber: Loaded transcriber instance
+        request: Optional "model_size"/"compute_type" (another pool model to
+            load and warm) and "profiles" (default: [DEFAULT_PROFILE])
+
+    Returns:
+        dict: Per-profile prewarm timings and the process startup report
+    """
+    try:
+        transcriber = transcriber.with_model(request.get("model_size"), request.get("compute_type"))
+        prewarm = transcriber.prewarm(request.get("profiles"))
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+    return {
+        "success": True,
+        "model_size": transcriber.model_size,
+        "prewarm": prewarm,
+        "startup": startup_report(STARTUP)
+    }
+
+
+def handle_stream_request(
+    transcriber: FasterWhisperTranscriber,
+    streams: SessionStore,
+    command: str,
+    request: Dict
+) -> Dict:
+    """
+    Feed a live audio stream through a StreamingTranscriber keyed by stream id
+
+    Commands:
+        stream_start: {"stream_id", optional "language", "task", "model_size", "profile"}
+        stream_audio: {"stream_id", "pcm" (base64 interleaved PCM, with optional
+            "pcm_format" (s16le), "sample_rate" (16000) and "channels" (1)) or
+            "audio_path" (any FFmpeg-readable chunk)} (starts the stream if needed)
+        stream_end: {"stream_id"} flushes and returns the final transcript
+
+    Returns:
+        dict: {"success", "stream_id", "events": [...]}, where events are
+            "commit" (stable words), "partial" (unstable tail) and "final"
+    """
+    stream_id = request.get("stream_id")
+    if stream_id is None:
+        return {
+            "success": False,
+            "error": "Missing required field: stream_id"
+        }
+
+    def start() -> StreamingTranscriber:
+        transcriber.record_request(request.get("model_size"), request.get("compute_type"))
+        streams[stream_id] = StreamingTranscriber(
+            transcriber.with_model(request.get("model_size"), request.get("compute_type")),
+            language=request.get("language"),
+            task=request.get("task", "transcribe"),
+            profile=request.get("profile") or "live-fast"
+        )
+        print(f"🆕 Live stream opened: {stream_id}", file=sys.stderr)
+        return streams[stream_id]
+
+    try:
+        if command == "stream_start":
+            start()
+            return {"success": True, "stream_id": stream_id, "events": []}
+
+        if command == "stream_end":
+            stream = streams.pop(stream_id, None)
+            if stream is None:
+                return {
+                    "success": False,
+                    "error": f"No live stream: {stream_id}"
+                }
+            print(f"🔒 Live stream closed: {stream_id}", file=sys.stderr)
+            return {"success": True, "stream_id": stream_id, "events": stream.finish()}
+
+        # stream_audio
+        if request.get("pcm"):
+            import base64
+            audio = pcm_to_float32(base64.b64decode(request["pcm"]), request.get("pcm_format", "s16le"))
+            # Capture-rate chunks are resampled with the cached filter
+            channels = int(request.get("channels", 1))
+            audio = normalize_audio(
+                audio[:len(audio) - len(audio) % channels].reshape(-1, channels),
+                int(request.get("sample_rate", SAMPLE_RATE))
+            )
+        elif request.get("audio_path"):
+            audio = decode_audio(request["audio_path"])
+        else:
+            return {
+                "success": False,
+                "error": "Missing required field: pcm or audio_path"
+            }
+
+        stream = streams.get(stream_id) or start()
+        return {"success": True, "stream_id": stream_id, "events": stream.insert_audio(audio)}
+
+    except Exception as e:
+        error_msg = f"Streaming transcription error: {str(e)}"
+        print(f"\n❌ {error_msg}", file=sys.stderr)
+        return {
+            "success": False,
+            "error": error_msg
+        }
+
+
+def serve_live(
+    transcriber: FasterWhisperTranscriber,
+    language: Optional[str] = None,
+    pcm_format: str = "s16le",
+    read_seconds: float = 0.5,
+    profile: str = "live-fast",
+    sample_rate: int = SAMPLE_RATE,
+    channels: int = 1
+):
+    """
+    Transcribe raw interleaved PCM from stdin, writing events to stdout
+
+    One JSON line is written per event as soon as it is produced; the final
+    {"type": "final"} record is written at EOF. Input at another rate or
+    channel count is converted to 16kHz mono per read.
+    """
+    if pcm_format not in ("s16le", "f32le"):
+        raise ValueError(f"Unsupported PCM format: {pcm_format}")
+
+    stream = StreamingTranscriber(transcriber, language=language, profile=profile)
+    bytes_per_frame = (2 if pcm_format == "s16le" else 4) * channels
+    read_size = int(read_seconds * sample_rate) * bytes_per_frame
+    print(f"⏱️  Startup: {startup_summary(startup_report(STARTUP))}", file=sys.stderr)
+    print(f"🟢 Live transcription ready (stdin {pcm_format} @ {sample_rate} Hz, {channels} ch)", file=sys.stderr)
+
+    remainder = b""
+    while True:
+        data = sys.stdin.buffer.read(read_size)
+        if not data:
+            break
+        data = remainder + data
+        usable = len(data) - len(data) % bytes_per_frame
+        remainder = data[usable:]
+        audio = normalize_audio(pcm_to_float32(data[:usable], pcm_format).reshape(-1, channels), sample_rate)
+        for event in stream.insert_audio(audio):
+            _write_line(sys.stdout, event)
+
+    for event in stream.finish():
+        _write_line(sys.stdout, event)
+    print("🛑 Live transcription stopped", file=sys.stderr)
+
+
+def _write_line(stream, record: Dict):
+    """Write one compact JSON record and flush so readers see it immediately"""
+    stream.write(json.dumps(record) + "\n")
+    stream.flush()
+
+
+def _process_line(
+    transcriber: FasterWhisperTranscriber,
+    line: str,
+    emit: Optional[Callable[[Dict], None]] = None,
+    streams: Optional[SessionStore] = None,
+    registry: Optional[MetricsRegistry] = None
+) -> Optional[Dict]:
+    """
+    Decode one JSON-lines request and produce its response
+
+    Returns None for blank lines. A {"command": "shutdown"} request returns a
+    response with "shutdown": true so the caller can stop serving. Streamed
+    segment records are passed to emit tagged with the request id. Finished
+    jobs are folded into registry, which {"command": "metrics"} renders in
+    the Prometheus text format.
+    """
+    line = line.strip()
+    if not line:
+        return None
+
+    try:
+        request = json.loads(line)
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Invalid JSON request: {e}"
+        }
+
+    request_id = request.get("id")
+    command = request.get("command", "transcribe")
+
+    def emit_tagged(record: Dict):
+        if request_id is not None:
+            record["id"] = request_id
+        emit(record)
+
+    if command == "ping":
+        response = {"success": True, "pong": True}
+    elif command == "shutdown":
+        response = {"success": True, "shutdown": True}
+    elif command == "stats":
+        pool = transcriber.model_pool
+        cache = transcriber.result_cache
+        response = {
+            "success": True,
+            "model_pool": pool.stats() if pool else None,
+            "result_cache": cache.stats() if cache else None,
+            "live_streams": streams.stats() if streams is not None else None,
+            "startup": startup_report(STARTUP)
+        }
+    elif command == "metrics":
+        response = {
+            "success": registry is not None,
+            "format": "prometheus",
+            "metrics": registry.prometheus_text() if registry else ""
+        }
+    elif command == "prewarm":
+        response = handle_prewarm_request(transcriber, request)
+    elif command == "transcribe":
+        response = handle_request(transcriber, request, emit_tagged if emit else None)
+        if registry:
+            registry.observe(response)
+    elif command in ("stream_start", "stream_audio", "stream_end") and streams is not None:
+        response = handle_stream_request(transcriber, streams, command, request)
+        if registry and command == "stream_end" and response.get("events"):
+            registry.observe(response["events"][-1])
+    else:
+        response = {
+            "success": False,
+            "error": f"Unknown command: {command}"
+        }
+
+    if request_id is not None:
+        response["id"] = request_id
+    return response
+
+
+def serve_stdin(
+    transcriber: FasterWhisperTranscriber,
+    registry: Optional[MetricsRegistry] = None,
+    streams: Optional[SessionStore] = None
+):
+    """
+    Answer newline-delimited JSON requests from stdin until EOF or shutdown
+
+    Each response is written to stdout as a single compact JSON line, so the
+    caller can keep one worker process alive for a whole meeting. Live
+    streams never ended by their client expire from streams.
+    """
+    registry = registry or MetricsRegistry("transcription")
+    print(f"⏱️  Startup: {startup_summary(startup_report(STARTUP))}", file=sys.stderr)
+    print("🟢 Transcription worker ready (stdin)", file=sys.stderr)
+
+    emit = lambda record: _write_line(sys.stdout, record)
+    streams = streams if streams is not None else SessionStore("live stream")
+
+    for line in sys.stdin:
+        response = _process_line(transcriber, line, emit, streams, registry)
+        if response is None:
+            continue
+
+        emit(response)
+
+        if response.get("shutdown"):
+            break
+
+    print("🛑 Transcription worker stopped", file=sys.stderr)
+
+
+def serve_socket(
+    transcriber: FasterWhisperTranscriber,
+    socket_path: str,
+    registry: Optional[MetricsRegistry] = None,
+    streams: Optional[SessionStore] = None
+):
+    """
+    Answer newline-delimited JSON requests on a Unix domain socket
+
+    Connections are handled on separate threads but jobs are serialized
+    through a lock, since a single model instance is shared. Live streams
+    never ended by their client expire from streams.
+    """
+    import socket
+    import socketserver
+
+    if not hasattr(socket, "AF_UNIX"):
+        raise RuntimeError("Unix domain sockets are not supported on this platform; use stdin mode")
+
+    model_lock = threading.Lock()
+    streams = streams if streams is not None else SessionStore("live stream")
+    registry = registry or MetricsRegistry("transcription")
+
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            def emit(record: Dict):
+                self.wfile.write((json.dumps(record) + "\n").encode("utf-8"))
+                self.wfile.flush()
+
+            for raw_line in self.rfile:
+                with model_lock:
+                    response = _process_line(transcriber, raw_line.decode("utf-8"), emit, streams, registry)
+                if response is None:
+                    continue
+
+                emit(response)
+
+                if response.get("shutdown"):
+                    threading.Thread(target=self.server.shutdown, daemon=True).start()
+                    break
+
+    if os.path.exists(socket_path):
+        os.unlink(socket_path)
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, RequestHandler)
+    server.daemon_threads = True
+    print(f"⏱️  Startup: {startup_summary(startup_report(STARTUP))}", file=sys.stderr)
+    print(f"🟢 Transcription worker ready ({socket_path})", file=sys.stderr)
+
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        print("🛑 Transcription worker stopped", file=sys.stderr)
+
+
+def request_via_socket(
+    socket_path: str,
+    request: Dict,
+    emit: Optional[Callable[[Dict], None]] = None
+) -> Dict:
+    """
+    Send one request to a running socket worker and return its response
+
+    Streamed segment records received before the final response are passed
+    to emit.
+    """
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall((json.dumps(request) + "\n").encode("utf-8"))
+
+        with client.makefile("r", encoding="utf-8") as reader:
+            for line in reader:
+                record = json.loads(line)
+                if record.get("type") == "segment":
+                    if emit:
+                        emit(record)
+                    continue
+                return record
+
+    return {
+        "success": False,
+        "error": "Transcription worker closed the connection without a response"
+    }
+
+
+def _require_faster_whisper():
+    """Import faster-whisper now, exiting with a JSON error if it is missing"""
+    try:
+        import_whisper_model()
+    except ImportError as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
+
+
+def _require_audio_file(audio_path: str):
+    """Exit with a JSON error before loading faster-whisper if the audio is missing"""
+    if not os.path.exists(audio_path):
+        print(f"❌ Audio file not found: {audio_path}", file=sys.stderr)
+        print(json.dumps({
+            "success": False,
+            "error": f"Audio file not found: {audio_path}"
+        }))
+        sys.exit(1)
+
+
 def main():
     """
     CLI entry point
     
     Usage:
-        python transcribe_audio.py <audio_path> [model_size] [device] [language] [vad_filter]
+        python transcribe_audio.py <audio_path> [model_size] [device] [language] [vad_filter] [--stream] [--decoded-cache DIR] [--socket PATH]
+                                   [--vad-prestage energy|silero]
+        python transcribe_audio.py <audio_path> [model_size] [device] [language] [vad_filter] --workers N [--window SECONDS]
+        python transcribe_audio.py --serve [model_size] [device] [--max-model-memory MB] [--socket PATH] [--metrics-file PATH] [--prewarm]
+        python transcribe_audio.py --live [model_size] [device] [language] [--pcm-format s16le|f32le]
+                                   [--sample-rate HZ] [--channels N] [--prewarm]
+
+    Options for both modes:
+        --cache-dir DIR     Content-addressed result cache (default: $TRANSCRIPTION_CACHE_DIR)
+        --cache-max-mb MB   Result cache size budget (default: 1024)
+        --profile NAME      Decoding profile: archive-accurate (default; live-fast for --live)
+                            or live-fast (greedy, no word alignment, lowest latency)
+        --model-store DIR   Load models only from this local store (default: $MODEL_STORE_DIR;
+                            fill it with model_store.py fetch)
+
+    Options for service mode:
+        --stream-ttl SECONDS  Drop live streams idle this long (default: 1800, 0: never)
+        --max-streams N       Drop the least recently used stream past N (default: 64, 0: no cap)
     
     Examples:
         python transcribe_audio.py audio.wav
         python transcribe_audio.py audio.wav large-v3 cuda en
         python transcribe_audio.py audio.webm medium auto null false
+        python transcribe_audio.py --serve tiny auto
+        python transcribe_audio.py --serve base auto --socket /tmp/transcriber.sock
+        python transcribe_audio.py --serve tiny auto --max-model-memory 2048
+        python transcribe_audio.py --serve base auto --prewarm
+        python transcribe_audio.py --serve base auto --model-store /srv/acta/models
+        python transcribe_audio.py chunk.webm --socket /tmp/transcriber.sock
+        python transcribe_audio.py recording.wav medium --stream
+        python transcribe_audio.py recording.webm base --decoded-cache /tmp/acta_decoded
+        python transcribe_audio.py two_hours.wav medium auto en --workers 8
+        python transcribe_audio.py chunk.webm tiny auto en false --profile live-fast
+        python transcribe_audio.py chunk.webm tiny auto en false --vad-prestage energy
+        ffmpeg -i mic.webm -f s16le -ac 1 -ar 16000 - | python transcribe_audio.py --live base auto en
+        arecord -f S16_LE -r 48000 -c 2 -t raw | python transcribe_audio.py --live base auto en --sample-rate 48000 --channels 2
+
+    Service mode keeps the model loaded and answers one JSON request per line,
+    e.g. {"id": 1, "audio_path": "chunk.webm", "language": "en", "vad_filter": false}.
+    Requests may name another "model_size"/"compute_type"; those models are
+    loaded on demand into a shared pool and the least recently used ones are
+    evicted once --max-model-memory is exceeded ({"command": "stats"} reports
+    load/hit/evict counters). Every result carries a "metrics" block with
+    wall time, CPU time and memory per stage; service mode aggregates them
+    and returns Prometheus text for {"command": "metrics"}, and with
+    --metrics-file also rewrites that file after each job (for a textfile
+    collector).
+    faster-whisper is only imported once a model is needed. With --prewarm,
+    a worker runs a dummy decode before announcing it is ready, so the first
+    job does not pay for lazy initialization; {"command": "prewarm"} does the
+    same on demand (optionally for another "model_size" and "profiles"), and
+    it and {"command": "stats"} return a "startup" report of import, model
+    load and prewarm times.
+    When --socket is given without --serve, the request is forwarded to a
+    running socket worker instead of loading a model locally. With --stream,
+    stdout carries one compact JSON line per segment as it is decoded,
+    followed by a final {"type": "metadata", ...} line. With --decoded-cache,
+    the recording is decoded once to a 16kHz float32 .npy file whose path is
+    returned as metadata.decoded_audio_path for speaker_identification.py.
+    With --vad-prestage (or "vad_prestage" in a request), a cheap speech
+    detector runs on the decoded audio before the model: silent chunks come
+    back as an empty result with metadata.skipped_silence in milliseconds
+    (one-shot mode does not even import faster-whisper or load a model for
+    the energy detector), and metadata.speech reports the speech ratio.
+    With --workers, long recordings are split at silences into --window
+    second pieces (default 300) transcribed in parallel worker processes.
+    With --live, raw PCM on stdin (16kHz mono unless --sample-rate/--channels
+    say otherwise) is transcribed incrementally:
+    stdout carries {"type": "commit"} lines for words two consecutive decodes
+    agree on, {"type": "partial"} lines for the unstable tail, and a final
+    {"type": "final"} line at EOF. Service mode offers the same through the
+    "stream_start", "stream_audio" and "stream_end" commands; streams a
+    client never ends expire after --stream-ttl, and {"command": "stats"}
+    reports open streams and evictions.
     """
-    if len(sys.argv) < 2:
+    args = sys.argv[1:]
+    if "--help" in args or "-h" in args:
+        print(inspect.cleandoc(main.__doc__))
+        return
+
+    try:
+        serve_mode = pop_option(args, "--serve", has_value=False)
+        live_mode = pop_option(args, "--live", has_value=False)
+        prewarm = pop_option(args, "--prewarm", has_value=False)
+        metrics_file = pop_option(args, "--metrics-file")
+        pcm_format = pop_option(args, "--pcm-format") or "s16le"
+        pcm_rate = int(pop_option(args, "--sample-rate") or SAMPLE_RATE)
+        pcm_channels = int(pop_option(args, "--channels") or 1)
+        profile = pop_option(args, "--profile")
+        if profile is not None and profile not in DECODE_PROFILES:
+            raise ValueError(f"Unknown decoding profile: {profile} (available: {', '.join(DECODE_PROFILES)})")
+        vad_prestage = pop_option(args, "--vad-prestage")
+        if vad_prestage is not None and vad_prestage not in VAD_BACKENDS:
+            raise ValueError(f"Unknown VAD backend: {vad_prestage} (available: {', '.join(VAD_BACKENDS)})")
+        stream = pop_option(args, "--stream", has_value=False)
+        decoded_cache_dir = pop_option(args, "--decoded-cache")
+        max_model_memory = pop_option(args, "--max-model-memory")
+        max_model_memory = float(max_model_memory) if max_model_memory else None
+        socket_path = pop_option(args, "--socket")
+        workers = pop_option(args, "--workers")
+        workers = int(workers) if workers else None
+        window_seconds = pop_option(args, "--window")
+        window_seconds = float(window_seconds) if window_seconds else 300.0
+        cache_dir = pop_option(args, "--cache-dir") or os.environ.get("TRANSCRIPTION_CACHE_DIR")
+        cache_max_mb = pop_option(args, "--cache-max-mb")
+        cache_max_mb = float(cache_max_mb) if cache_max_mb else 1024
+        model_store_dir = pop_option(args, "--model-store") or os.environ.get("MODEL_STORE_DIR")
+        stream_ttl = pop_option(args, "--stream-ttl")
+        stream_ttl = float(stream_ttl) if stream_ttl else DEFAULT_IDLE_SECONDS
+        max_streams = pop_option(args, "--max-streams")
+        max_streams = int(max_streams) if max_streams else DEFAULT_MAX_ENTRIES
+    except ValueError as e:
+        print(json.dumps({
+            "success": False,
+            "error": str(e)
+        }))
+        sys.exit(1)
+
+    result_cache = ResultCache(cache_dir, max_size_mb=cache_max_mb) if cache_dir else None
+    model_store = ModelStore(model_store_dir) if model_store_dir else None
+
+    if serve_mode:
+        model_size = args[0] if len(args) > 0 else "base"
+        device = args[1] if len(args) > 1 else "auto"
+
+        _require_faster_whisper()
+        transcriber = FasterWhisperTranscriber(
+            model_size=model_size,
+            device=device,
+            compute_type="auto",
+            model_pool=WhisperModelPool(max_memory_mb=max_model_memory, model_store=model_store),
+            result_cache=result_cache
+        )
+        if prewarm:
+            transcriber.prewarm([profile or DEFAULT_PROFILE])
+
+        registry = MetricsRegistry("transcription", export_path=metrics_file)
+        streams = SessionStore("live stream", stream_ttl or None, max_streams or None)
+        if socket_path:
+            serve_socket(transcriber, socket_path, registry, streams)
+        else:
+            serve_stdin(transcriber, registry, streams)
+        return
+
+    if live_mode:
+        _require_faster_whisper()
+        transcriber = FasterWhisperTranscriber(
+            model_size=args[0] if len(args) > 0 else "base",
+            device=args[1] if len(args) > 1 else "auto",
+            compute_type="auto",
+            model_store=model_store
+        )
+        if prewarm:
+            transcriber.prewarm([profile or "live-fast"])
+        language = args[2] if len(args) > 2 and args[2] != 'null' else None
+        serve_live(
+            transcriber,
+            language=language,
+            pcm_format=pcm_format,
+            profile=profile or "live-fast",
+            sample_rate=pcm_rate,
+            channels=pcm_channels
+        )
+        return
+
+    if len(args) < 1:
         print(json.dumps({
             "success": False,
             "error": "Usage: python transcribe_audio.py <audio_path> [model_size] [device] [language] [vad_filter]"
         }))
         sys.exit(1)
     
-    audio_path = sys.argv[1]
-    model_size = sys.argv[2] if len(sys.argv) > 2 else "base"
-    device = sys.argv[3] if len(sys.argv) > 3 else "auto"
-    language = sys.argv[4] if len(sys.argv) > 4 and sys.argv[4] != 'null' else None
-    vad_filter = sys.argv[5].lower() != 'false' if len(sys.argv) > 5 else True
-    
-    # Initialize transcriber
-    transcriber = FasterWhisperTranscriber(
-        model_size=model_size,
-        device=device,
-        compute_type="auto"
-    )
-    
+    audio_path = args[0]
+    model_size = args[1] if len(args) > 1 else "base"
+    device = args[2] if len(args) > 2 else "auto"
+    language = args[3] if len(args) > 3 and args[3] != 'null' else None
+    vad_filter = args[4].lower() != 'false' if len(args) > 4 else True
+
     # Transcribe - Use relaxed VAD for live/short chunks
-    result = transcriber.transcribe(
-        audio_path=audio_path,
-        language=language,
-        vad_filter=vad_filter,
-        word_timestamps=True
-    )
+    request = {
+        "audio_path": os.path.abspath(audio_path),
+        "language": language,
+        "vad_filter": vad_filter,
+        "vad_prestage": vad_prestage,
+        "profile": profile or DEFAULT_PROFILE,
+        "stream": bool(stream),
+        "decoded_cache_dir": decoded_cache_dir
+    }
+    emit = (lambda record: _write_line(sys.stdout, record)) if stream else None
+
+    if workers or not socket_path:
+        # Fail before paying for the faster-whisper import and a model load
+        _require_audio_file(request["audio_path"])
+
+    speech = None
+    audio = None
+    if vad_prestage and not workers and not socket_path and not decoded_cache_dir:
+        # Skip silent chunks before paying for the faster-whisper import and
+        # a model load
+        metrics = StageMetrics()
+        try:
+            with metrics.stage("vad_prestage"):
+                path = request["audio_path"]
+                audio = load_decoded_audio(path) if is_decoded_audio(path) else decode_audio(path)
+                speech = detect_speech(audio, vad_prestage)
+        except Exception as e:
+            print(f"⚠️  VAD pre-stage failed, transcribing anyway: {str(e)[:100]}", file=sys.stderr)
+        
+        if speech is not None and not speech["has_speech"]:
+            print(f"🔇 No speech ({vad_prestage} VAD, {speech['duration']:.2f}s), skipping transcription", file=sys.stderr)
+            resolved_device, compute_type = resolve_device(device, "auto")
+            result = silent_result(
+                speech, language, model_size, resolved_device, compute_type, request["profile"], not stream
+            )
+            result["metrics"] = metrics.as_dict(speech["duration"])
+            if stream:
+                result["type"] = "metadata"
+                _write_line(sys.stdout, result)
+            else:
+                print(json.dumps(result, indent=2))
+            return
+        if speech is not None:
+            # Already checked, and the decoded audio is handed to the
+            # transcriber below; the result reports the speech ratio
+            request["vad_prestage"] = None
+
+    if workers or not socket_path:
+        # Everything but forwarding to a socket worker loads a model locally
+        _require_faster_whisper()
+
+    if workers:
+        # Long-file mode: windows transcribed concurrently, one model per process
+        result = transcribe_long(
+            request["audio_path"],
+            model_size=model_size,
+            device=device,
+            language=language,
+            vad_filter=vad_filter,
+            workers=workers,
+            window_seconds=window_seconds,
+            decoded_cache_dir=decoded_cache_dir,
+            profile=request["profile"],
+            model_store=model_store
+        )
+        stream = False
+    elif socket_path:
+        # Thin client: reuse the model already resident in the worker
+        result = request_via_socket(socket_path, request, emit)
+    elif result_cache and not stream and not decoded_cache_dir and os.path.exists(request["audio_path"]):
+        # Check the cache before paying for a model load on retries
+        lookup = StageMetrics()
+        with lookup.stage("cache_lookup"):
+            _, compute_type = resolve_device(device, "auto")
+            # Same key the transcriber stores under: vad_prestage is cleared
+            # once the check above has run, and its speech report is
+            # attached below rather than cached
+            cache_key = transcription_cache_key(
+                request["audio_path"], model_size, compute_type, language, "transcribe", vad_filter, None,
+                request["profile"], request["vad_prestage"]
+            )
+            result = result_cache.get(cache_key)
+        if result is not None:
+            result["metadata"]["cache_hit"] = True
+            result["metrics"] = lookup.as_dict(result["metadata"].get("duration"))
+            print(f"⚡ Cache hit: returning stored transcription", file=sys.stderr)
+        else:
+            transcriber = FasterWhisperTranscriber(
+                model_size=model_size,
+                device=device,
+                compute_type="auto",
+                result_cache=result_cache,
+                model_store=model_store
+            )
+            result = handle_request(transcriber, request, emit, audio=audio)
+    else:
+        # Initialize transcriber
+        transcriber = FasterWhisperTranscriber(
+            model_size=model_size,
+            device=device,
+            compute_type="auto",
+            result_cache=result_cache,
+            model_store=model_store
+        )
+        result = handle_request(transcriber, request, emit, audio=audio)
+    
+    if speech is not None and result.get("success"):
+        result["metadata"]["speech"] = speech
+        result.setdefault("metrics", {"stages": {}})["stages"].update(metrics.as_dict()["stages"])
     
     # Output JSON result
-    print(json.dumps(result, indent=2))
+    if stream:
+        _write_line(sys.stdout, result)
+    else:
+        print(json.dumps(result, indent=2))
 
 
 if __name__ == "__main__":
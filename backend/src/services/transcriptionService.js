@@ -1,6 +1,7 @@
 const path = require('path');
 const fs = require('fs');
 const { spawn } = require('child_process');
+const os = require('os');
 const { createClient } = require('@deepgram/sdk');
 const speakerDiarizationService = require('./speakerDiarizationService');
 
@@ -34,6 +35,53 @@ function getPythonExecutable() {
     return 'python';
 }
 
+/**
+ * Shared decoded-audio cache (16kHz .npy files written by transcribe_audio.py)
+ *
+ * Entries are keyed by recording, so concurrent runs on the same file share
+ * one entry and no run may delete it when it finishes. Instead the directory
+ * is swept before each run: entries idle (mtime, refreshed on reuse) for
+ * longer than the max age are removed, then the oldest idle ones until the
+ * total fits the size budget. Entries used within the grace period are never
+ * touched, so a run in progress keeps its buffer.
+ */
+const DECODED_CACHE_DIR = path.join(os.tmpdir(), 'acta_decoded_audio');
+const DECODED_CACHE_MAX_AGE_MS = Number(process.env.DECODED_CACHE_MAX_AGE_MINUTES || 60) * 60 * 1000;
+const DECODED_CACHE_MAX_BYTES = Number(process.env.DECODED_CACHE_MAX_MB || 2048) * 1024 * 1024;
+const DECODED_CACHE_GRACE_MS = 10 * 60 * 1000;
+
+async function sweepDecodedCache(cacheDir = DECODED_CACHE_DIR) {
+    let names;
+    try {
+        names = await fs.promises.readdir(cacheDir);
+    } catch (e) {
+        return;  // Not created yet
+    }
+
+    const now = Date.now();
+    const entries = [];
+    for (const name of names) {
+        if (!name.endsWith('.npy')) continue;
+        const filePath = path.join(cacheDir, name);
+        try {
+            const stat = await fs.promises.stat(filePath);
+            entries.push({ filePath, size: stat.size, idleMs: now - stat.mtimeMs });
+        } catch (e) { }
+    }
+
+    // Oldest first
+    entries.sort((a, b) => b.idleMs - a.idleMs);
+    let totalBytes = entries.reduce((sum, entry) => sum + entry.size, 0);
+    for (const entry of entries) {
+        if (entry.idleMs < DECODED_CACHE_GRACE_MS) break;
+        if (entry.idleMs <= DECODED_CACHE_MAX_AGE_MS && totalBytes <= DECODED_CACHE_MAX_BYTES) break;
+        try {
+            await fs.promises.unlink(entry.filePath);
+            totalBytes -= entry.size;
+        } catch (e) { }
+    }
+}
+
 /**
  * LIVE MODE: Transcribe audio using Faster-Whisper + SpeechBrain
  * Used for real-time transcription during meetings
@@ -66,6 +114,12 @@ async function transcribeLive(audioPath, onProgress = () => { }, enableSpeakerDi
             args.push(language);
         }
 
+        // Decode once to a shared 16kHz .npy that speaker identification reuses
+        if (enableSpeakerDiarization) {
+            await sweepDecodedCache();
+            args.push('--decoded-cache', DECODED_CACHE_DIR);
+        }
+
         console.log(`[Live Transcription] Model: ${modelSize}, Device: GPU/CPU auto`);
 
         onProgress('transcribing', 'Live transcription in progress...');
@@ -141,15 +195,19 @@ async function transcribeLive(audioPath, onProgress = () => { }, enableSpeakerDi
 
                 const speakerScriptPath = path.join(__dirname, 'speaker_identification.py');
                 const segmentsJson = JSON.stringify({ segments: response.segments });
+                const speakerAudioPath = response.metadata.decoded_audio_path || audioPath;
 
                 const speakerResult = await new Promise((resolve, reject) => {
                     let stdout = '';
                     let stderr = '';
 
-                    const pythonProcess = spawn(pythonExe, [speakerScriptPath, audioPath, segmentsJson], {
+                    const pythonProcess = spawn(pythonExe, [speakerScriptPath, speakerAudioPath, '-'], {
                         cwd: path.dirname(speakerScriptPath)
                     });
 
+                    // Segments go over stdin to stay clear of OS argument-length limits
+                    pythonProcess.stdin.end(segmentsJson);
+
                     pythonProcess.stdout.on('data', (data) => {
                         stdout += data.toString();
                     });
@@ -188,6 +246,10 @@ async function transcribeLive(audioPath, onProgress = () => { }, enableSpeakerDi
             }
         }
 
+        // The decoded buffer may be the input itself or shared with a
+        // concurrent run on the same recording; sweepDecodedCache expires it
+        delete response.metadata.decoded_audio_path;
+
         onProgress('completed', 'Live transcription complete!');
         return response;
 
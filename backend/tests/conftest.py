@@ -0,0 +1,14 @@
+"""
+Shared setup for the service unit tests
+
+The services are flat scripts in src/services rather than a package, so the
+tests import them the way the scripts import each other: with that directory
+on sys.path. Only numpy (and scipy) are needed; nothing here loads Whisper,
+SpeechBrain or ffmpeg.
+"""
+
+import os
+import sys
+
+SERVICES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'services')
+sys.path.insert(0, SERVICES_DIR)
@@ -0,0 +1,29 @@
+"""Flag parsing shared by the service scripts (cli.pop_option)"""
+
+import pytest
+
+from cli import pop_option
+
+
+def test_value_flag_is_removed_with_its_value():
+    args = ["audio.wav", "--threshold", "0.7", "tiny"]
+    assert pop_option(args, "--threshold") == "0.7"
+    assert args == ["audio.wav", "tiny"]
+
+
+def test_bare_flag():
+    args = ["--serve", "auto"]
+    assert pop_option(args, "--serve", has_value=False) is True
+    assert args == ["auto"]
+
+
+def test_absent_flag_leaves_args_alone():
+    args = ["audio.wav"]
+    assert pop_option(args, "--socket") is None
+    assert pop_option(args, "--stream", has_value=False) is None
+    assert args == ["audio.wav"]
+
+
+def test_missing_value():
+    with pytest.raises(ValueError, match="--socket"):
+        pop_option(["audio.wav", "--socket"], "--socket")
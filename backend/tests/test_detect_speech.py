@@ -0,0 +1,57 @@
+"""Energy pre-stage VAD in transcribe_audio.detect_speech"""
+
+import numpy as np
+import pytest
+
+from audio_utils import SAMPLE_RATE
+from transcribe_audio import ENERGY_THRESHOLD_DB, detect_speech
+
+
+def tone(level_db, seconds=2.0, frequency=220.0):
+    """Sine wave whose RMS level is level_db dBFS"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    amplitude = np.sqrt(2.0) * 10 ** (level_db / 20.0)
+    return (amplitude * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+
+
+def test_silence_is_skipped():
+    result = detect_speech(np.zeros(2 * SAMPLE_RATE, dtype=np.float32))
+    assert not result["has_speech"]
+    assert result["speech_seconds"] == 0.0
+    assert result["duration"] == 2.0
+
+
+@pytest.mark.parametrize("level_db", [-20.0, -36.0, -40.0, ENERGY_THRESHOLD_DB + 1])
+def test_steady_signal_above_threshold_is_speech(level_db):
+    result = detect_speech(tone(level_db))
+    assert result["has_speech"]
+    assert result["speech_ratio"] > 0.95
+
+
+def test_signal_below_threshold_is_skipped():
+    assert not detect_speech(tone(ENERGY_THRESHOLD_DB - 5))["has_speech"]
+
+
+def test_custom_threshold():
+    audio = tone(-40.0)
+    assert not detect_speech(audio, threshold=-30.0)["has_speech"]
+    assert detect_speech(audio, threshold=-50.0)["has_speech"]
+
+
+def test_short_burst_needs_min_speech():
+    audio = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    burst = tone(-20.0, seconds=0.1)
+    audio[:len(burst)] = burst
+    assert not detect_speech(audio)["has_speech"]
+    assert detect_speech(audio, min_speech_seconds=0.05)["has_speech"]
+
+
+def test_chunk_shorter_than_a_frame():
+    result = detect_speech(np.zeros(10, dtype=np.float32))
+    assert not result["has_speech"]
+    assert result["speech_ratio"] == 0.0
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        detect_speech(np.zeros(SAMPLE_RATE, dtype=np.float32), backend="webrtc")
@@ -0,0 +1,59 @@
+"""Per-segment speaker embedding cache in embedding_cache.EmbeddingCache"""
+
+import numpy as np
+import pytest
+
+from embedding_cache import EmbeddingCache, span_key
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(str(tmp_path / "embeddings"))
+
+
+def segment(start, end):
+    return {"start": start, "end": end, "text": ""}
+
+
+def test_span_key_resolution():
+    assert span_key(1.0, 2.5) == "1.000-2.500"
+    assert span_key(1.0004, 2.5) == span_key(1.0, 2.5)
+
+
+def test_store_then_lookup(cache):
+    segments = [segment(0.0, 1.5), segment(1.5, 3.0), segment(3.0, 4.0)]
+    cache.store("abc", [(segments[0], np.full(4, 1.0)), (segments[2], np.full(4, 3.0))])
+
+    found, missing = cache.lookup("abc", segments)
+    assert sorted(found) == [0, 2]
+    assert missing == [1]
+    np.testing.assert_array_equal(found[2], np.full(4, 3.0, dtype=np.float32))
+    assert cache.stats() == {"hits": 2, "misses": 1, "hit_rate": 0.6667}
+
+
+def test_appending_and_overwriting_rows(cache):
+    first, second = segment(0.0, 1.0), segment(1.0, 2.0)
+    cache.store("abc", [(first, np.zeros(3))])
+    cache.store("abc", [(first, np.ones(3)), (second, np.full(3, 2.0))])
+
+    found, missing = cache.lookup("abc", [first, second])
+    assert missing == []
+    np.testing.assert_array_equal(found[0], np.ones(3))
+    np.testing.assert_array_equal(found[1], np.full(3, 2.0))
+
+
+def test_skipped_spans_are_not_retried(cache):
+    short = segment(9.9, 10.0)
+    cache.store("abc", [], skipped_segments=[short])
+
+    found, missing = cache.lookup("abc", [short, segment(0.0, 1.0)])
+    assert found == {}
+    assert missing == [1]
+
+
+def test_recordings_and_models_are_separate(cache):
+    cache.store("abc", [(segment(0.0, 1.0), np.ones(3))])
+    assert cache.lookup("other", [segment(0.0, 1.0)]) == ({}, [0])
+
+    other_model = EmbeddingCache(cache.cache_dir, model_id="another/model")
+    assert other_model.lookup("abc", [segment(0.0, 1.0)]) == ({}, [0])
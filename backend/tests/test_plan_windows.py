@@ -0,0 +1,70 @@
+"""Long-file window planning in transcribe_audio.plan_windows"""
+
+import sys
+import types
+
+import numpy as np
+import pytest
+
+from audio_utils import SAMPLE_RATE
+from transcribe_audio import plan_windows
+
+
+@pytest.fixture
+def speech_spans(monkeypatch):
+    """Stand-in for faster-whisper's Silero VAD returning preset spans (in seconds)"""
+    spans = []
+    vad = types.ModuleType("faster_whisper.vad")
+    vad.get_speech_timestamps = lambda audio, *args, **kwargs: [
+        {"start": int(start * SAMPLE_RATE), "end": int(end * SAMPLE_RATE)} for start, end in spans
+    ]
+    package = types.ModuleType("faster_whisper")
+    package.vad = vad
+    monkeypatch.setitem(sys.modules, "faster_whisper", package)
+    monkeypatch.setitem(sys.modules, "faster_whisper.vad", vad)
+    return spans
+
+
+def audio(seconds):
+    return np.zeros(int(seconds * SAMPLE_RATE), dtype=np.float32)
+
+
+def assert_covers(windows, seconds):
+    assert windows[0][0] == 0
+    assert windows[-1][1] == int(seconds * SAMPLE_RATE)
+    assert all(end == next_start for (_, end), (next_start, _) in zip(windows, windows[1:]))
+
+
+def test_short_audio_is_one_window(speech_spans):
+    assert plan_windows(audio(8), window_seconds=10) == [(0, 8 * SAMPLE_RATE)]
+
+
+def test_cuts_in_the_gap_nearest_each_boundary(speech_spans):
+    # Gaps centred at 9s, 12s and 21s; targets at 10s and 19s
+    speech_spans.extend([(0, 8), (10, 11), (13, 20), (22, 30)])
+    windows = plan_windows(audio(30), window_seconds=10)
+    assert [start / SAMPLE_RATE for start, _ in windows] == [0, 9, 21]
+    assert_covers(windows, 30)
+
+
+def test_fixed_cuts_without_gaps(speech_spans):
+    windows = plan_windows(audio(30), window_seconds=10)
+    assert [start / SAMPLE_RATE for start, _ in windows] == [0, 10, 20]
+    assert_covers(windows, 30)
+
+
+def test_no_tiny_tail_window(speech_spans):
+    # A 1s remainder is folded into the last window
+    windows = plan_windows(audio(21), window_seconds=10)
+    assert [start / SAMPLE_RATE for start, _ in windows] == [0, 10]
+    assert_covers(windows, 21)
+
+
+def test_vad_failure_falls_back_to_fixed_cuts(speech_spans, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("onnxruntime missing")
+
+    monkeypatch.setattr(sys.modules["faster_whisper.vad"], "get_speech_timestamps", broken)
+    windows = plan_windows(audio(25), window_seconds=10)
+    assert [start / SAMPLE_RATE for start, _ in windows] == [0, 10, 20]
+    assert_covers(windows, 25)
@@ -0,0 +1,78 @@
+"""Result cache keys (transcribe_audio.transcription_cache_key) and ResultCache"""
+
+import os
+
+import pytest
+
+from result_cache import ResultCache
+from transcribe_audio import transcription_cache_key
+
+
+@pytest.fixture
+def audio_file(tmp_path):
+    path = tmp_path / "chunk.webm"
+    path.write_bytes(b"\x1a\x45\xdf\xa3" + b"\x00" * 64)
+    return str(path)
+
+
+def key(audio_path, **overrides):
+    options = dict(
+        model_size="base", compute_type="int8", language=None, task="transcribe",
+        vad_filter=True, word_timestamps=None, profile="archive-accurate", vad_prestage=None
+    )
+    options.update(overrides)
+    return transcription_cache_key(audio_path, **options)
+
+
+def test_key_follows_content_not_path(audio_file, tmp_path):
+    copy = tmp_path / "copy.webm"
+    with open(audio_file, "rb") as f:
+        copy.write_bytes(f.read())
+    assert key(audio_file) == key(str(copy))
+
+    copy.write_bytes(b"different audio")
+    assert key(audio_file) != key(str(copy))
+
+
+@pytest.mark.parametrize("option, value", [
+    ("model_size", "small"),
+    ("compute_type", "float16"),
+    ("language", "en"),
+    ("task", "translate"),
+    ("vad_filter", False),
+    ("word_timestamps", False),
+    ("profile", "live-fast"),
+    ("vad_prestage", "energy"),
+])
+def test_every_output_option_changes_the_key(audio_file, option, value):
+    assert key(audio_file, **{option: value}) != key(audio_file)
+
+
+def test_vad_backends_get_separate_entries(audio_file):
+    assert key(audio_file, vad_prestage="energy") != key(audio_file, vad_prestage="silero")
+
+
+def test_word_timestamps_default_resolves_through_profile(audio_file):
+    # archive-accurate aligns words by default, so None and True are the same job
+    assert key(audio_file, word_timestamps=None) == key(audio_file, word_timestamps=True)
+
+
+def test_cache_round_trip_and_counters(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"))
+    assert cache.get("missing") is None
+    cache.put("k", {"success": True, "transcript": "hello"})
+    assert cache.get("k") == {"success": True, "transcript": "hello"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = ResultCache(str(tmp_path / "cache"), max_size_mb=250 / (1024 * 1024))
+    payload = {"transcript": "x" * 100}
+    cache.put("old", payload)
+    os.utime(cache._path("old"), (1, 1))
+    cache.put("new", payload)
+    cache.put("newer", payload)
+
+    assert cache.get("old") is None
+    assert cache.get("newer") == payload
+    assert cache.evictions >= 1
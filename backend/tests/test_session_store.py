@@ -0,0 +1,59 @@
+"""Idle expiry and LRU cap of session_store.SessionStore"""
+
+import pytest
+
+import session_store
+from session_store import SessionStore
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(session_store.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_idle_entries_expire(clock):
+    store = SessionStore("session", idle_seconds=60, max_entries=None)
+    store["a"] = 1
+    store["b"] = 2
+    clock[0] += 45
+    assert store.get("a") == 1  # Reading marks it as used
+    clock[0] += 30
+
+    assert "b" not in store
+    assert store.get("a") == 1
+    assert store.stats()["idle_evictions"] == 1
+
+
+def test_capacity_drops_least_recently_used(clock):
+    store = SessionStore("session", idle_seconds=None, max_entries=2)
+    store["a"] = 1
+    store["b"] = 2
+    clock[0] += 1
+    store["a"]
+    store["c"] = 3
+
+    assert sorted(store) == ["a", "c"]
+    stats = store.stats()
+    assert (stats["open"], stats["capacity_evictions"], stats["idle_evictions"]) == (2, 1, 0)
+
+
+def test_pop_and_overwrite(clock):
+    store = SessionStore("session", idle_seconds=60, max_entries=2)
+    store["a"] = 1
+    store["a"] = 2
+    assert len(store) == 1
+    assert store.pop("a") == 2
+    assert store.pop("a", None) is None
+    with pytest.raises(KeyError):
+        store["a"]
+
+
+def test_unbounded_store_keeps_everything(clock):
+    store = SessionStore("session", idle_seconds=None, max_entries=None)
+    for index in range(100):
+        store[index] = index
+        clock[0] += 3600
+    assert len(store) == 100
+    assert store.stats()["idle_evictions"] == store.stats()["capacity_evictions"] == 0
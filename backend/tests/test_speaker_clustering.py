@@ -0,0 +1,66 @@
+"""Offline speaker clustering in speaker_clustering"""
+
+import numpy as np
+import pytest
+
+from speaker_clustering import (
+    cluster_embeddings,
+    cluster_quality,
+    relabel_by_first_appearance
+)
+
+
+def three_speakers(per_speaker=6, dim=32, noise=0.05, seed=0):
+    """Interleaved turns of three speakers with nearly orthogonal voiceprints"""
+    rng = np.random.default_rng(seed)
+    voices = np.linalg.qr(rng.standard_normal((dim, 3)))[0].T
+    truth = np.tile([2, 0, 1], per_speaker)
+    embeddings = voices[truth] + noise * rng.standard_normal((len(truth), dim))
+    return embeddings.astype(np.float32), relabel_by_first_appearance(truth)
+
+
+def test_relabel_by_first_appearance():
+    assert relabel_by_first_appearance(np.array([5, 5, 2, 9, 2])).tolist() == [0, 0, 1, 2, 1]
+
+
+@pytest.mark.parametrize("method", ["agglomerative", "spectral"])
+def test_estimates_speaker_count(method):
+    embeddings, truth = three_speakers()
+    assert cluster_embeddings(embeddings, method=method).tolist() == truth.tolist()
+
+
+@pytest.mark.parametrize("method", ["agglomerative", "spectral"])
+def test_known_speaker_count(method):
+    # Noisy enough that the 0.75 threshold alone splits speakers
+    embeddings, truth = three_speakers(noise=0.12, seed=1)
+    labels = cluster_embeddings(embeddings, method=method, num_speakers=3)
+    assert labels.tolist() == truth.tolist()
+
+
+def test_threshold_controls_merging():
+    embeddings, _ = three_speakers()
+    # Orthogonal voices are ~0 similar, so only a negative threshold merges them
+    assert cluster_embeddings(embeddings, similarity_threshold=-0.5).max() == 0
+
+
+def test_small_inputs():
+    assert cluster_embeddings(np.zeros((0, 8))).tolist() == []
+    assert cluster_embeddings(np.ones((1, 8))).tolist() == [0]
+    assert cluster_embeddings(np.eye(2, 8), method="spectral").tolist() == [0, 1]
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        cluster_embeddings(np.ones((3, 4)), method="kmeans")
+
+
+def test_cluster_quality():
+    embeddings, truth = three_speakers()
+    quality = cluster_quality(embeddings, truth)
+    assert quality["cluster_sizes"] == [6, 6, 6]
+    assert quality["silhouette"] > 0.8
+    assert quality["mean_intra_similarity"] > 0.9
+    assert abs(quality["mean_inter_similarity"]) < 0.2
+
+    # A single cluster has no silhouette
+    assert cluster_quality(embeddings, np.zeros(len(truth), dtype=np.int64))["silhouette"] is None
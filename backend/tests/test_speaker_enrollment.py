@@ -0,0 +1,88 @@
+"""Voiceprint storage and matching in speaker_enrollment.SpeakerEnrollment"""
+
+import numpy as np
+import pytest
+
+from speaker_enrollment import SpeakerEnrollment
+
+
+def unit(vector):
+    vector = np.asarray(vector, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+@pytest.fixture
+def db(tmp_path):
+    return SpeakerEnrollment(str(tmp_path / "speakers"))
+
+
+def test_incremental_enrollment_equals_batch_mean(tmp_path, db):
+    rng = np.random.default_rng(0)
+    samples = rng.standard_normal((6, 16)).astype(np.float32)
+
+    db.enroll("alice", samples[:1])
+    db.enroll("alice", samples[1:4])
+    entry = db.enroll("alice", samples[4:])
+    assert entry["count"] == 6
+
+    batch = SpeakerEnrollment(str(tmp_path / "batch"))
+    batch.enroll("alice", samples)
+    np.testing.assert_allclose(db.matrix[0], batch.matrix[0], atol=1e-6)
+
+    expected = np.mean([unit(sample) for sample in samples], axis=0)
+    np.testing.assert_allclose(db.matrix[0], expected, atol=1e-6)
+
+
+def test_later_samples_do_not_outweigh_earlier_ones(db):
+    for _ in range(9):
+        db.enroll("bob", [1.0, 0.0])
+    db.enroll("bob", [0.0, 1.0])
+    (name, score), = db.match([[1.0, 0.0]], threshold=0.9)
+    assert name == "bob"
+    assert score == pytest.approx(float(unit([0.9, 0.1])[0]), abs=1e-5)
+
+
+def test_enrollment_survives_reload(tmp_path, db):
+    db.enroll("carol", [[0.0, 2.0, 0.0], [0.0, 1.0, 1.0]])
+    reloaded = SpeakerEnrollment(db.db_dir)
+    assert reloaded.list_speakers()[0]["count"] == 2
+    np.testing.assert_allclose(reloaded.matrix, db.matrix)
+    assert reloaded.match([[0.0, 1.0, 0.2]])[0][0] == "carol"
+
+
+def test_match_assigns_each_person_once(db):
+    db.enroll("alice", [1.0, 0.0, 0.0])
+    db.enroll("bob", [0.0, 1.0, 0.0])
+
+    # Both queries are closest to alice; the closer one gets her, the
+    # other falls back to bob or nobody
+    matches = db.match([unit([1.0, 0.6, 0.0]), unit([1.0, 0.1, 0.0])], threshold=0.5)
+    assert matches[1][0] == "alice"
+    assert matches[0][0] == "bob"
+    assert matches[0][1] == pytest.approx(float(unit([1.0, 0.6, 0.0])[1]), abs=1e-5)
+
+    matches = db.match([unit([1.0, 0.6, 0.0]), unit([1.0, 0.1, 0.0])], threshold=0.9)
+    assert matches[1][0] == "alice"
+    assert matches[0][0] is None
+    # Unmatched queries still report their best similarity
+    assert matches[0][1] == pytest.approx(float(unit([1.0, 0.6, 0.0])[0]), abs=1e-5)
+
+
+def test_match_empty_database_and_queries(db):
+    assert db.match(np.zeros((2, 4))) == [(None, 0.0), (None, 0.0)]
+    db.enroll("alice", [1.0, 0.0, 0.0, 0.0])
+    assert db.match(np.zeros((0, 4))) == []
+
+
+def test_remove_keeps_rows_aligned(db):
+    db.enroll("alice", [1.0, 0.0])
+    db.enroll("bob", [0.0, 1.0])
+    assert db.remove("alice")
+    assert not db.remove("alice")
+    assert db.match([[0.0, 1.0]])[0][0] == "bob"
+
+
+def test_dimension_mismatch(db):
+    db.enroll("alice", [1.0, 0.0])
+    with pytest.raises(ValueError):
+        db.enroll("bob", [1.0, 0.0, 0.0])